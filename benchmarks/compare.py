@@ -0,0 +1,58 @@
+"""Compare two benchmark result files and flag regressions.
+
+Usage: python -m benchmarks.compare BASELINE.json CANDIDATE.json [--threshold 0.10]
+
+Exits with status 1 when any result lost more than ``threshold`` of its
+throughput or grew its p99 by more than ``threshold``; for startup results,
+when any of their times grew by more than ``threshold``.
+"""
+
+import argparse
+import sys
+from benchmarks.results import STARTUP_METRICS, key, load
+
+DEFAULT_THRESHOLD = 0.10
+
+
+def change(before: float, after: float) -> float:
+    return (after - before) / before if before else 0.0
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> list[str]:
+    """Print one line per paired result; returns the regressed ones."""
+    previous = {key(result): result for result in baseline["results"]}
+    regressions = []
+    print(f"{baseline['commit']} -> {candidate['commit']}")
+    for result in candidate["results"]:
+        before = previous.get(key(result))
+        if before is None:
+            continue
+        label = " ".join(str(value) for _, value in key(result))
+        if "per_second" in result:
+            throughput = change(before["per_second"], result["per_second"])
+            p99 = change(before["p99_us"], result["p99_us"])
+            regressed = throughput < -threshold or p99 > threshold
+            changes = f"{throughput:>+9.1%} req/s{p99:>+9.1%} p99"
+        else:
+            growth = {metric: change(before[metric], result[metric]) for metric in STARTUP_METRICS}
+            regressed = any(value > threshold for value in growth.values())
+            changes = "".join(f"{value:>+9.1%} {metric.removesuffix('_ms')}" for metric, value in growth.items())
+        print(f"{label:<48}{changes}{'  REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append(label)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    if compare(load(args.baseline), load(args.candidate), args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""In-process HTTP load test of ``main.app`` through httpx's ASGI transport.
+
+Seeds every resource through the bulk endpoints, then drives each route in
+turn with ``--concurrency`` clients until ``--requests`` responses arrive,
+and reports req/s and p50/p95/p99 per route. Bulk and import routes are
+left out: their cost is set by the batch size the caller picks.
+
+Usage: python -m benchmarks.load [--records 1000] [--requests 2000]
+                                 [--concurrency 32] [--output FILE]
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+import httpx
+from benchmarks.results import print_table, save, summarize
+from main import app
+
+DEFAULT_RECORDS = 1_000
+DEFAULT_REQUESTS = 2_000
+DEFAULT_CONCURRENCY = 32
+SEED_BATCH_SIZE = 500
+
+
+@dataclass(frozen=True)
+class Route:
+    """One route to drive; ``{id}`` in the path is filled from the seeded IDs."""
+
+    method: str
+    path: str
+    resource: Optional[str] = None
+    body: Optional[Callable[[int], dict]] = None
+    # Cada requisição consome um ID (DELETE), em vez de sortear um
+    consumes: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+def user_body(index: int) -> dict:
+    return {"name": f"User {index}", "email": f"user{index}@example.com", "age": 30}
+
+
+def car_body(index: int) -> dict:
+    return {"brand": "Toyota", "model": f"Corolla {index}", "year": 2022, "color": "White", "price": 95000.0}
+
+
+def product_body(index: int) -> dict:
+    # Estoque alto para que os pedidos do benchmark nunca esgotem um produto
+    return {
+        "name": f"Product {index}",
+        "description": "Benchmark product",
+        "price": float(index % 500 + 1),
+        "stock": 10**9,
+        "category": "Electronics",
+    }
+
+
+def order_body(product_id: str) -> Callable[[int], dict]:
+    def body(index: int) -> dict:
+        return {"userId": str(index % 100 + 1), "items": [{"productId": product_id, "quantity": 1, "price": 1.0}]}
+
+    return body
+
+
+def crud_routes(resource: str, body: Callable[[int], dict], update: dict) -> list[Route]:
+    base = f"/api/{resource}/"
+    return [
+        Route("GET", base),
+        Route("GET", base + "?limit=20"),
+        Route("GET", base + "{id}", resource),
+        Route("POST", base, body=body),
+        Route("PUT", base + "{id}", resource, body=lambda _: update),
+        Route("GET", base + "export"),
+        Route("DELETE", base + "{id}", resource, consumes=True),
+    ]
+
+
+def routes(order_product: str) -> list[Route]:
+    return [
+        Route("GET", "/health"),
+        *crud_routes("users", user_body, {"age": 31}),
+        *crud_routes("cars", car_body, {"price": 90000.0}),
+        *crud_routes("products", product_body, {"description": "Updated"}),
+        *crud_routes("orders", order_body(order_product), {"status": "completed"}),
+        Route("GET", "/api/analytics/orders/summary"),
+        Route("GET", "/api/analytics/orders/revenue?groupBy=user"),
+        Route("GET", "/api/analytics/products/summary"),
+        Route("GET", "/api/analytics/products/inventory"),
+    ]
+
+
+async def seed(client: httpx.AsyncClient, resource: str, body: Callable[[int], dict], records: int) -> list[str]:
+    """Create ``records`` of ``resource`` through its bulk route; returns their IDs."""
+    ids = []
+    for start in range(0, records, SEED_BATCH_SIZE):
+        batch = [body(index) for index in range(start, min(start + SEED_BATCH_SIZE, records))]
+        response = await client.post(f"/api/{resource}/bulk", json=batch)
+        response.raise_for_status()
+        ids.extend(item["id"] for item in response.json()["results"] if item["id"])
+    return ids
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    route: Route,
+    ids: dict[str, list[str]],
+    requests: int,
+    concurrency: int,
+) -> dict:
+    rng = random.Random(route.name)
+    pool = ids.get(route.resource, [])
+    if route.consumes:
+        # Cada DELETE remove um ID diferente, e eles saem da lista das rotas seguintes
+        pool = rng.sample(pool, min(requests, len(pool)))
+        requests = len(pool)
+    counter = itertools.count()
+    latencies: list[int] = []
+    errors = 0
+
+    async def client_loop() -> None:
+        nonlocal errors
+        while (index := next(counter)) < requests:
+            path = route.path
+            if route.resource is not None:
+                path = path.replace("{id}", pool[index] if route.consumes else rng.choice(pool))
+            body = route.body(index) if route.body else None
+            before = time.perf_counter_ns()
+            response = await client.request(route.method, path, json=body)
+            latencies.append(time.perf_counter_ns() - before)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    if route.consumes:
+        deleted = set(pool)
+        ids[route.resource] = [record_id for record_id in ids[route.resource] if record_id not in deleted]
+    return {"route": route.name, "concurrency": concurrency, **summarize(latencies, elapsed, errors)}
+
+
+async def run(records: int, requests: int, concurrency: int) -> list[dict]:
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            ids = {
+                "users": await seed(client, "users", user_body, records),
+                "cars": await seed(client, "cars", car_body, records),
+                "products": await seed(client, "products", product_body, records + 1),
+            }
+            # Um produto extra, fora do sorteio do DELETE, abastece todos os pedidos
+            order_product = ids["products"].pop()
+            ids["orders"] = await seed(client, "orders", order_body(order_product), records)
+            return [await drive(client, route, ids, requests, concurrency) for route in routes(order_product)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=DEFAULT_RECORDS)
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--output", help="JSON file to write (default: benchmarks/results/load-<commit>.json)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.records, args.requests, args.concurrency))
+    print_table(results)
+    print(f"Saved to {save('load', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Bytes per stored record: Pydantic models vs. compact ``__slots__`` rows.
+
+Usage: python -m benchmarks.memory [--records 100000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, Optional
+from src.models.schemas import Record, User, Car, Product, Order, OrderItem
+from src.services.records import USER_CODEC, CAR_CODEC, PRODUCT_CODEC, ORDER_CODEC, RecordCodec
+from src.services.repository import Repository
+from src.types.enums import CarColor, OrderStatus, ProductCategory
+
+DEFAULT_RECORDS = 100_000
+
+
+def make_user(index: int) -> User:
+    return User(id=str(index), name=f"User {index}", email=f"user{index}@example.com", age=30)
+
+
+def make_car(index: int) -> Car:
+    return Car(id=str(index), brand="Toyota", model=f"Corolla {index}", year=2022, color=CarColor.WHITE, price=95000.0)
+
+
+def make_product(index: int) -> Product:
+    return Product(
+        id=str(index),
+        name=f"Product {index}",
+        description="Benchmark product",
+        price=float(index),
+        stock=index % 50,
+        category=ProductCategory.ELECTRONICS,
+    )
+
+
+def make_order(index: int) -> Order:
+    return Order(
+        id=str(index),
+        userId=str(index % 1000),
+        items=[OrderItem(productId=str(item), quantity=1, price=10.0) for item in range(3)],
+        total=30.0,
+        status=OrderStatus.PENDING,
+        createdAt="2025-11-07T18:18:08.792Z",
+    )
+
+
+def bytes_per_record(make: Callable[[int], Record], codec: Optional[RecordCodec], records: int) -> float:
+    """Memory retained by a filled ``Repository``, divided by its size."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    repository = Repository(codec=codec)
+    for index in range(records):
+        repository.add(make(index))
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del repository
+    return (after - before) / records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=DEFAULT_RECORDS)
+    args = parser.parse_args()
+
+    print(f"{'record':<10}{'pydantic':>12}{'slots':>12}{'saved':>10}")
+    for name, make, codec in (
+        ("User", make_user, USER_CODEC),
+        ("Car", make_car, CAR_CODEC),
+        ("Product", make_product, PRODUCT_CODEC),
+        ("Order", make_order, ORDER_CODEC),
+    ):
+        models = bytes_per_record(make, None, args.records)
+        rows = bytes_per_record(make, codec, args.records)
+        print(f"{name:<10}{models:>12.0f}{rows:>12.0f}{1 - rows / models:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Latency summaries and the JSON files benchmarks write their results to.
+
+Every file holds ``{"benchmark", "commit", "python", "created_at",
+"results"}``; each result is a dict of identifying fields (resource,
+operation, route...) plus the metrics in ``METRICS``. ``benchmarks.compare``
+matches results of two files by their identifying fields.
+"""
+
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+import numpy as np
+
+RESULTS_DIR = Path(__file__).parent / "results"
+LATENCY_METRICS = ("count", "errors", "per_second", "p50_us", "p95_us", "p99_us")
+# Resultados de ``benchmarks.startup``: quanto menor, melhor
+STARTUP_METRICS = ("import_ms", "first_request_ms", "process_ms")
+METRICS = LATENCY_METRICS + STARTUP_METRICS
+
+
+def summarize(latencies_ns: list[int], elapsed: float, errors: int = 0) -> dict[str, float]:
+    """Throughput over ``elapsed`` seconds and latency percentiles in microseconds."""
+    p50, p95, p99 = np.percentile(latencies_ns, (50, 95, 99)) / 1000 if latencies_ns else (0.0, 0.0, 0.0)
+    return {
+        "count": len(latencies_ns),
+        "errors": errors,
+        "per_second": round(len(latencies_ns) / elapsed, 1) if elapsed else 0.0,
+        "p50_us": round(float(p50), 1),
+        "p95_us": round(float(p95), 1),
+        "p99_us": round(float(p99), 1),
+    }
+
+
+def key(result: dict) -> tuple:
+    """The identifying fields of a result, used to pair results across runs."""
+    return tuple((name, value) for name, value in result.items() if name not in METRICS)
+
+
+def save(benchmark: str, results: list[dict], output: Optional[str] = None) -> Path:
+    """Write ``results`` to ``output`` or to ``results/<benchmark>-<commit>.json``."""
+    commit = _commit()
+    path = Path(output) if output else RESULTS_DIR / f"{benchmark}-{commit}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "benchmark": benchmark,
+        "commit": commit,
+        "python": platform.python_version(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "results": results,
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n")
+    return path
+
+
+def load(path: str) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def print_table(results: list[dict]) -> None:
+    print(f"{'':<48}{'throughput':>14}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for result in results:
+        label = " ".join(str(value) for _, value in key(result))
+        print(
+            f"{label:<48}{result['per_second']:>12.0f}/s"
+            f"{result['p50_us']:>10.0f}{result['p95_us']:>10.0f}{result['p99_us']:>10.0f} µs"
+            + (f"  ({result['errors']} errors)" if result["errors"] else "")
+        )
+
+
+def _commit() -> str:
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return output.stdout.strip()
@@ -0,0 +1,140 @@
+"""Latency of the in-memory services' get/create/update/delete at growing sizes.
+
+Usage: python -m benchmarks.services [--sizes 1000 100000 1000000]
+                                     [--operations 1000] [--output FILE]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Callable
+from benchmarks.memory import make_user, make_car, make_product, make_order
+from benchmarks.results import print_table, save, summarize
+from src.models.schemas import (
+    Product, CreateUserDto, UpdateUserDto, CreateCarDto, UpdateCarDto,
+    CreateProductDto, UpdateProductDto, CreateOrderDto, UpdateOrderDto, OrderItem,
+)
+from src.services import user_service, car_service, product_service, order_service
+from src.services.id_allocator import create_id_allocator
+from src.types.enums import CarColor, OrderStatus, ProductCategory
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+DEFAULT_OPERATIONS = 1_000
+
+# Produto usado pelos pedidos criados no benchmark, com estoque que não se esgota
+ORDER_PRODUCT = Product(
+    id="1",
+    name="Benchmark product",
+    description="Benchmark product",
+    price=10.0,
+    stock=10**12,
+    category=ProductCategory.ELECTRONICS,
+)
+
+
+@dataclass(frozen=True)
+class ServiceCase:
+    """How to fill one service and call its CRUD operations."""
+
+    resource: str
+    service: ModuleType
+    allocator: str
+    make: Callable[[int], Any]
+    create_data: Any
+    update_data: Any
+    get: Callable
+    create: Callable
+    update: Callable
+    delete: Callable
+
+
+CASES = (
+    ServiceCase(
+        "users", user_service, "user_ids", make_user,
+        CreateUserDto(name="Benchmark", email="benchmark@example.com", age=30),
+        UpdateUserDto(age=31),
+        user_service.get_user_by_id, user_service.create_user, user_service.update_user, user_service.delete_user,
+    ),
+    ServiceCase(
+        "cars", car_service, "car_ids", make_car,
+        CreateCarDto(brand="Toyota", model="Corolla", year=2022, color=CarColor.WHITE, price=95000.0),
+        UpdateCarDto(price=90000.0),
+        car_service.get_car_by_id, car_service.create_car, car_service.update_car, car_service.delete_car,
+    ),
+    ServiceCase(
+        "products", product_service, "product_ids", make_product,
+        CreateProductDto(name="Benchmark", description="Benchmark", price=10.0, stock=5, category=ProductCategory.BOOKS),
+        UpdateProductDto(price=12.0),
+        product_service.get_product_by_id, product_service.create_product,
+        product_service.update_product, product_service.delete_product,
+    ),
+    ServiceCase(
+        "orders", order_service, "order_ids", make_order,
+        CreateOrderDto(userId="1", items=[OrderItem(productId=ORDER_PRODUCT.id, quantity=1, price=ORDER_PRODUCT.price)]),
+        UpdateOrderDto(status=OrderStatus.COMPLETED),
+        order_service.get_order_by_id, order_service.create_order, order_service.update_order, order_service.delete_order,
+    ),
+)
+
+
+def fill(case: ServiceCase, records: int) -> list[str]:
+    """Replace the service's records with ``records`` generated ones."""
+    repository = getattr(case.service, case.resource)
+    repository.clear()
+    for index in range(1, records + 1):
+        repository.add(case.make(index))
+    setattr(case.service, case.allocator, create_id_allocator(start=records))
+    if case.resource == "orders":
+        product_service.products.clear()
+        product_service.products.add(ORDER_PRODUCT)
+    return [str(index) for index in range(1, records + 1)]
+
+
+async def measure(call: Callable, arguments: list[tuple]) -> dict[str, float]:
+    latencies = []
+    started = time.perf_counter()
+    for args in arguments:
+        before = time.perf_counter_ns()
+        await call(*args)
+        latencies.append(time.perf_counter_ns() - before)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def run_case(case: ServiceCase, records: int, operations: int) -> list[dict]:
+    ids = fill(case, records)
+    rng = random.Random(records)
+    picked = [rng.choice(ids) for _ in range(operations)]
+    doomed = rng.sample(ids, min(operations, records))
+    runs = (
+        ("get", case.get, [(record_id,) for record_id in picked]),
+        ("update", case.update, [(record_id, case.update_data) for record_id in picked]),
+        ("create", case.create, [(case.create_data,)] * operations),
+        ("delete", case.delete, [(record_id,) for record_id in doomed]),
+    )
+    return [
+        {"resource": case.resource, "operation": operation, "records": records, **await measure(call, arguments)}
+        for operation, call, arguments in runs
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--operations", type=int, default=DEFAULT_OPERATIONS)
+    parser.add_argument("--output", help="JSON file to write (default: benchmarks/results/services-<commit>.json)")
+    args = parser.parse_args()
+
+    results = []
+    for records in args.sizes:
+        for case in CASES:
+            case_results = asyncio.run(run_case(case, records, args.operations))
+            print_table(case_results)
+            results.extend(case_results)
+    print(f"Saved to {save('services', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
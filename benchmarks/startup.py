@@ -0,0 +1,136 @@
+"""Cold-start time of the application, per ``STARTUP_MODE``.
+
+Usage: python -m benchmarks.startup [--modes eager lazy] [--runs 5]
+                                    [--path /api/users/] [--top 15] [--output FILE]
+
+Every run is a fresh ``python -X importtime`` process that imports
+``main`` and then serves one request to ``--path`` straight through ASGI
+(no HTTP client is imported, so the report only shows the application's
+own imports). Reported times are medians over the runs; the import report
+sums the self time of each module, with third-party packages folded into
+their top-level package.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from benchmarks.results import save
+
+DEFAULT_MODES = ("eager", "lazy")
+DEFAULT_RUNS = 5
+DEFAULT_PATH = "/api/users/"
+DEFAULT_TOP = 15
+ROOT = Path(__file__).resolve().parent.parent
+
+# Executado em cada processo filho; imprime os tempos em JSON na última linha do stdout
+CHILD = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def request(path):
+    status = []
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"localhost")], "client": ("127.0.0.1", 0), "server": ("localhost", 80),
+    }
+    await main.app(scope, receive, send)
+    return status[0]
+
+status = asyncio.run(request(sys.argv[1]))
+print(json.dumps({"status": status, "import": imported - started, "first_request": time.perf_counter() - imported}))
+"""
+
+
+def run_once(mode: str, path: str) -> tuple[dict, dict[str, int]]:
+    """Timings of one cold start, and the self time (µs) per module group."""
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD, path],
+        cwd=ROOT,
+        env={**os.environ, "STARTUP_MODE": mode},
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if process.returncode != 0:
+        raise RuntimeError(f"STARTUP_MODE={mode} failed:\n{process.stderr[-2000:]}")
+    timings = json.loads(process.stdout.strip().splitlines()[-1])
+    if timings["status"] >= 400:
+        raise RuntimeError(f"GET {path} answered {timings['status']}")
+    return {
+        "import_ms": timings["import"] * 1000,
+        "first_request_ms": timings["first_request"] * 1000,
+        "process_ms": elapsed * 1000,
+    }, import_report(process.stderr)
+
+
+def import_report(stderr: str) -> dict[str, int]:
+    """Sum ``-X importtime`` self times (µs) by module group (see ``group``)."""
+    totals: dict[str, int] = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        totals[group(name.strip())] += int(self_us)
+    return dict(totals)
+
+
+def group(module: str) -> str:
+    # Módulos do projeto aparecem um a um; bibliotecas somadas pelo pacote de topo
+    if module == "main" or module.startswith(("src.", "benchmarks.")):
+        return module
+    return module.split(".", 1)[0]
+
+
+def measure(mode: str, runs: int, path: str) -> tuple[dict, dict[str, float]]:
+    samples = [run_once(mode, path) for _ in range(runs)]
+    result = {"mode": mode, "path": path}
+    for metric in ("import_ms", "first_request_ms", "process_ms"):
+        result[metric] = round(statistics.median(timings[metric] for timings, _ in samples), 1)
+    modules = {name for _, report in samples for name in report}
+    report = {name: statistics.median(report.get(name, 0) for _, report in samples) / 1000 for name in modules}
+    return result, report
+
+
+def print_report(mode: str, result: dict, report: dict[str, float], top: int) -> None:
+    print(
+        f"STARTUP_MODE={mode}: import {result['import_ms']:.0f} ms, first request {result['first_request_ms']:.0f} ms, "
+        f"process {result['process_ms']:.0f} ms"
+    )
+    for name, milliseconds in sorted(report.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {milliseconds:>8.1f} ms  {name}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", nargs="+", choices=DEFAULT_MODES, default=DEFAULT_MODES)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--path", default=DEFAULT_PATH, help="route requested once the application is imported")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="module groups listed in the import report")
+    parser.add_argument("--output", help="JSON file to write (default: benchmarks/results/startup-<commit>.json)")
+    args = parser.parse_args()
+
+    results = []
+    for mode in args.modes:
+        result, report = measure(mode, args.runs, args.path)
+        print_report(mode, result, report, args.top)
+        results.append(result)
+    print(f"Saved to {save('startup', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
-from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+import functools
+import importlib
+import sys
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
@@ -8,10 +11,32 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+from src.routes.durability import DurableWritesMiddleware
+from src.routes.lazy import STARTUP_MODE, include_lazy
+from src.routes.admin import ADMIN_TOKEN
+from src.routes.metrics import MetricsMiddleware, router as metrics_router
+from src.routes.profiling import ProfilingMiddleware, router as profiling_router
+from src.routes.responses import DefaultJSONResponse
+from src.routes.tracing import TracingMiddleware, router as tracing_router
+from src.services import backend
+from src.services.metrics import METRICS_ENABLED
+from src.services.tracing import TRACING_ENABLED, instrument_module, tracer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    backend.check_single_process()
+    async with backend.background_tasks():
+        yield
+    tracer.close()
+
+
 app = FastAPI(
     title="RESTful API",
     description="API RESTful desenvolvida em Python 3.13 utilizando FastAPI",
     version="1.0.0",
+    default_response_class=DefaultJSONResponse,
+    lifespan=lifespan,
 )
 
 # Middleware CORS
@@ -23,13 +48,54 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Respostas de escrita só saem depois que o write-ahead log chega ao disco
+if backend.persistence is not None:
+    app.add_middleware(DurableWritesMiddleware, sync=backend.persistence.sync)
+
+# Perfilador por amostragem, ligado em tempo de execução pelas rotas /admin/profiler
+if ADMIN_TOKEN is not None:
+    app.add_middleware(ProfilingMiddleware)
+
+# Span raiz das requisições amostradas; fica por fora da espera pelo fsync, como as métricas
+if TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
+# Mais externo dos middlewares: a latência medida inclui a espera pelo fsync
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Routes
-from src.routes import user_routes, car_routes, product_routes, order_routes
+RESOURCES = {
+    "/api/users": "user",
+    "/api/cars": "car",
+    "/api/products": "product",
+    "/api/orders": "order",
+    "/api/analytics": "analytics",
+}
+
+
+def load_router(resource: str) -> APIRouter:
+    """Import the routes of ``resource`` (and its controller) and return its router."""
+    routes = importlib.import_module(f"src.routes.{resource}_routes")
+    if TRACING_ENABLED:
+        # As rotas chamam os controladores pelo módulo, então a troca no lugar já vale para elas
+        instrument_module(sys.modules[f"src.controllers.{resource}_controller"])
+    return routes.router
+
+
+if STARTUP_MODE == "lazy":
+    include_lazy(app, {prefix: functools.partial(load_router, resource) for prefix, resource in RESOURCES.items()})
+else:
+    for resource in RESOURCES.values():
+        app.include_router(load_router(resource))
+
+if METRICS_ENABLED:
+    app.include_router(metrics_router)
 
-app.include_router(user_routes.router)
-app.include_router(car_routes.router)
-app.include_router(product_routes.router)
-app.include_router(order_routes.router)
+if ADMIN_TOKEN is not None:
+    app.include_router(profiling_router)
+    if TRACING_ENABLED:
+        app.include_router(tracing_router)
 
 
 # Health check
@@ -41,7 +107,7 @@ async def health_check():
 # 404 handler
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
-    return JSONResponse(
+    return DefaultJSONResponse(
         status_code=exc.status_code,
         content={
             "error": {
@@ -55,7 +121,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
 # Validation error handler
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    return JSONResponse(
+    return DefaultJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "error": {
@@ -70,7 +136,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    return JSONResponse(
+    return DefaultJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error": {
@@ -84,5 +150,9 @@ async def global_exception_handler(request: Request, exc: Exception):
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 3000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    if backend.WEB_CONCURRENCY > 1:
+        # Com vários workers o uvicorn precisa importar a aplicação em cada processo
+        uvicorn.run("main:app", host="0.0.0.0", port=port, workers=backend.WEB_CONCURRENCY)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=port)
 
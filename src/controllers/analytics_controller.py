@@ -0,0 +1,36 @@
+from typing import Literal, Optional
+from fastapi import HTTPException, status
+from src.models.schemas import AggregateStats, GroupAggregate
+from src.services import backend
+from src.types.enums import OrderStatus, ProductCategory
+
+
+def _analytics_service():
+    # O espelho colunar acompanha apenas os repositórios em memória
+    if backend.STORAGE_BACKEND != "memory":
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Analytics requires the memory storage backend"
+        )
+    # Importado só aqui: com outro backend os serviços em memória nunca são carregados
+    from src.services import analytics_service
+    return analytics_service
+
+
+async def get_order_stats(order_status: Optional[OrderStatus] = None) -> AggregateStats:
+    return await _analytics_service().get_order_stats(order_status)
+
+
+async def get_order_revenue(
+    group_by: Literal["status", "user", "day"],
+    order_status: Optional[OrderStatus] = None,
+) -> list[GroupAggregate]:
+    return await _analytics_service().get_order_revenue(group_by, order_status)
+
+
+async def get_product_price_stats(category: Optional[ProductCategory] = None) -> AggregateStats:
+    return await _analytics_service().get_product_price_stats(category)
+
+
+async def get_inventory_by_category() -> list[GroupAggregate]:
+    return await _analytics_service().get_inventory_by_category()
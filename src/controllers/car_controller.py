@@ -1,10 +1,33 @@
+from typing import AsyncIterator, Optional
 from fastapi import HTTPException, status
-from src.models.schemas import Car, CreateCarDto, UpdateCarDto
-from src.services import car_service
+from src.models.schemas import Car, CreateCarDto, UpdateCarDto, BulkUpdateCarDto
+from src.services import ndjson_import
+from src.services.backend import car_service
+from src.services.repository import VersionConflictError
+from src.types.types import BulkResult, PaginatedResult, PaginationParams
 
 
-async def get_all_cars() -> list[Car]:
-    return await car_service.get_all_cars()
+def _precondition_failed() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Car was modified by another request"
+    )
+
+
+async def get_all_cars(pagination: PaginationParams) -> PaginatedResult[Car]:
+    try:
+        if pagination.is_keyset:
+            return await car_service.get_cars_after(pagination.cursor, pagination.limit or pagination.page_size)
+        return await car_service.get_cars_page(pagination.page, pagination.page_size)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+
+
+async def export_cars() -> AsyncIterator[list[Car]]:
+    return car_service.stream_cars()
 
 
 async def get_car_by_id(car_id: str) -> Car:
@@ -21,8 +44,11 @@ async def create_car(car_data: CreateCarDto) -> Car:
     return await car_service.create_car(car_data)
 
 
-async def update_car(car_id: str, car_data: UpdateCarDto) -> Car:
-    updated_car = await car_service.update_car(car_id, car_data)
+async def update_car(car_id: str, car_data: UpdateCarDto, expected_version: Optional[int] = None) -> Car:
+    try:
+        updated_car = await car_service.update_car(car_id, car_data, expected_version)
+    except VersionConflictError:
+        raise _precondition_failed()
     if not updated_car:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -31,8 +57,11 @@ async def update_car(car_id: str, car_data: UpdateCarDto) -> Car:
     return updated_car
 
 
-async def delete_car(car_id: str) -> dict:
-    deleted = await car_service.delete_car(car_id)
+async def delete_car(car_id: str, expected_version: Optional[int] = None) -> dict:
+    try:
+        deleted = await car_service.delete_car(car_id, expected_version)
+    except VersionConflictError:
+        raise _precondition_failed()
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -40,3 +69,18 @@ async def delete_car(car_id: str) -> dict:
         )
     return {"message": "Car deleted successfully"}
 
+
+async def bulk_create_cars(cars_data: list[CreateCarDto]) -> BulkResult[Car]:
+    return await car_service.bulk_create_cars(cars_data)
+
+
+async def bulk_update_cars(cars_data: list[BulkUpdateCarDto]) -> BulkResult[Car]:
+    return await car_service.bulk_update_cars(cars_data)
+
+
+async def bulk_delete_cars(ids: list[str]) -> BulkResult[Car]:
+    return await car_service.bulk_delete_cars(ids)
+
+
+async def import_cars(chunks: AsyncIterator[bytes]) -> AsyncIterator[ndjson_import.ImportEvent]:
+    return ndjson_import.import_ndjson(chunks, CreateCarDto, car_service.bulk_create_cars)
@@ -1,10 +1,43 @@
+from typing import AsyncIterator, Optional
 from fastapi import HTTPException, status
-from src.models.schemas import Order, CreateOrderDto, UpdateOrderDto
-from src.services import order_service
+from src.models.schemas import Order, CreateOrderDto, UpdateOrderDto, BulkUpdateOrderDto
+from src.services import ndjson_import, order_placement
+from src.services.backend import order_service
+from src.services.repository import VersionConflictError
+from src.types.enums import OrderStatus
+from src.types.types import BulkResult, PaginatedResult, PaginationParams
 
 
-async def get_all_orders() -> list[Order]:
-    return await order_service.get_all_orders()
+def _precondition_failed() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Order was modified by another request"
+    )
+
+
+async def get_all_orders(
+    pagination: PaginationParams,
+    user_id: Optional[str] = None,
+    order_status: Optional[OrderStatus] = None,
+) -> PaginatedResult[Order]:
+    try:
+        if pagination.is_keyset:
+            return await order_service.get_orders_after(
+                pagination.cursor, pagination.limit or pagination.page_size, user_id, order_status
+            )
+        return await order_service.get_orders_page(pagination.page, pagination.page_size, user_id, order_status)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+
+
+async def export_orders(
+    user_id: Optional[str] = None,
+    order_status: Optional[OrderStatus] = None,
+) -> AsyncIterator[list[Order]]:
+    return order_service.stream_orders(user_id, order_status)
 
 
 async def get_order_by_id(order_id: str) -> Order:
@@ -18,11 +51,25 @@ async def get_order_by_id(order_id: str) -> Order:
 
 
 async def create_order(order_data: CreateOrderDto) -> Order:
-    return await order_service.create_order(order_data)
+    try:
+        return await order_service.create_order(order_data)
+    except order_placement.PlacementError as exc:
+        raise HTTPException(
+            status_code=exc.status,
+            detail=str(exc)
+        )
 
 
-async def update_order(order_id: str, order_data: UpdateOrderDto) -> Order:
-    updated_order = await order_service.update_order(order_id, order_data)
+async def update_order(order_id: str, order_data: UpdateOrderDto, expected_version: Optional[int] = None) -> Order:
+    try:
+        updated_order = await order_service.update_order(order_id, order_data, expected_version)
+    except VersionConflictError:
+        raise _precondition_failed()
+    except (order_placement.PlacementError, order_placement.OrderStateError) as exc:
+        raise HTTPException(
+            status_code=exc.status,
+            detail=str(exc)
+        )
     if not updated_order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -31,8 +78,11 @@ async def update_order(order_id: str, order_data: UpdateOrderDto) -> Order:
     return updated_order
 
 
-async def delete_order(order_id: str) -> dict:
-    deleted = await order_service.delete_order(order_id)
+async def delete_order(order_id: str, expected_version: Optional[int] = None) -> dict:
+    try:
+        deleted = await order_service.delete_order(order_id, expected_version)
+    except VersionConflictError:
+        raise _precondition_failed()
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -40,3 +90,18 @@ async def delete_order(order_id: str) -> dict:
         )
     return {"message": "Order deleted successfully"}
 
+
+async def bulk_create_orders(orders_data: list[CreateOrderDto]) -> BulkResult[Order]:
+    return await order_service.bulk_create_orders(orders_data)
+
+
+async def bulk_update_orders(orders_data: list[BulkUpdateOrderDto]) -> BulkResult[Order]:
+    return await order_service.bulk_update_orders(orders_data)
+
+
+async def bulk_delete_orders(ids: list[str]) -> BulkResult[Order]:
+    return await order_service.bulk_delete_orders(ids)
+
+
+async def import_orders(chunks: AsyncIterator[bytes]) -> AsyncIterator[ndjson_import.ImportEvent]:
+    return ndjson_import.import_ndjson(chunks, CreateOrderDto, order_service.bulk_create_orders)
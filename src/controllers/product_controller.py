@@ -1,10 +1,38 @@
+from typing import AsyncIterator, Optional
 from fastapi import HTTPException, status
-from src.models.schemas import Product, CreateProductDto, UpdateProductDto
-from src.services import product_service
+from src.models.schemas import Product, CreateProductDto, UpdateProductDto, BulkUpdateProductDto, ProductFilters
+from src.services import ndjson_import
+from src.services.backend import product_service
+from src.services.repository import VersionConflictError
+from src.types.types import BulkResult, PaginatedResult, PaginationParams
 
 
-async def get_all_products() -> list[Product]:
-    return await product_service.get_all_products()
+def _precondition_failed() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Product was modified by another request"
+    )
+
+
+async def get_all_products(
+    pagination: PaginationParams,
+    filters: Optional[ProductFilters] = None,
+) -> PaginatedResult[Product]:
+    try:
+        if pagination.is_keyset:
+            return await product_service.get_products_after(
+                pagination.cursor, pagination.limit or pagination.page_size, filters
+            )
+        return await product_service.get_products_page(pagination.page, pagination.page_size, filters)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+
+
+async def export_products(filters: Optional[ProductFilters] = None) -> AsyncIterator[list[Product]]:
+    return product_service.stream_products(filters)
 
 
 async def get_product_by_id(product_id: str) -> Product:
@@ -21,8 +49,11 @@ async def create_product(product_data: CreateProductDto) -> Product:
     return await product_service.create_product(product_data)
 
 
-async def update_product(product_id: str, product_data: UpdateProductDto) -> Product:
-    updated_product = await product_service.update_product(product_id, product_data)
+async def update_product(product_id: str, product_data: UpdateProductDto, expected_version: Optional[int] = None) -> Product:
+    try:
+        updated_product = await product_service.update_product(product_id, product_data, expected_version)
+    except VersionConflictError:
+        raise _precondition_failed()
     if not updated_product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -31,8 +62,11 @@ async def update_product(product_id: str, product_data: UpdateProductDto) -> Pro
     return updated_product
 
 
-async def delete_product(product_id: str) -> dict:
-    deleted = await product_service.delete_product(product_id)
+async def delete_product(product_id: str, expected_version: Optional[int] = None) -> dict:
+    try:
+        deleted = await product_service.delete_product(product_id, expected_version)
+    except VersionConflictError:
+        raise _precondition_failed()
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -40,3 +74,18 @@ async def delete_product(product_id: str) -> dict:
         )
     return {"message": "Product deleted successfully"}
 
+
+async def bulk_create_products(products_data: list[CreateProductDto]) -> BulkResult[Product]:
+    return await product_service.bulk_create_products(products_data)
+
+
+async def bulk_update_products(products_data: list[BulkUpdateProductDto]) -> BulkResult[Product]:
+    return await product_service.bulk_update_products(products_data)
+
+
+async def bulk_delete_products(ids: list[str]) -> BulkResult[Product]:
+    return await product_service.bulk_delete_products(ids)
+
+
+async def import_products(chunks: AsyncIterator[bytes]) -> AsyncIterator[ndjson_import.ImportEvent]:
+    return ndjson_import.import_ndjson(chunks, CreateProductDto, product_service.bulk_create_products)
@@ -1,10 +1,33 @@
+from typing import AsyncIterator, Optional
 from fastapi import HTTPException, status
-from src.models.schemas import User, CreateUserDto, UpdateUserDto
-from src.services import user_service
+from src.models.schemas import User, CreateUserDto, UpdateUserDto, BulkUpdateUserDto
+from src.services import ndjson_import
+from src.services.backend import user_service
+from src.services.repository import VersionConflictError
+from src.types.types import BulkResult, PaginatedResult, PaginationParams
 
 
-async def get_all_users() -> list[User]:
-    return await user_service.get_all_users()
+def _precondition_failed() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="User was modified by another request"
+    )
+
+
+async def get_all_users(pagination: PaginationParams) -> PaginatedResult[User]:
+    try:
+        if pagination.is_keyset:
+            return await user_service.get_users_after(pagination.cursor, pagination.limit or pagination.page_size)
+        return await user_service.get_users_page(pagination.page, pagination.page_size)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+
+
+async def export_users() -> AsyncIterator[list[User]]:
+    return user_service.stream_users()
 
 
 async def get_user_by_id(user_id: str) -> User:
@@ -21,8 +44,11 @@ async def create_user(user_data: CreateUserDto) -> User:
     return await user_service.create_user(user_data)
 
 
-async def update_user(user_id: str, user_data: UpdateUserDto) -> User:
-    updated_user = await user_service.update_user(user_id, user_data)
+async def update_user(user_id: str, user_data: UpdateUserDto, expected_version: Optional[int] = None) -> User:
+    try:
+        updated_user = await user_service.update_user(user_id, user_data, expected_version)
+    except VersionConflictError:
+        raise _precondition_failed()
     if not updated_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -31,8 +57,11 @@ async def update_user(user_id: str, user_data: UpdateUserDto) -> User:
     return updated_user
 
 
-async def delete_user(user_id: str) -> dict:
-    deleted = await user_service.delete_user(user_id)
+async def delete_user(user_id: str, expected_version: Optional[int] = None) -> dict:
+    try:
+        deleted = await user_service.delete_user(user_id, expected_version)
+    except VersionConflictError:
+        raise _precondition_failed()
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -40,3 +69,18 @@ async def delete_user(user_id: str) -> dict:
         )
     return {"message": "User deleted successfully"}
 
+
+async def bulk_create_users(users_data: list[CreateUserDto]) -> BulkResult[User]:
+    return await user_service.bulk_create_users(users_data)
+
+
+async def bulk_update_users(users_data: list[BulkUpdateUserDto]) -> BulkResult[User]:
+    return await user_service.bulk_update_users(users_data)
+
+
+async def bulk_delete_users(ids: list[str]) -> BulkResult[User]:
+    return await user_service.bulk_delete_users(ids)
+
+
+async def import_users(chunks: AsyncIterator[bytes]) -> AsyncIterator[ndjson_import.ImportEvent]:
+    return ndjson_import.import_ndjson(chunks, CreateUserDto, user_service.bulk_create_users)
@@ -1,32 +1,48 @@
 from .schemas import (
+    Record,
     User,
     CreateUserDto,
     UpdateUserDto,
+    BulkUpdateUserDto,
     Car,
     CreateCarDto,
     UpdateCarDto,
+    BulkUpdateCarDto,
     Product,
     CreateProductDto,
     UpdateProductDto,
+    BulkUpdateProductDto,
+    ProductFilters,
     OrderItem,
     Order,
     CreateOrderDto,
     UpdateOrderDto,
+    BulkUpdateOrderDto,
+    AggregateStats,
+    GroupAggregate,
 )
 
 __all__ = [
+    "Record",
     "User",
     "CreateUserDto",
     "UpdateUserDto",
+    "BulkUpdateUserDto",
     "Car",
     "CreateCarDto",
     "UpdateCarDto",
+    "BulkUpdateCarDto",
     "Product",
     "CreateProductDto",
     "UpdateProductDto",
+    "BulkUpdateProductDto",
+    "ProductFilters",
     "OrderItem",
     "Order",
     "CreateOrderDto",
     "UpdateOrderDto",
+    "BulkUpdateOrderDto",
+    "AggregateStats",
+    "GroupAggregate",
 ]
 
@@ -1,10 +1,54 @@
-from typing import Optional, Literal
-from pydantic import BaseModel, Field
+from typing import Any, Callable, Optional, Literal
+from pydantic import BaseModel, Field, PrivateAttr
 from datetime import datetime
 from src.types.enums import OrderStatus, ProductCategory, CarColor
 
 
-class User(BaseModel):
+class Record(BaseModel):
+    """Stored entity that memoizes its own encodings (JSON, MessagePack).
+
+    Records are replaced rather than mutated on update, so each encoding is
+    computed once per version; assigning a field discards them anyway.
+    ``version`` is the stored version the instance was read at, if any.
+    """
+
+    _encoded: Optional[dict[str, bytes]] = PrivateAttr(default=None)
+    _version: Optional[int] = PrivateAttr(default=None)
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._version
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._encoded = None
+
+    def __eq__(self, other: object) -> bool:
+        # Os bytes memoizados não fazem parte da igualdade
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        return type(self) is type(other) and self.__dict__ == other.__dict__
+
+    def model_copy(self, *, update: Optional[dict[str, Any]] = None, deep: bool = False):
+        copied = super().model_copy(update=update, deep=deep)
+        copied._encoded = None
+        return copied
+
+    def encoded(self, media_type: str, encode: Callable[["Record"], bytes]) -> bytes:
+        """Return this version's ``media_type`` encoding, computing it once."""
+        if self._encoded is None:
+            self._encoded = {}
+        body = self._encoded.get(media_type)
+        if body is None:
+            body = self._encoded[media_type] = encode(self)
+        return body
+
+    def json_bytes(self) -> bytes:
+        return self.encoded("application/json", lambda record: record.__pydantic_serializer__.to_json(record))
+
+
+class User(Record):
     id: str
     name: str
     email: str
@@ -23,7 +67,11 @@ class UpdateUserDto(BaseModel):
     age: Optional[int] = None
 
 
-class Car(BaseModel):
+class BulkUpdateUserDto(UpdateUserDto):
+    id: str
+
+
+class Car(Record):
     id: str
     brand: str
     model: str
@@ -48,7 +96,11 @@ class UpdateCarDto(BaseModel):
     price: Optional[float] = None
 
 
-class Product(BaseModel):
+class BulkUpdateCarDto(UpdateCarDto):
+    id: str
+
+
+class Product(Record):
     id: str
     name: str
     description: str
@@ -73,13 +125,35 @@ class UpdateProductDto(BaseModel):
     category: Optional[ProductCategory] = None
 
 
+class BulkUpdateProductDto(UpdateProductDto):
+    id: str
+
+
+class ProductFilters(BaseModel):
+    category: Optional[ProductCategory] = None
+    minPrice: Optional[float] = None
+    maxPrice: Optional[float] = None
+    inStock: Optional[bool] = None
+    sort: Optional[Literal["price", "-price"]] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return (
+            self.category is None
+            and self.minPrice is None
+            and self.maxPrice is None
+            and self.inStock is None
+            and self.sort is None
+        )
+
+
 class OrderItem(BaseModel):
     productId: str
     quantity: int
     price: float
 
 
-class Order(BaseModel):
+class Order(Record):
     id: str
     userId: str
     items: list[OrderItem]
@@ -100,5 +174,51 @@ class UpdateOrderDto(BaseModel):
     items: Optional[list[OrderItem]] = None
     total: Optional[float] = None
     status: Optional[OrderStatus] = None
-    status: Optional[Literal["pending", "processing", "completed", "cancelled"]] = None
 
+
+
+class BulkUpdateOrderDto(UpdateOrderDto):
+    id: str
+
+
+class AggregateStats(BaseModel):
+    count: int
+    sum: float
+    mean: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    p99: Optional[float] = None
+
+
+class GroupAggregate(BaseModel):
+    key: str
+    count: int
+    sum: float
+    mean: float
+
+
+class ProfilerSettings(BaseModel):
+    sampleRate: float = Field(1.0, gt=0, le=1)
+    route: Optional[str] = None
+    intervalMs: float = Field(5.0, ge=1, le=1000)
+
+
+class ProfilerStatus(BaseModel):
+    enabled: bool
+    sampleRate: float
+    route: Optional[str] = None
+    intervalMs: float
+    samples: int
+
+
+class TracingSettings(BaseModel):
+    sampleRate: float = Field(..., ge=0, le=1)
+
+
+class TracingStatus(BaseModel):
+    sampleRate: float
+    maxSpansPerTrace: int
+    bufferedTraces: int
+    file: Optional[str] = None
@@ -0,0 +1,20 @@
+"""Access control for the operational ``/admin`` routes."""
+
+import os
+import secrets
+from typing import Optional
+from fastapi import Header, HTTPException, status
+
+# Sem ADMIN_TOKEN as rotas administrativas ficam desativadas
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN") or None
+
+
+async def require_admin(authorization: Optional[str] = Header(None)) -> None:
+    """Accept only ``Authorization: Bearer <ADMIN_TOKEN>``."""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Admin token required",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -0,0 +1,31 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Query
+from src.controllers import analytics_controller
+from src.routes.responses import NegotiatedRoute
+from src.models.schemas import AggregateStats, GroupAggregate
+from src.types.enums import OrderStatus, ProductCategory
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"], route_class=NegotiatedRoute)
+
+
+@router.get("/orders/summary", response_model=AggregateStats)
+async def get_order_stats(status: Optional[OrderStatus] = Query(None)):
+    return await analytics_controller.get_order_stats(status)
+
+
+@router.get("/orders/revenue", response_model=list[GroupAggregate])
+async def get_order_revenue(
+    group_by: Literal["status", "user", "day"] = Query("status", alias="groupBy"),
+    status: Optional[OrderStatus] = Query(None),
+):
+    return await analytics_controller.get_order_revenue(group_by, status)
+
+
+@router.get("/products/summary", response_model=AggregateStats)
+async def get_product_price_stats(category: Optional[ProductCategory] = Query(None)):
+    return await analytics_controller.get_product_price_stats(category)
+
+
+@router.get("/products/inventory", response_model=list[GroupAggregate])
+async def get_inventory_by_category():
+    return await analytics_controller.get_inventory_by_category()
@@ -0,0 +1,14 @@
+from typing import TypeVar
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+
+T = TypeVar("T")
+
+
+async def parse_bulk_body(request: Request, adapter: TypeAdapter[list[T]]) -> list[T]:
+    """Validate the raw JSON array in a single TypeAdapter pass."""
+    try:
+        return adapter.validate_json(await request.body())
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors(include_url=False))
@@ -1,18 +1,75 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Request, Response, status
+from pydantic import TypeAdapter
 from src.controllers import car_controller
-from src.models.schemas import Car, CreateCarDto, UpdateCarDto
+from src.models.schemas import Car, CreateCarDto, UpdateCarDto, BulkUpdateCarDto
+from src.routes.bulk import parse_bulk_body
+from src.routes.pagination import pagination_params
+from src.routes.preconditions import if_match_version, set_record_etag
+from src.routes.response_cache import query_key, response_cache
+from src.routes.responses import NegotiatedRoute
+from src.routes.streaming import accepts_ndjson, ndjson_events, ndjson_response
+from src.types.types import BulkResult, PaginatedResult, PaginationParams
 
-router = APIRouter(prefix="/api/cars", tags=["cars"])
+router = APIRouter(prefix="/api/cars", tags=["cars"], route_class=NegotiatedRoute)
 
+bulk_create_adapter = TypeAdapter(list[CreateCarDto])
+bulk_update_adapter = TypeAdapter(list[BulkUpdateCarDto])
+bulk_delete_adapter = TypeAdapter(list[str])
 
-@router.get("/", response_model=list[Car])
-async def get_all_cars():
-    return await car_controller.get_all_cars()
+
+@router.get("/", response_model=PaginatedResult[Car])
+async def get_all_cars(request: Request, pagination: PaginationParams = Depends(pagination_params)):
+    if accepts_ndjson(request):
+        return ndjson_response(await car_controller.export_cars())
+    return await response_cache.respond(
+        request,
+        ("cars", "list", query_key(request)),
+        lambda: car_controller.get_all_cars(pagination),
+    )
+
+
+@router.get("/export")
+async def export_cars():
+    return ndjson_response(await car_controller.export_cars())
+
+
+@router.post("/import")
+async def import_cars(request: Request):
+    return ndjson_events(await car_controller.import_cars(request.stream()))
+
+
+# Rotas /bulk declaradas antes de /{car_id} para não serem capturadas por ela
+@router.post("/bulk", response_model=BulkResult[Car], status_code=201)
+async def bulk_create_cars(request: Request):
+    cars_data = await parse_bulk_body(request, bulk_create_adapter)
+    return await car_controller.bulk_create_cars(cars_data)
+
+
+@router.patch("/bulk", response_model=BulkResult[Car])
+async def bulk_update_cars(request: Request, response: Response):
+    cars_data = await parse_bulk_body(request, bulk_update_adapter)
+    result = await car_controller.bulk_update_cars(cars_data)
+    if not result.applied:
+        response.status_code = status.HTTP_409_CONFLICT
+    return result
+
+
+@router.delete("/bulk", response_model=BulkResult[Car])
+async def bulk_delete_cars(request: Request, response: Response):
+    ids = await parse_bulk_body(request, bulk_delete_adapter)
+    result = await car_controller.bulk_delete_cars(ids)
+    if not result.applied:
+        response.status_code = status.HTTP_409_CONFLICT
+    return result
 
 
 @router.get("/{car_id}", response_model=Car)
-async def get_car_by_id(car_id: str):
-    return await car_controller.get_car_by_id(car_id)
+async def get_car_by_id(car_id: str, request: Request):
+    return await response_cache.respond(
+        request,
+        ("cars", "id", car_id),
+        lambda: car_controller.get_car_by_id(car_id),
+    )
 
 
 @router.post("/", response_model=Car, status_code=201)
@@ -21,11 +78,13 @@ async def create_car(car_data: CreateCarDto):
 
 
 @router.put("/{car_id}", response_model=Car)
-async def update_car(car_id: str, car_data: UpdateCarDto):
-    return await car_controller.update_car(car_id, car_data)
+async def update_car(car_id: str, car_data: UpdateCarDto, request: Request, response: Response):
+    car = await car_controller.update_car(car_id, car_data, if_match_version(request))
+    set_record_etag(response, car, request)
+    return car
 
 
 @router.delete("/{car_id}")
-async def delete_car(car_id: str):
-    return await car_controller.delete_car(car_id)
+async def delete_car(car_id: str, request: Request):
+    return await car_controller.delete_car(car_id, if_match_version(request))
 
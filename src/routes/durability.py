@@ -0,0 +1,32 @@
+"""ASGI middleware that acknowledges writes only once they are durable."""
+
+from typing import Awaitable, Callable
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class DurableWritesMiddleware:
+    """Hold the response of every write request until ``sync()`` returns.
+
+    The response start is delayed rather than the handler, so concurrent
+    requests keep appending to the log and share the same group commit.
+    Streamed bodies are synced before every chunk, since a progress line
+    may report writes made after the response started.
+    """
+
+    def __init__(self, app: ASGIApp, sync: Callable[[], Awaitable[None]]) -> None:
+        self.app = app
+        self.sync = sync
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_when_durable(message: Message) -> None:
+            if message["type"] in ("http.response.start", "http.response.body"):
+                await self.sync()
+            await send(message)
+
+        await self.app(scope, receive, send_when_durable)
@@ -0,0 +1,68 @@
+"""Responses assembled from each record's memoized encoding."""
+
+from typing import Any
+import msgpack
+from fastapi import Response
+from src.models.schemas import Record
+from src.types.types import PaginatedResult
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+def _record_msgpack(record: Record) -> bytes:
+    return msgpack.packb(record.model_dump(mode="json"))
+
+
+def record_bytes(record: Record, media_type: str = JSON_MEDIA_TYPE) -> bytes:
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return record.encoded(MSGPACK_MEDIA_TYPE, _record_msgpack)
+    return record.json_bytes()
+
+
+def encode_json(content: Any) -> bytes:
+    """Encode a record or a page of records by joining cached fragments.
+
+    Skips ``response_model`` validation and ``jsonable_encoder``: records
+    were validated when stored, and only the page metadata is serialized
+    per request.
+    """
+    if isinstance(content, bytes):
+        return content
+    if isinstance(content, Record):
+        return content.json_bytes()
+    if isinstance(content, PaginatedResult):
+        metadata = content.model_dump_json(exclude={"items"}).encode()
+        items = b",".join(record.json_bytes() for record in content.items)
+        # "items" é o primeiro campo, então a saída é idêntica à do Pydantic
+        return b'{"items":[' + items + b"]," + metadata[1:]
+    raise TypeError(f"Cannot encode {type(content).__name__} from fragments")
+
+
+def encode_msgpack(content: Any) -> bytes:
+    """MessagePack counterpart of ``encode_json``; arrays concatenate just as well."""
+    if isinstance(content, bytes):
+        return content
+    if isinstance(content, Record):
+        return record_bytes(content, MSGPACK_MEDIA_TYPE)
+    if isinstance(content, PaginatedResult):
+        metadata = content.model_dump(mode="json", exclude={"items"})
+        packer = msgpack.Packer()
+        parts = [packer.pack_map_header(len(metadata) + 1), packer.pack("items"), packer.pack_array_header(len(content.items))]
+        parts.extend(record_bytes(record, MSGPACK_MEDIA_TYPE) for record in content.items)
+        for name, value in metadata.items():
+            parts.append(packer.pack(name))
+            parts.append(packer.pack(value))
+        return b"".join(parts)
+    raise TypeError(f"Cannot encode {type(content).__name__} from fragments")
+
+
+def encode(content: Any, media_type: str) -> bytes:
+    return encode_msgpack(content) if media_type == MSGPACK_MEDIA_TYPE else encode_json(content)
+
+
+class FragmentResponse(Response):
+    media_type = JSON_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return encode(content, self.media_type)
@@ -0,0 +1,75 @@
+"""Deferred router registration for faster worker startup.
+
+``STARTUP_MODE`` picks how ``main`` registers the resource routers:
+``eager`` (default) imports every route module, with its controller and
+the libraries it needs, at import time; ``lazy`` registers a placeholder
+per URL prefix instead, and imports the real router on the first request
+under that prefix. Building the OpenAPI schema loads every router first.
+"""
+
+import os
+from typing import Callable
+from fastapi import APIRouter, FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+STARTUP_MODE = os.getenv("STARTUP_MODE", "eager").lower()
+
+if STARTUP_MODE not in ("eager", "lazy"):
+    raise ValueError(f"Unknown STARTUP_MODE: {STARTUP_MODE}")
+
+
+class LazyRouter(BaseRoute):
+    """Placeholder matching every path under ``prefix``.
+
+    The first request it matches calls ``load`` and swaps the placeholder
+    for the returned router's routes, in place, then routes the request
+    again. The import runs without yielding to the event loop, so
+    concurrent first requests load it only once.
+    """
+
+    def __init__(self, app: FastAPI, prefix: str, load: Callable[[], APIRouter]) -> None:
+        self.app = app
+        self.prefix = prefix
+        self.load = load
+        self.loaded = False
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        path = scope.get("path", "")
+        if scope["type"] == "http" and (path == self.prefix or path.startswith(self.prefix + "/")):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params: object):
+        raise NoMatchFound(name, path_params)
+
+    def ensure(self) -> None:
+        if self.loaded:
+            return
+        routes = self.app.router.routes
+        count = len(routes)
+        self.app.include_router(self.load())
+        # include_router acrescenta no fim; as rotas novas assumem a posição do marcador
+        loaded = routes[count:]
+        del routes[count:]
+        position = routes.index(self)
+        routes[position:position + 1] = loaded
+        self.loaded = True
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.ensure()
+        await self.app.router.app(scope, receive, send)
+
+
+def include_lazy(app: FastAPI, routers: dict[str, Callable[[], APIRouter]]) -> None:
+    """Register ``prefix -> load`` routers to be imported on first use."""
+    placeholders = [LazyRouter(app, prefix, load) for prefix, load in routers.items()]
+    app.router.routes.extend(placeholders)
+    openapi = app.openapi
+
+    def openapi_with_every_router() -> dict:
+        for placeholder in placeholders:
+            placeholder.ensure()
+        return openapi()
+
+    app.openapi = openapi_with_every_router
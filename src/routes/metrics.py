@@ -0,0 +1,58 @@
+"""ASGI middleware recording per-route latency, and the ``/metrics`` endpoint."""
+
+import time
+from fastapi import APIRouter, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.services.metrics import MetricsRegistry, metrics, request_service_time
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Rótulo das requisições que não casaram com nenhuma rota (evita um rótulo por URL)
+UNMATCHED_ROUTE = "<unmatched>"
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return Response(metrics.render(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+
+class MetricsMiddleware:
+    """Time every HTTP request and record it under its route template.
+
+    The template (``/api/users/{user_id}``) is read from the scope after
+    routing, and the status from ``http.response.start``; a request whose
+    handler raised is recorded as a 500.
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = metrics) -> None:
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        registry = self.registry
+        spent = [0.0]
+        token = request_service_time.set(spent)
+        registry.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - started
+            registry.in_flight -= 1
+            request_service_time.reset(token)
+            route = scope.get("route")
+            template = route.path if route is not None else UNMATCHED_ROUTE
+            registry.observe_request(template, scope["method"], status, duration, spent[0])
@@ -1,18 +1,88 @@
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from pydantic import TypeAdapter
 from src.controllers import order_controller
-from src.models.schemas import Order, CreateOrderDto, UpdateOrderDto
+from src.models.schemas import Order, CreateOrderDto, UpdateOrderDto, BulkUpdateOrderDto
+from src.routes.bulk import parse_bulk_body
+from src.routes.pagination import pagination_params
+from src.routes.preconditions import if_match_version, set_record_etag
+from src.routes.response_cache import query_key, response_cache
+from src.routes.responses import NegotiatedRoute
+from src.routes.streaming import accepts_ndjson, ndjson_events, ndjson_response
+from src.types.enums import OrderStatus
+from src.types.types import BulkResult, PaginatedResult, PaginationParams
 
-router = APIRouter(prefix="/api/orders", tags=["orders"])
+router = APIRouter(prefix="/api/orders", tags=["orders"], route_class=NegotiatedRoute)
 
+bulk_create_adapter = TypeAdapter(list[CreateOrderDto])
+bulk_update_adapter = TypeAdapter(list[BulkUpdateOrderDto])
+bulk_delete_adapter = TypeAdapter(list[str])
 
-@router.get("/", response_model=list[Order])
-async def get_all_orders():
-    return await order_controller.get_all_orders()
+
+@router.get("/", response_model=PaginatedResult[Order])
+async def get_all_orders(
+    request: Request,
+    pagination: PaginationParams = Depends(pagination_params),
+    user_id: Optional[str] = Query(None, alias="userId"),
+    status_filter: Optional[OrderStatus] = Query(None, alias="status"),
+):
+    if accepts_ndjson(request):
+        return ndjson_response(await order_controller.export_orders(user_id, status_filter))
+    return await response_cache.respond(
+        request,
+        ("orders", "list", query_key(request)),
+        lambda: order_controller.get_all_orders(pagination, user_id, status_filter),
+    )
+
+
+@router.get("/export")
+async def export_orders(
+    user_id: Optional[str] = Query(None, alias="userId"),
+    status_filter: Optional[OrderStatus] = Query(None, alias="status"),
+):
+    return ndjson_response(await order_controller.export_orders(user_id, status_filter))
+
+
+@router.post("/import")
+async def import_orders(request: Request):
+    return ndjson_events(await order_controller.import_orders(request.stream()))
+
+
+# Rotas /bulk declaradas antes de /{order_id} para não serem capturadas por ela
+@router.post("/bulk", response_model=BulkResult[Order], status_code=201)
+async def bulk_create_orders(request: Request, response: Response):
+    orders_data = await parse_bulk_body(request, bulk_create_adapter)
+    result = await order_controller.bulk_create_orders(orders_data)
+    if not result.applied:
+        response.status_code = status.HTTP_409_CONFLICT
+    return result
+
+
+@router.patch("/bulk", response_model=BulkResult[Order])
+async def bulk_update_orders(request: Request, response: Response):
+    orders_data = await parse_bulk_body(request, bulk_update_adapter)
+    result = await order_controller.bulk_update_orders(orders_data)
+    if not result.applied:
+        response.status_code = status.HTTP_409_CONFLICT
+    return result
+
+
+@router.delete("/bulk", response_model=BulkResult[Order])
+async def bulk_delete_orders(request: Request, response: Response):
+    ids = await parse_bulk_body(request, bulk_delete_adapter)
+    result = await order_controller.bulk_delete_orders(ids)
+    if not result.applied:
+        response.status_code = status.HTTP_409_CONFLICT
+    return result
 
 
 @router.get("/{order_id}", response_model=Order)
-async def get_order_by_id(order_id: str):
-    return await order_controller.get_order_by_id(order_id)
+async def get_order_by_id(order_id: str, request: Request):
+    return await response_cache.respond(
+        request,
+        ("orders", "id", order_id),
+        lambda: order_controller.get_order_by_id(order_id),
+    )
 
 
 @router.post("/", response_model=Order, status_code=201)
@@ -21,11 +91,13 @@ async def create_order(order_data: CreateOrderDto):
 
 
 @router.put("/{order_id}", response_model=Order)
-async def update_order(order_id: str, order_data: UpdateOrderDto):
-    return await order_controller.update_order(order_id, order_data)
+async def update_order(order_id: str, order_data: UpdateOrderDto, request: Request, response: Response):
+    order = await order_controller.update_order(order_id, order_data, if_match_version(request))
+    set_record_etag(response, order, request)
+    return order
 
 
 @router.delete("/{order_id}")
-async def delete_order(order_id: str):
-    return await order_controller.delete_order(order_id)
+async def delete_order(order_id: str, request: Request):
+    return await order_controller.delete_order(order_id, if_match_version(request))
 
@@ -0,0 +1,15 @@
+from typing import Optional
+from fastapi import Query
+from src.types.types import PaginationParams
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def pagination_params(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+) -> PaginationParams:
+    return PaginationParams(page=page, page_size=page_size, cursor=cursor, limit=limit)
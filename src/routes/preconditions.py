@@ -0,0 +1,55 @@
+"""Version-based ETags and ``If-Match`` parsing for single-record routes.
+
+A record's ETag is its stored version (``"3"``), with the media type as a
+suffix for non-JSON representations (``"3-msgpack"``) so that strong
+validators stay unique per representation.
+"""
+
+from typing import Optional
+from fastapi import HTTPException, Request, Response, status
+from src.models.schemas import Record
+from src.routes.fragments import MSGPACK_MEDIA_TYPE
+from src.routes.responses import negotiate
+
+MEDIA_TYPE_SUFFIXES = {MSGPACK_MEDIA_TYPE: "-msgpack"}
+
+
+def record_etag(record: Record, media_type: str) -> Optional[str]:
+    if record.version is None:
+        return None
+    return f'"{record.version}{MEDIA_TYPE_SUFFIXES.get(media_type, "")}"'
+
+
+def set_record_etag(response: Response, record: Record, request: Request) -> None:
+    etag = record_etag(record, negotiate(request))
+    if etag is not None:
+        response.headers["ETag"] = etag
+
+
+def _tag_version(tag: str) -> Optional[int]:
+    # If-Match usa comparação forte: ETags fracas (W/) nunca casam
+    if len(tag) < 2 or not tag.startswith('"') or not tag.endswith('"'):
+        return None
+    value = tag[1:-1]
+    for suffix in MEDIA_TYPE_SUFFIXES.values():
+        value = value.removesuffix(suffix)
+    return int(value) if value.isdigit() else None
+
+
+def if_match_version(request: Request) -> Optional[int]:
+    """Version required by the ``If-Match`` header, or ``None`` when absent or ``*``.
+
+    Raises 412 when the header names no version this API could have issued,
+    or more than one distinct version.
+    """
+    header = request.headers.get("if-match")
+    if header is None or header.strip() == "*":
+        return None
+    versions = {_tag_version(tag.strip()) for tag in header.split(",")}
+    versions.discard(None)
+    if len(versions) != 1:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="If-Match must carry the ETag of the current version"
+        )
+    return versions.pop()
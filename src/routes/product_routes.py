@@ -1,18 +1,91 @@
-from fastapi import APIRouter
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from pydantic import TypeAdapter
 from src.controllers import product_controller
-from src.models.schemas import Product, CreateProductDto, UpdateProductDto
+from src.models.schemas import Product, CreateProductDto, UpdateProductDto, BulkUpdateProductDto, ProductFilters
+from src.routes.bulk import parse_bulk_body
+from src.routes.pagination import pagination_params
+from src.routes.preconditions import if_match_version, set_record_etag
+from src.routes.response_cache import query_key, response_cache
+from src.routes.responses import NegotiatedRoute
+from src.routes.streaming import accepts_ndjson, ndjson_events, ndjson_response
+from src.types.enums import ProductCategory
+from src.types.types import BulkResult, PaginatedResult, PaginationParams
 
-router = APIRouter(prefix="/api/products", tags=["products"])
+router = APIRouter(prefix="/api/products", tags=["products"], route_class=NegotiatedRoute)
 
+bulk_create_adapter = TypeAdapter(list[CreateProductDto])
+bulk_update_adapter = TypeAdapter(list[BulkUpdateProductDto])
+bulk_delete_adapter = TypeAdapter(list[str])
 
-@router.get("/", response_model=list[Product])
-async def get_all_products():
-    return await product_controller.get_all_products()
+
+def product_filters(
+    category: Optional[ProductCategory] = Query(None),
+    min_price: Optional[float] = Query(None, alias="minPrice"),
+    max_price: Optional[float] = Query(None, alias="maxPrice"),
+    in_stock: Optional[bool] = Query(None, alias="inStock"),
+    sort: Optional[Literal["price", "-price"]] = Query(None),
+) -> ProductFilters:
+    return ProductFilters(category=category, minPrice=min_price, maxPrice=max_price, inStock=in_stock, sort=sort)
+
+
+@router.get("/", response_model=PaginatedResult[Product])
+async def get_all_products(
+    request: Request,
+    pagination: PaginationParams = Depends(pagination_params),
+    filters: ProductFilters = Depends(product_filters),
+):
+    if accepts_ndjson(request):
+        return ndjson_response(await product_controller.export_products(filters))
+    return await response_cache.respond(
+        request,
+        ("products", "list", query_key(request)),
+        lambda: product_controller.get_all_products(pagination, filters),
+    )
+
+
+@router.get("/export")
+async def export_products(filters: ProductFilters = Depends(product_filters)):
+    return ndjson_response(await product_controller.export_products(filters))
+
+
+@router.post("/import")
+async def import_products(request: Request):
+    return ndjson_events(await product_controller.import_products(request.stream()))
+
+
+# Rotas /bulk declaradas antes de /{product_id} para não serem capturadas por ela
+@router.post("/bulk", response_model=BulkResult[Product], status_code=201)
+async def bulk_create_products(request: Request):
+    products_data = await parse_bulk_body(request, bulk_create_adapter)
+    return await product_controller.bulk_create_products(products_data)
+
+
+@router.patch("/bulk", response_model=BulkResult[Product])
+async def bulk_update_products(request: Request, response: Response):
+    products_data = await parse_bulk_body(request, bulk_update_adapter)
+    result = await product_controller.bulk_update_products(products_data)
+    if not result.applied:
+        response.status_code = status.HTTP_409_CONFLICT
+    return result
+
+
+@router.delete("/bulk", response_model=BulkResult[Product])
+async def bulk_delete_products(request: Request, response: Response):
+    ids = await parse_bulk_body(request, bulk_delete_adapter)
+    result = await product_controller.bulk_delete_products(ids)
+    if not result.applied:
+        response.status_code = status.HTTP_409_CONFLICT
+    return result
 
 
 @router.get("/{product_id}", response_model=Product)
-async def get_product_by_id(product_id: str):
-    return await product_controller.get_product_by_id(product_id)
+async def get_product_by_id(product_id: str, request: Request):
+    return await response_cache.respond(
+        request,
+        ("products", "id", product_id),
+        lambda: product_controller.get_product_by_id(product_id),
+    )
 
 
 @router.post("/", response_model=Product, status_code=201)
@@ -21,11 +94,13 @@ async def create_product(product_data: CreateProductDto):
 
 
 @router.put("/{product_id}", response_model=Product)
-async def update_product(product_id: str, product_data: UpdateProductDto):
-    return await product_controller.update_product(product_id, product_data)
+async def update_product(product_id: str, product_data: UpdateProductDto, request: Request, response: Response):
+    product = await product_controller.update_product(product_id, product_data, if_match_version(request))
+    set_record_etag(response, product, request)
+    return product
 
 
 @router.delete("/{product_id}")
-async def delete_product(product_id: str):
-    return await product_controller.delete_product(product_id)
+async def delete_product(product_id: str, request: Request):
+    return await product_controller.delete_product(product_id, if_match_version(request))
 
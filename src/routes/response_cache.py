@@ -0,0 +1,170 @@
+"""Read-through cache of serialized GET responses, with ETag/304 support.
+
+Entries hold the exact bytes sent to the client, keyed by resource, either
+a record ID (``GET /{id}``) or the query string (``GET /``), and the
+negotiated media type (JSON or MessagePack). Every
+write reported by a service's ``subscribe`` hook drops the entry of the
+record it touched plus the resource's list pages, and bumps the resource
+generation so a response rendered concurrently with the write is not stored.
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+from fastapi import Request, Response, status
+from src.models.schemas import Record
+from src.routes.fragments import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, FragmentResponse, encode
+from src.routes.preconditions import record_etag
+from src.routes.responses import negotiate
+from src.services import backend
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL_SECONDS = 60.0
+
+# (recurso, "id" | "list", id ou query string, media type)
+CacheKey = tuple[str, str, str, str]
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # If-None-Match usa comparação fraca: W/"x" casa com "x"
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+class ResponseCache:
+    """LRU cache with a TTL, invalidated per record and per resource."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self._lists: dict[str, set[CacheKey]] = {}
+        self._generations: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def generation(self, resource: str) -> int:
+        return self._generations.get(resource, 0)
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self._clock():
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: CacheKey, body: bytes, generation: int, etag: Optional[str] = None) -> CacheEntry:
+        """Store ``body`` unless the resource was written since ``generation``.
+
+        ``etag`` defaults to a hash of the body.
+        """
+        entry = CacheEntry(body, etag or make_etag(body), self._clock() + self.ttl_seconds)
+        if not self.enabled or generation != self.generation(key[0]):
+            return entry
+        self._discard(key)
+        self._entries[key] = entry
+        if key[1] == "list":
+            self._lists.setdefault(key[0], set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+        return entry
+
+    def invalidate(self, resource: str, record_id: Optional[str] = None) -> None:
+        """Drop one record's entry (or every detail entry) and all list pages."""
+        self._generations[resource] = self.generation(resource) + 1
+        if record_id is None:
+            for key in [key for key in self._entries if key[0] == resource]:
+                self._discard(key)
+            return
+        for media_type in (JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE):
+            self._discard((resource, "id", record_id, media_type))
+        for key in list(self._lists.get(resource, ())):
+            self._discard(key)
+
+    def clear(self) -> None:
+        for resource in {key[0] for key in self._entries}:
+            self._generations[resource] = self.generation(resource) + 1
+        self._entries.clear()
+        self._lists.clear()
+
+    def listener(self, resource: str) -> Callable[[Any, Any], None]:
+        """Build a ``subscribe`` callback that invalidates ``resource``."""
+        def on_change(old: Any, new: Any) -> None:
+            record = new if new is not None else old
+            self.invalidate(resource, record.id if record is not None else None)
+
+        return on_change
+
+    def _discard(self, key: CacheKey) -> None:
+        if self._entries.pop(key, None) is not None and key[1] == "list":
+            self._lists.get(key[0], set()).discard(key)
+
+    async def respond(
+        self,
+        request: Request,
+        key: tuple[str, str, str],
+        load: Callable[[], Awaitable[Any]],
+    ) -> Response:
+        """Serve ``key`` from the cache, or ``load`` it, encode it and store it."""
+        media_type = negotiate(request)
+        cache_key = (*key, media_type)
+        entry = self.get(cache_key)
+        if entry is None:
+            generation = self.generation(key[0])
+            content = await load()
+            # Registros usam a versão como ETag, a mesma aceita por If-Match
+            etag = record_etag(content, media_type) if isinstance(content, Record) else None
+            entry = self.put(cache_key, encode(content, media_type), generation, etag)
+        headers = {"ETag": entry.etag, "Vary": "Accept"}
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return FragmentResponse(entry.body, headers=headers, media_type=media_type)
+
+
+def query_key(request: Request) -> str:
+    """Canonical query string, so parameter order does not split entries."""
+    return "&".join(f"{name}={value}" for name, value in sorted(request.query_params.multi_items()))
+
+
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+    ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+)
+
+for resource, service in (
+    ("users", backend.user_service),
+    ("cars", backend.car_service),
+    ("products", backend.product_service),
+    ("orders", backend.order_service),
+):
+    service.subscribe(response_cache.listener(resource))
@@ -0,0 +1,132 @@
+"""Response classes and ``Accept`` negotiation shared by every router.
+
+``JSON_ENCODER`` picks the JSON encoder when the application starts:
+``orjson`` (default) or ``stdlib`` for the standard ``json`` module.
+Clients asking for ``application/msgpack`` (or ``application/x-msgpack``)
+get MessagePack from every resource endpoint instead.
+"""
+
+import inspect
+import os
+from functools import lru_cache
+from typing import Any, Callable, Coroutine, Optional, Sequence
+import msgpack
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute
+from src.routes.fragments import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE
+from src.services.tracing import TRACING_ENABLED, end_phase, start_phase, traced_endpoint
+
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+JSON_ENCODER = os.getenv("JSON_ENCODER", "orjson").lower()
+
+DefaultJSONResponse: type[JSONResponse]
+if JSON_ENCODER == "orjson":
+    DefaultJSONResponse = ORJSONResponse
+elif JSON_ENCODER == "stdlib":
+    DefaultJSONResponse = JSONResponse
+else:
+    raise ValueError(f"Unknown JSON_ENCODER: {JSON_ENCODER}")
+
+
+class MessagePackResponse(Response):
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content)
+
+
+@lru_cache(maxsize=256)
+def _media_ranges(accept: str) -> tuple[tuple[str, float], ...]:
+    ranges = []
+    for part in accept.split(","):
+        media_range, *params = part.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = -1.0
+        if media_range.strip() and 0.0 <= quality <= 1.0:
+            ranges.append((media_range.strip().lower(), quality))
+    return tuple(ranges)
+
+
+def _quality(ranges: tuple[tuple[str, float], ...], media_type: str) -> tuple[float, int]:
+    # A faixa mais específica decide: "tipo/subtipo" > "tipo/*" > "*/*"
+    candidates = {media_type: 2, media_type.split("/")[0] + "/*": 1, "*/*": 0}
+    best = (0.0, -1)
+    for media_range, quality in ranges:
+        specificity = candidates.get(media_range, -1)
+        if specificity > best[1]:
+            best = (quality, specificity)
+    return best
+
+
+def preferred_media_type(request: Request, offered: Sequence[str]) -> Optional[str]:
+    """The ``offered`` media type the request's ``Accept`` ranks highest.
+
+    A missing header accepts anything. Ranges with ``q=0`` exclude the type;
+    equal qualities go to the type named more specifically, then to the one
+    offered first. ``None`` when every offered type is excluded.
+    """
+    accept = request.headers.get("accept")
+    if not accept:
+        return offered[0] if offered else None
+    ranges = _media_ranges(accept)
+    best, best_key = None, (0.0, -1)
+    for media_type in offered:
+        key = _quality(ranges, media_type)
+        if key[0] > 0 and key > best_key:
+            best, best_key = media_type, key
+    return best
+
+
+def negotiate(request: Request) -> str:
+    """Media type to answer ``request`` with: MessagePack or JSON (the default)."""
+    if preferred_media_type(request, (JSON_MEDIA_TYPE, *MSGPACK_MEDIA_TYPES)) in MSGPACK_MEDIA_TYPES:
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+class NegotiatedRoute(APIRoute):
+    """Route that serializes ``response_model`` output as JSON or MessagePack.
+
+    Both handlers are built once; each request picks one from its
+    ``Accept`` header. Endpoints returning a ``Response`` themselves are
+    expected to negotiate on their own (see ``negotiate``).
+
+    With tracing enabled, sampled requests get ``validate``, endpoint and
+    ``encode`` spans (see ``services.tracing``).
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        if TRACING_ENABLED and inspect.iscoroutinefunction(self.dependant.call):
+            module = self.endpoint.__module__.rsplit(".", 1)[-1]
+            self.dependant.call = traced_endpoint(f"{module}.{self.name}", self.dependant.call)
+        json_handler = super().get_route_handler()
+        response_class = self.response_class
+        self.response_class = MessagePackResponse
+        try:
+            msgpack_handler = super().get_route_handler()
+        finally:
+            self.response_class = response_class
+
+        async def handler(request: Request) -> Response:
+            # Span "validate" vai da leitura da requisição até o endpoint, "encode" do endpoint até aqui
+            start_phase("validate")
+            try:
+                if negotiate(request) == MSGPACK_MEDIA_TYPE:
+                    response = await msgpack_handler(request)
+                else:
+                    response = await json_handler(request)
+            finally:
+                end_phase()
+            if "accept" not in response.headers.get("vary", "").lower():
+                response.headers.append("Vary", "Accept")
+            return response
+
+        return handler
@@ -0,0 +1,48 @@
+from typing import AsyncIterator
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from starlette.types import Receive, Scope, Send
+from src.models.schemas import Record
+from src.routes.fragments import JSON_MEDIA_TYPE
+from src.routes.responses import MSGPACK_MEDIA_TYPES, preferred_media_type
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def accepts_ndjson(request: Request) -> bool:
+    """Whether the client ranks NDJSON above a JSON or MessagePack page."""
+    offered = (JSON_MEDIA_TYPE, *MSGPACK_MEDIA_TYPES, NDJSON_MEDIA_TYPE)
+    return preferred_media_type(request, offered) == NDJSON_MEDIA_TYPE
+
+
+def ndjson_response(batches: AsyncIterator[list[Record]]) -> StreamingResponse:
+    """Stream records as newline-delimited JSON, one encoded chunk per batch."""
+    async def encode() -> AsyncIterator[bytes]:
+        async for batch in batches:
+            yield b"".join(record.json_bytes() + b"\n" for record in batch)
+
+    return StreamingResponse(encode(), media_type=NDJSON_MEDIA_TYPE)
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """Streaming response for handlers that are still reading the request body.
+
+    ``StreamingResponse`` listens for the disconnect on ``receive`` while it
+    streams, which would swallow the body chunks the handler has yet to read.
+    Here the body stream itself raises ``ClientDisconnect`` instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def ndjson_events(events: AsyncIterator[BaseModel]) -> StreamingResponse:
+    """Stream progress events as newline-delimited JSON, one line per event."""
+    async def encode() -> AsyncIterator[bytes]:
+        async for event in events:
+            yield event.model_dump_json().encode() + b"\n"
+
+    return BodyStreamingResponse(encode(), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,97 @@
+"""Tracing middleware and the admin routes over buffered traces (see ``services.tracing``)."""
+
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.models.schemas import TracingSettings, TracingStatus
+from src.routes.admin import require_admin
+from src.services.tracing import Tracer, current_span, export, tracer
+
+# Nome do span raiz das requisições que não casaram com nenhuma rota
+UNMATCHED_ROUTE = "<unmatched>"
+
+router = APIRouter(prefix="/admin/tracing", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+def _status() -> TracingStatus:
+    return TracingStatus(
+        sampleRate=tracer.sample_rate,
+        maxSpansPerTrace=tracer.max_spans_per_trace,
+        bufferedTraces=len(tracer.traces),
+        file=tracer.path,
+    )
+
+
+@router.get("", response_model=TracingStatus)
+async def get_tracing_status():
+    return _status()
+
+
+@router.put("", response_model=TracingStatus)
+async def update_tracing(settings: TracingSettings):
+    tracer.sample_rate = settings.sampleRate
+    return _status()
+
+
+@router.get("/traces")
+async def get_traces(limit: Optional[int] = Query(None, ge=1)):
+    traces = list(tracer.traces)
+    return export(traces[-limit:] if limit else traces)
+
+
+@router.delete("/traces", response_model=TracingStatus)
+async def clear_traces():
+    tracer.clear()
+    return _status()
+
+
+class TracingMiddleware:
+    """Open the root span of the sampled requests.
+
+    The span is named ``METHOD /route/{template}`` once the request has
+    been routed; its status is taken from ``http.response.start``, and a
+    request whose handler raised is recorded as a 500 with an error status.
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Tracer = tracer) -> None:
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        root = self.tracer.start_trace(scope["method"])
+        if root is None:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = current_span.set(root)
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as exc:
+            root.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            current_span.reset(token)
+            route = scope.get("route")
+            template = route.path if route is not None else UNMATCHED_ROUTE
+            root.name = f"{scope['method']} {template}"
+            root.attributes = {
+                **(root.attributes or {}),
+                "http.request.method": scope["method"],
+                "http.route": template,
+                "url.path": scope["path"],
+                "http.response.status_code": status,
+            }
+            if status >= 500 and root.error is None:
+                root.error = f"HTTP {status}"
+            self.tracer.end_trace(root)
@@ -1,18 +1,75 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Request, Response, status
+from pydantic import TypeAdapter
 from src.controllers import user_controller
-from src.models.schemas import User, CreateUserDto, UpdateUserDto
+from src.models.schemas import User, CreateUserDto, UpdateUserDto, BulkUpdateUserDto
+from src.routes.bulk import parse_bulk_body
+from src.routes.pagination import pagination_params
+from src.routes.preconditions import if_match_version, set_record_etag
+from src.routes.response_cache import query_key, response_cache
+from src.routes.responses import NegotiatedRoute
+from src.routes.streaming import accepts_ndjson, ndjson_events, ndjson_response
+from src.types.types import BulkResult, PaginatedResult, PaginationParams
 
-router = APIRouter(prefix="/api/users", tags=["users"])
+router = APIRouter(prefix="/api/users", tags=["users"], route_class=NegotiatedRoute)
 
+bulk_create_adapter = TypeAdapter(list[CreateUserDto])
+bulk_update_adapter = TypeAdapter(list[BulkUpdateUserDto])
+bulk_delete_adapter = TypeAdapter(list[str])
 
-@router.get("/", response_model=list[User])
-async def get_all_users():
-    return await user_controller.get_all_users()
+
+@router.get("/", response_model=PaginatedResult[User])
+async def get_all_users(request: Request, pagination: PaginationParams = Depends(pagination_params)):
+    if accepts_ndjson(request):
+        return ndjson_response(await user_controller.export_users())
+    return await response_cache.respond(
+        request,
+        ("users", "list", query_key(request)),
+        lambda: user_controller.get_all_users(pagination),
+    )
+
+
+@router.get("/export")
+async def export_users():
+    return ndjson_response(await user_controller.export_users())
+
+
+@router.post("/import")
+async def import_users(request: Request):
+    return ndjson_events(await user_controller.import_users(request.stream()))
+
+
+# Rotas /bulk declaradas antes de /{user_id} para não serem capturadas por ela
+@router.post("/bulk", response_model=BulkResult[User], status_code=201)
+async def bulk_create_users(request: Request):
+    users_data = await parse_bulk_body(request, bulk_create_adapter)
+    return await user_controller.bulk_create_users(users_data)
+
+
+@router.patch("/bulk", response_model=BulkResult[User])
+async def bulk_update_users(request: Request, response: Response):
+    users_data = await parse_bulk_body(request, bulk_update_adapter)
+    result = await user_controller.bulk_update_users(users_data)
+    if not result.applied:
+        response.status_code = status.HTTP_409_CONFLICT
+    return result
+
+
+@router.delete("/bulk", response_model=BulkResult[User])
+async def bulk_delete_users(request: Request, response: Response):
+    ids = await parse_bulk_body(request, bulk_delete_adapter)
+    result = await user_controller.bulk_delete_users(ids)
+    if not result.applied:
+        response.status_code = status.HTTP_409_CONFLICT
+    return result
 
 
 @router.get("/{user_id}", response_model=User)
-async def get_user_by_id(user_id: str):
-    return await user_controller.get_user_by_id(user_id)
+async def get_user_by_id(user_id: str, request: Request):
+    return await response_cache.respond(
+        request,
+        ("users", "id", user_id),
+        lambda: user_controller.get_user_by_id(user_id),
+    )
 
 
 @router.post("/", response_model=User, status_code=201)
@@ -21,11 +78,13 @@ async def create_user(user_data: CreateUserDto):
 
 
 @router.put("/{user_id}", response_model=User)
-async def update_user(user_id: str, user_data: UpdateUserDto):
-    return await user_controller.update_user(user_id, user_data)
+async def update_user(user_id: str, user_data: UpdateUserDto, request: Request, response: Response):
+    user = await user_controller.update_user(user_id, user_data, if_match_version(request))
+    set_record_etag(response, user, request)
+    return user
 
 
 @router.delete("/{user_id}")
-async def delete_user(user_id: str):
-    return await user_controller.delete_user(user_id)
+async def delete_user(user_id: str, request: Request):
+    return await user_controller.delete_user(user_id, if_match_version(request))
 
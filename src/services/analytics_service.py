@@ -0,0 +1,125 @@
+from datetime import datetime, timezone
+from typing import Callable, Literal, Optional
+import numpy as np
+from src.models.schemas import Order, Product, AggregateStats, GroupAggregate
+from src.services import order_service, product_service
+from src.services.columnar import ColumnarTable, Dictionary
+from src.types.enums import OrderStatus, ProductCategory
+
+PERCENTILES = (50, 90, 99)
+SECONDS_PER_DAY = 86400
+
+statuses = Dictionary(tuple(OrderStatus))
+categories = Dictionary(tuple(ProductCategory))
+user_codes = Dictionary()
+
+
+def _epoch_seconds(created_at: str) -> int:
+    # Pedidos antigos gravaram createdAt sem fuso, na hora local do servidor
+    return int(datetime.fromisoformat(created_at).timestamp())
+
+
+def _order_row(order: Order) -> dict[str, object]:
+    return {
+        "total": order.total,
+        "status": statuses.encode(OrderStatus(order.status)),
+        "created_at": _epoch_seconds(order.createdAt),
+        "user": user_codes.encode(order.userId),
+    }
+
+
+def _product_row(product: Product) -> dict[str, object]:
+    return {
+        "price": product.price,
+        "stock": product.stock,
+        "category": categories.encode(ProductCategory(product.category)),
+    }
+
+
+# Espelho colunar mantido em sincronia pelos repositórios dos serviços
+order_columns: ColumnarTable[Order] = ColumnarTable(
+    {"total": np.float64, "status": np.int8, "created_at": np.int64, "user": np.int32},
+    _order_row,
+)
+order_columns.attach(order_service.orders)
+
+product_columns: ColumnarTable[Product] = ColumnarTable(
+    {"price": np.float64, "stock": np.int64, "category": np.int8},
+    _product_row,
+)
+product_columns.attach(product_service.products)
+
+
+def _stats(values: np.ndarray) -> AggregateStats:
+    if values.size == 0:
+        return AggregateStats(count=0, sum=0.0)
+    p50, p90, p99 = np.percentile(values, PERCENTILES)
+    return AggregateStats(
+        count=int(values.size),
+        sum=float(values.sum()),
+        mean=float(values.mean()),
+        min=float(values.min()),
+        max=float(values.max()),
+        p50=float(p50),
+        p90=float(p90),
+        p99=float(p99),
+    )
+
+
+def _group(codes: np.ndarray, values: np.ndarray, key_of: Callable[[int], str]) -> list[GroupAggregate]:
+    counts = np.bincount(codes)
+    sums = np.bincount(codes, weights=values)
+    return [
+        GroupAggregate(
+            key=key_of(int(code)),
+            count=int(counts[code]),
+            sum=float(sums[code]),
+            mean=float(sums[code] / counts[code]),
+        )
+        for code in np.flatnonzero(counts)
+    ]
+
+
+def _status_mask(status: Optional[OrderStatus]) -> Optional[np.ndarray]:
+    if status is None:
+        return None
+    return order_columns.raw("status") == statuses.lookup(OrderStatus(status))
+
+
+async def get_order_stats(status: Optional[OrderStatus] = None) -> AggregateStats:
+    (totals,) = order_columns.columns("total", mask=_status_mask(status))
+    return _stats(totals)
+
+
+async def get_order_revenue(
+    group_by: Literal["status", "user", "day"],
+    status: Optional[OrderStatus] = None,
+) -> list[GroupAggregate]:
+    totals, status_codes, created_at, users = order_columns.columns(
+        "total", "status", "created_at", "user", mask=_status_mask(status)
+    )
+    if group_by == "status":
+        return _group(status_codes, totals, lambda code: statuses.decode(code).value)
+    if group_by == "user":
+        return _group(users, totals, lambda code: str(user_codes.decode(code)))
+
+    days, day_codes = np.unique(created_at // SECONDS_PER_DAY, return_inverse=True)
+    return _group(
+        day_codes,
+        totals,
+        lambda code: datetime.fromtimestamp(int(days[code]) * SECONDS_PER_DAY, tz=timezone.utc).date().isoformat(),
+    )
+
+
+async def get_product_price_stats(category: Optional[ProductCategory] = None) -> AggregateStats:
+    mask = None
+    if category is not None:
+        mask = product_columns.raw("category") == categories.lookup(ProductCategory(category))
+    (prices,) = product_columns.columns("price", mask=mask)
+    return _stats(prices)
+
+
+async def get_inventory_by_category() -> list[GroupAggregate]:
+    """Inventory value (price * stock) per category."""
+    prices, stock, category_codes = product_columns.columns("price", "stock", "category")
+    return _group(category_codes, prices * stock, lambda code: categories.decode(code).value)
@@ -0,0 +1,134 @@
+"""Storage backend selection.
+
+``STORAGE_BACKEND`` picks the implementation behind the ``I*Service``
+protocols when the application starts: ``memory`` (default) uses the
+module-level in-memory services and ``sqlite`` persists to ``SQLITE_PATH``.
+
+Only ``sqlite`` can serve several worker processes (``WEB_CONCURRENCY`` or
+``uvicorn --workers``): they share the database file and see each other's
+writes through a ``ChangeFeed`` polled every ``SQLITE_CHANGE_POLL_MS``.
+``memory`` refuses to start under several uvicorn workers; process managers
+that fork workers themselves (``gunicorn -w``) are not detected.
+
+With ``DATA_DIR`` set, the ``memory`` backend survives restarts: changes go
+to a write-ahead log (see ``persistence``) and are restored at startup.
+
+Unless ``METRICS_ENABLED=0``, the selected services are wrapped by
+``metrics.instrument`` so every call is timed; unless ``TRACING_ENABLED=0``
+they are also wrapped by ``tracing.instrument`` for the sampled requests.
+"""
+
+import contextlib
+import multiprocessing
+import os
+import signal
+from typing import TYPE_CHECKING, AsyncContextManager, AsyncIterator, Optional
+from src.types.interfaces import IUserService, ICarService, IProductService, IOrderService
+
+if TYPE_CHECKING:
+    from src.services.persistence import Persistence
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "memory").lower()
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 1))
+
+user_service: IUserService
+car_service: ICarService
+product_service: IProductService
+order_service: IOrderService
+persistence: Optional["Persistence"] = None
+
+MEMORY_SINGLE_PROCESS = "STORAGE_BACKEND=memory keeps data per process; use STORAGE_BACKEND=sqlite with several workers"
+
+if STORAGE_BACKEND == "sqlite":
+    from src.services.sqlite import (
+        SqliteDatabase,
+        SqliteUserService,
+        SqliteCarService,
+        SqliteProductService,
+        SqliteOrderService,
+    )
+    from src.services.sqlite import workers
+    from src.services.sqlite.changes import DEFAULT_POLL_INTERVAL_SECONDS, ChangeFeed
+    from src.services.sqlite.database import DEFAULT_POOL_SIZE
+
+    database = SqliteDatabase(
+        os.getenv("SQLITE_PATH", "data.db"),
+        pool_size=int(os.getenv("SQLITE_POOL_SIZE", DEFAULT_POOL_SIZE)),
+    )
+    changes = ChangeFeed(
+        database,
+        poll_interval=float(os.getenv("SQLITE_CHANGE_POLL_MS", DEFAULT_POLL_INTERVAL_SECONDS * 1000)) / 1000,
+    )
+    user_service = SqliteUserService(database, changes)
+    car_service = SqliteCarService(database, changes)
+    product_service = SqliteProductService(database, changes)
+    order_service = SqliteOrderService(database, product_service, changes)
+elif STORAGE_BACKEND == "memory":
+    if WEB_CONCURRENCY > 1:
+        raise ValueError(MEMORY_SINGLE_PROCESS)
+    from src.services import user_service, car_service, product_service, order_service
+
+    if os.getenv("DATA_DIR"):
+        from src.services.persistence import DEFAULT_SNAPSHOT_INTERVAL_SECONDS, persist_memory_services
+        from src.services.wal import DEFAULT_GROUP_COMMIT_DELAY_SECONDS
+
+        persistence = persist_memory_services(
+            os.environ["DATA_DIR"],
+            group_commit_delay=float(os.getenv("WAL_GROUP_COMMIT_MS", DEFAULT_GROUP_COMMIT_DELAY_SECONDS * 1000)) / 1000,
+            snapshot_interval=float(os.getenv("SNAPSHOT_INTERVAL_SECONDS", DEFAULT_SNAPSHOT_INTERVAL_SECONDS)),
+        )
+else:
+    raise ValueError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+
+from src.services.metrics import METRICS_ENABLED, instrument
+
+if METRICS_ENABLED:
+    # Controladores importam estes nomes depois, então já recebem os serviços cronometrados
+    user_service = instrument("users", user_service)
+    car_service = instrument("cars", car_service)
+    product_service = instrument("products", product_service)
+    order_service = instrument("orders", order_service)
+
+from src.services import tracing
+
+if tracing.TRACING_ENABLED:
+    user_service = tracing.instrument("user_service", user_service)
+    car_service = tracing.instrument("car_service", car_service)
+    product_service = tracing.instrument("product_service", product_service)
+    order_service = tracing.instrument("order_service", order_service)
+
+
+@contextlib.asynccontextmanager
+async def _sqlite_background_tasks() -> AsyncIterator[None]:
+    lease = workers.current(database)
+    async with changes.running(), (lease.running() if lease is not None else contextlib.nullcontext()):
+        yield
+
+
+def background_tasks() -> AsyncContextManager[None]:
+    """Run the backend's background work (change feed, worker lease, snapshots) with the application."""
+    if STORAGE_BACKEND == "sqlite":
+        return _sqlite_background_tasks()
+    if persistence is not None:
+        return persistence.running()
+    return contextlib.nullcontext()
+
+
+def uvicorn_workers() -> int:
+    """Worker count of the uvicorn server that spawned this process, or 1.
+
+    ``uvicorn --workers N`` hands each spawned worker its ``Config``; the
+    count is read from there because the flag never reaches the environment.
+    """
+    if multiprocessing.parent_process() is None:
+        return 1
+    config = getattr(multiprocessing.current_process(), "_kwargs", {}).get("config")
+    return getattr(config, "workers", None) or 1
+
+
+def check_single_process() -> None:
+    """Refuse to serve the ``memory`` backend from one of several uvicorn workers."""
+    if STORAGE_BACKEND == "memory" and uvicorn_workers() > 1:
+        # Encerra o supervisor, que do contrário recriaria este worker em laço
+        os.kill(os.getppid(), signal.SIGTERM)
+        raise ValueError(MEMORY_SINGLE_PROCESS)
@@ -0,0 +1,107 @@
+"""All-or-nothing batch operations over a ``Repository``."""
+
+from __future__ import annotations
+
+from typing import Callable, Iterable, Protocol, Sequence, TypeVar
+from src.services.repository import Repository
+from src.types.types import BulkItemResult, BulkResult
+
+T = TypeVar("T")
+
+NOT_APPLIED = "Not applied: another item in the batch failed"
+
+
+class Keyed(Protocol):
+    id: str
+
+
+U = TypeVar("U", bound=Keyed)
+
+
+def create_all(repository: Repository[T], records: Iterable[T]) -> BulkResult[T]:
+    """Insert already validated records; creation cannot fail item by item."""
+    return created([repository.add(record) for record in records])
+
+
+def created(records: Sequence[T]) -> BulkResult[T]:
+    """Result for records that were all inserted."""
+    return BulkResult(
+        applied=True,
+        results=[BulkItemResult(index=index, id=record.id, status=201, data=record) for index, record in enumerate(records)],
+    )
+
+
+def update_all(
+    repository: Repository[T],
+    items: Sequence[U],
+    merge: Callable[[T, U], T],
+    not_found: str,
+) -> BulkResult[T]:
+    """Merge every item into its record, replacing them only if all succeed.
+
+    Updates are staged first, so a missing ID or an invalid merge leaves the
+    repository untouched. Repeated IDs are applied in order. A merge may
+    raise any ``ValueError``; its ``status`` attribute (422 by default) is
+    reported for the item.
+    """
+    staged: dict[str, T] = {}
+    results: list[BulkItemResult] = []
+    failed = False
+    for index, item in enumerate(items):
+        current = staged.get(item.id) or repository.get(item.id)
+        if current is None:
+            results.append(BulkItemResult(index=index, id=item.id, status=404, error=not_found))
+            failed = True
+            continue
+        try:
+            staged[item.id] = merge(current, item)
+        except ValueError as exc:
+            results.append(BulkItemResult(index=index, id=item.id, status=getattr(exc, "status", 422), error=str(exc)))
+            failed = True
+            continue
+        results.append(BulkItemResult(index=index, id=item.id, status=200, data=staged[item.id]))
+
+    if failed:
+        return _rolled_back(results)
+    for record_id, record in staged.items():
+        repository.replace(record_id, record)
+    return BulkResult(applied=True, results=results)
+
+
+def delete_all(repository: Repository[T], record_ids: Sequence[str], not_found: str) -> BulkResult[T]:
+    """Delete every ID, or none of them if any is missing."""
+    results: list[BulkItemResult] = []
+    seen: set[str] = set()
+    failed = False
+    for index, record_id in enumerate(record_ids):
+        if record_id in seen or record_id not in repository:
+            results.append(BulkItemResult(index=index, id=record_id, status=404, error=not_found))
+            failed = True
+            continue
+        seen.add(record_id)
+        results.append(BulkItemResult(index=index, id=record_id, status=200))
+
+    if failed:
+        return _rolled_back(results)
+    for record_id in record_ids:
+        repository.remove(record_id)
+    return BulkResult(applied=True, results=results)
+
+
+def rejected(count: int, index: int, status: int, error: str) -> BulkResult:
+    """Result for a batch of ``count`` items that item ``index`` failed as a whole."""
+    return _rolled_back([
+        BulkItemResult(index=position, status=status, error=error) if position == index
+        else BulkItemResult(index=position, status=200)
+        for position in range(count)
+    ])
+
+
+def _rolled_back(results: list[BulkItemResult]) -> BulkResult:
+    return BulkResult(
+        applied=False,
+        results=[
+            result if result.error else BulkItemResult(index=result.index, id=result.id, status=424, error=NOT_APPLIED)
+            for result in results
+        ],
+    )
@@ -1,56 +1,86 @@
-from typing import Optional
-from src.models.schemas import Car, CreateCarDto, UpdateCarDto
+from __future__ import annotations
+
+from typing import AsyncIterator, Optional
+from src.models.schemas import Car, CreateCarDto, UpdateCarDto, BulkUpdateCarDto
+from src.services.repository import DEFAULT_BATCH_SIZE, ChangeListener, Repository
+from src.services.records import CAR_CODEC, field_changes
+from src.services import bulk
+from src.services.id_allocator import create_id_allocator
+from src.types.types import BulkResult, PaginatedResult
 from src.types.enums import CarColor
 
 # Simulação de banco de dados em memória
-cars: list[Car] = [
+cars: Repository[Car] = Repository([
     Car(id="1", brand="Toyota", model="Corolla", year=2020, color=CarColor.WHITE, price=85000.0),
     Car(id="2", brand="Honda", model="Civic", year=2021, color=CarColor.BLACK, price=92000.0),
     Car(id="3", brand="Ford", model="Focus", year=2019, color=CarColor.RED, price=75000.0),
-]
+], codec=CAR_CODEC)
+car_ids = create_id_allocator(start=len(cars))
 
 
 async def get_all_cars() -> list[Car]:
-    return cars
+    return cars.all()
+
+
+async def get_cars_page(page: int, page_size: int) -> PaginatedResult[Car]:
+    return cars.paginate(page, page_size)
+
+
+async def get_cars_after(cursor: Optional[str], limit: int) -> PaginatedResult[Car]:
+    return cars.paginate_after(cursor, limit)
+
+
+async def stream_cars(batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[list[Car]]:
+    for batch in cars.iter_batches(batch_size):
+        yield batch
 
 
 async def get_car_by_id(car_id: str) -> Optional[Car]:
-    return next((car for car in cars if car.id == car_id), None)
+    return cars.get(car_id)
 
 
-async def create_car(car_data: CreateCarDto) -> Car:
-    new_car = Car(
-        id=str(len(cars) + 1),
+def _build_car(car_data: CreateCarDto) -> Car:
+    return Car(
+        id=car_ids.next_id(),
         brand=car_data.brand,
         model=car_data.model,
         year=car_data.year,
         color=car_data.color,
         price=car_data.price,
     )
-    cars.append(new_car)
-    return new_car
-
-
-async def update_car(car_id: str, car_data: UpdateCarDto) -> Optional[Car]:
-    car_index = next((i for i, car in enumerate(cars) if car.id == car_id), None)
-    
-    if car_index is None:
-        return None
-    
-    car_dict = cars[car_index].model_dump()
-    update_dict = car_data.model_dump(exclude_unset=True)
-    updated_car = Car(**{**car_dict, **update_dict})
-    cars[car_index] = updated_car
-    
-    return updated_car
-
-
-async def delete_car(car_id: str) -> bool:
-    car_index = next((i for i, car in enumerate(cars) if car.id == car_id), None)
-    
-    if car_index is None:
-        return False
-    
-    cars.pop(car_index)
-    return True
 
+
+def _merge_car(existing_car: Car, car_data: UpdateCarDto) -> Car:
+    return existing_car.model_copy(update=field_changes(Car, car_data))
+
+
+async def create_car(car_data: CreateCarDto) -> Car:
+    return cars.add(_build_car(car_data))
+
+
+async def update_car(
+    car_id: str,
+    car_data: UpdateCarDto,
+    expected_version: Optional[int] = None,
+) -> Optional[Car]:
+    return cars.update(car_id, field_changes(Car, car_data), expected_version)
+
+
+async def delete_car(car_id: str, expected_version: Optional[int] = None) -> bool:
+    return cars.remove(car_id, expected_version) is not None
+
+
+async def bulk_create_cars(cars_data: list[CreateCarDto]) -> BulkResult[Car]:
+    return bulk.create_all(cars, [_build_car(car_data) for car_data in cars_data])
+
+
+async def bulk_update_cars(cars_data: list[BulkUpdateCarDto]) -> BulkResult[Car]:
+    return bulk.update_all(cars, cars_data, _merge_car, not_found="Car not found")
+
+
+async def bulk_delete_cars(ids: list[str]) -> BulkResult[Car]:
+    return bulk.delete_all(cars, ids, not_found="Car not found")
+
+
+def subscribe(listener: ChangeListener) -> None:
+    cars.subscribe(listener)
@@ -0,0 +1,129 @@
+"""Columnar (NumPy) mirror of repository records for vectorized aggregation."""
+
+from typing import Callable, Generic, Optional, TypeVar
+import numpy as np
+from src.services.indexes import Mirror
+from src.services.repository import Repository
+
+T = TypeVar("T")
+
+INITIAL_CAPACITY = 1024
+
+
+class ColumnarTable(Generic[T]):
+    """Keeps one NumPy array per column, one row per live record.
+
+    Rows are addressed through an ``id -> row`` dict. Deleted rows are marked
+    dead and their slots reused, so every change is O(1) amortized and
+    aggregations work on whole arrays with a liveness mask.
+    """
+
+    def __init__(self, dtypes: dict[str, np.dtype], extract: Callable[[T], dict[str, object]]) -> None:
+        self._dtypes = dtypes
+        self._extract = extract
+        self._capacity = INITIAL_CAPACITY
+        self._columns = {name: np.zeros(self._capacity, dtype=dtype) for name, dtype in dtypes.items()}
+        self._alive = np.zeros(self._capacity, dtype=bool)
+        self._row_of: dict[str, int] = {}
+        self._free_rows: list[int] = []
+        self._size = 0
+        self._mirror: Optional[Mirror] = None
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def attach(self, repository: Repository) -> None:
+        """Mirror ``repository``, loading it on the first read (see ``Mirror``)."""
+        self._mirror = Mirror(repository, self.on_change, self.reset)
+
+    def on_change(self, old: Optional[T], new: Optional[T]) -> None:
+        if new is None:
+            self.delete(old.id)
+        else:
+            self.upsert(new)
+
+    def upsert(self, record: T) -> None:
+        row = self._row_of.get(record.id)
+        if row is None:
+            row = self._allocate_row()
+            self._row_of[record.id] = row
+        for name, value in self._extract(record).items():
+            self._columns[name][row] = value
+        self._alive[row] = True
+
+    def delete(self, record_id: str) -> None:
+        row = self._row_of.pop(record_id, None)
+        if row is None:
+            return
+        self._alive[row] = False
+        self._free_rows.append(row)
+
+    def reset(self) -> None:
+        """Drop every row, keeping the allocated arrays."""
+        self._alive[:self._size] = False
+        self._row_of.clear()
+        self._free_rows.clear()
+        self._size = 0
+
+    def columns(self, *names: str, mask: Optional[np.ndarray] = None) -> list[np.ndarray]:
+        """Return the live values of the requested columns (copies, same order)."""
+        self._ensure()
+        live = self._alive[:self._size]
+        if mask is not None:
+            live = live & mask
+        return [self._columns[name][:self._size][live] for name in names]
+
+    def raw(self, name: str) -> np.ndarray:
+        """Return the unmasked column view, for building masks."""
+        self._ensure()
+        return self._columns[name][:self._size]
+
+    def _ensure(self) -> None:
+        if self._mirror is not None:
+            self._mirror.ensure()
+
+    def _allocate_row(self) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+        if self._size == self._capacity:
+            self._grow()
+        row = self._size
+        self._size += 1
+        return row
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.zeros(self._capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+        alive = np.zeros(self._capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        self._alive = alive
+
+
+class Dictionary:
+    """Maps string values (user IDs, enum members) to dense integer codes."""
+
+    def __init__(self, values: tuple = ()) -> None:
+        self._codes: dict[object, int] = {}
+        self._values: list[object] = []
+        for value in values:
+            self.encode(value)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def encode(self, value: object) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._values)
+            self._codes[value] = code
+            self._values.append(value)
+        return code
+
+    def lookup(self, value: object) -> Optional[int]:
+        return self._codes.get(value)
+
+    def decode(self, code: int) -> object:
+        return self._values[code]
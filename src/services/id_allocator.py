@@ -0,0 +1,103 @@
+"""ID allocation strategies for newly created records."""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional, Protocol
+
+
+class IdAllocator(Protocol):
+    """Interface for ID allocators."""
+
+    def next_id(self) -> str:
+        """Return a new, never reissued ID."""
+        ...
+
+
+class SequentialIdAllocator:
+    """Monotonic integer IDs ("1", "2", ...) that are never reused.
+
+    Unique within a single process; use ``SnowflakeIdAllocator`` when several
+    worker processes create records concurrently.
+    """
+
+    def __init__(self, start: int = 0) -> None:
+        self._last = start
+        self._lock = threading.Lock()
+
+    def next_id(self) -> str:
+        with self._lock:
+            self._last += 1
+            return str(self._last)
+
+
+# Layout: 41 bits de timestamp (ms) | 10 bits de worker | 12 bits de sequência
+SNOWFLAKE_EPOCH_MS = 1735689600000  # 2025-01-01T00:00:00Z
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+
+class SnowflakeIdAllocator:
+    """Time-ordered 64-bit IDs, unique across workers with distinct worker IDs."""
+
+    def __init__(self, worker_id: int) -> None:
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be between 0 and {MAX_WORKER_ID}")
+        self._worker_id = worker_id
+        self._last_ms = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def next_id(self) -> str:
+        with self._lock:
+            now_ms = max(int(time.time() * 1000), self._last_ms)
+            if now_ms == self._last_ms:
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    # Sequência esgotada neste milissegundo: avança o relógio lógico
+                    now_ms += 1
+            else:
+                self._sequence = 0
+            self._last_ms = now_ms
+            value = (
+                ((now_ms - SNOWFLAKE_EPOCH_MS) << (WORKER_BITS + SEQUENCE_BITS))
+                | (self._worker_id << SEQUENCE_BITS)
+                | self._sequence
+            )
+            return str(value)
+
+
+def snowflake_timestamp(snowflake_id: str) -> datetime:
+    """Extract the creation time embedded in a snowflake ID."""
+    ms = (int(snowflake_id) >> (WORKER_BITS + SEQUENCE_BITS)) + SNOWFLAKE_EPOCH_MS
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+def id_strategy() -> str:
+    return os.getenv("ID_STRATEGY", "sequential").lower()
+
+
+def create_id_allocator(
+    start: int = 0,
+    allocate_worker_id: Optional[Callable[[], int]] = None,
+) -> IdAllocator:
+    """Build the allocator selected by the ``ID_STRATEGY`` environment variable.
+
+    ``sequential`` (default) continues after ``start``. ``snowflake`` takes
+    its worker ID from ``WORKER_ID`` or, when unset, from
+    ``allocate_worker_id``; with neither it refuses to start, because
+    workers sharing a worker ID issue colliding IDs.
+    """
+    strategy = id_strategy()
+    if strategy == "snowflake":
+        if os.getenv("WORKER_ID") is not None:
+            return SnowflakeIdAllocator(int(os.environ["WORKER_ID"]))
+        if allocate_worker_id is not None:
+            return SnowflakeIdAllocator(allocate_worker_id())
+        raise ValueError(f"ID_STRATEGY=snowflake requires WORKER_ID (0-{MAX_WORKER_ID}), distinct for every worker process")
+    if strategy == "sequential":
+        return SequentialIdAllocator(start)
+    raise ValueError(f"Unknown ID_STRATEGY: {strategy}")
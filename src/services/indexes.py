@@ -0,0 +1,127 @@
+"""Secondary indexes kept alongside a ``Repository``."""
+
+from bisect import bisect_left, bisect_right, insort
+from operator import itemgetter
+from typing import Any, Callable, Generic, Hashable, Iterable, Optional, TypeVar
+from src.services.repository import ChangeListener, Repository
+
+K = TypeVar("K", bound=Hashable)
+
+
+class HashIndex(Generic[K]):
+    """Maps a key (e.g. ``userId`` or ``status``) to the IDs of matching records.
+
+    Each bucket is an insertion-ordered set, so adding, removing and looking
+    up a key are O(1) and reading a bucket is O(result).
+    """
+
+    def __init__(self) -> None:
+        self._buckets: dict[K, dict[str, None]] = {}
+
+    def add(self, key: K, record_id: str) -> None:
+        self._buckets.setdefault(key, {})[record_id] = None
+
+    def remove(self, key: K, record_id: str) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return
+        bucket.pop(record_id, None)
+        if not bucket:
+            del self._buckets[key]
+
+    def move(self, old_key: K, new_key: K, record_id: str) -> None:
+        """Re-bucket a record whose indexed value changed."""
+        if old_key == new_key:
+            return
+        self.remove(old_key, record_id)
+        self.add(new_key, record_id)
+
+    def get(self, key: K) -> list[str]:
+        return list(self._buckets.get(key, ()))
+
+    def contains(self, key: K, record_id: str) -> bool:
+        return record_id in self._buckets.get(key, ())
+
+    def count(self, key: K) -> int:
+        return len(self._buckets.get(key, ()))
+
+    def keys(self) -> Iterable[K]:
+        return self._buckets.keys()
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+class SortedIndex(Generic[K]):
+    """Keeps ``(value, id)`` pairs sorted by value for range queries.
+
+    Range lookups are a pair of bisects plus O(result); inserts and removals
+    are a bisect plus a list shift, which stays cheap at the sizes we hold.
+    """
+
+    def __init__(self) -> None:
+        self._entries: list[tuple[K, str]] = []
+
+    def add(self, value: K, record_id: str) -> None:
+        insort(self._entries, (value, record_id))
+
+    def remove(self, value: K, record_id: str) -> None:
+        entry = (value, record_id)
+        position = bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+
+    def move(self, old_value: K, new_value: K, record_id: str) -> None:
+        """Reposition a record whose indexed value changed."""
+        if old_value == new_value:
+            return
+        self.remove(old_value, record_id)
+        self.add(new_value, record_id)
+
+    def range(self, low: Optional[K] = None, high: Optional[K] = None) -> list[str]:
+        """IDs whose value lies in ``[low, high]``, in ascending value order."""
+        start, end = self._bounds(low, high)
+        return [record_id for _, record_id in self._entries[start:end]]
+
+    def count_range(self, low: Optional[K] = None, high: Optional[K] = None) -> int:
+        start, end = self._bounds(low, high)
+        return max(end - start, 0)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _bounds(self, low: Optional[K], high: Optional[K]) -> tuple[int, int]:
+        start = 0 if low is None else bisect_left(self._entries, low, key=itemgetter(0))
+        end = len(self._entries) if high is None else bisect_right(self._entries, high, key=itemgetter(0))
+        return start, end
+
+
+class Mirror:
+    """Keeps derived structures (indexes, columns) in step with a repository.
+
+    The structures are built by the first ``ensure`` call, replaying every
+    stored row through ``on_change``, and then follow each change. When the
+    repository's ``generation`` moves (a snapshot was loaded) changes are
+    ignored until the next ``ensure`` calls ``reset`` and rebuilds, so
+    nothing is paid at startup for a mirror that is never read.
+    """
+
+    def __init__(self, repository: Repository, on_change: ChangeListener, reset: Callable[[], Any]) -> None:
+        self._repository = repository
+        self._on_change = on_change
+        self._reset = reset
+        self._generation: Optional[int] = None
+        repository.subscribe(self._follow)
+
+    def ensure(self) -> None:
+        """Build or rebuild the structures if they are behind the repository."""
+        if self._generation == self._repository.generation:
+            return
+        self._reset()
+        for row in self._repository.rows():
+            self._on_change(None, row)
+        self._generation = self._repository.generation
+
+    def _follow(self, old: Any, new: Any) -> None:
+        if self._generation == self._repository.generation:
+            self._on_change(old, new)
@@ -0,0 +1,35 @@
+"""Wrapping the coroutines of service modules and objects (metrics, tracing)."""
+
+import inspect
+from types import ModuleType
+from typing import Any, Callable
+
+# wrap(nome do atributo, função) -> função envolvida
+Wrap = Callable[[str, Callable], Callable]
+
+
+class CoroutineProxy:
+    """Proxy that wraps every coroutine function of ``target`` with ``wrap``.
+
+    Wrappers are built on first access and cached on the proxy; other
+    attributes (async generators, ``subscribe``, data) are passed through.
+    """
+
+    def __init__(self, target: Any, wrap: Wrap) -> None:
+        self._target = target
+        self._wrap = wrap
+
+    def __getattr__(self, attribute: str) -> Any:
+        value = getattr(self._target, attribute)
+        if not inspect.iscoroutinefunction(value):
+            return value
+        wrapped = self._wrap(attribute, value)
+        setattr(self, attribute, wrapped)
+        return wrapped
+
+
+def wrap_module(module: ModuleType, wrap: Wrap) -> None:
+    """Replace, in place, the coroutine functions defined in ``module``."""
+    for name, value in list(vars(module).items()):
+        if inspect.iscoroutinefunction(value) and value.__module__ == module.__name__:
+            setattr(module, name, wrap(name, value))
@@ -0,0 +1,159 @@
+"""In-process request and service metrics, rendered in Prometheus text format.
+
+Everything is updated from the event loop thread only, so counters are
+plain integers and floats with no locks. Each series is created once, the
+first time its labels are seen, with its label string already rendered;
+recording a request is a dict lookup plus a bisect into fixed buckets.
+
+The service layer is timed through ``instrument``, which wraps a service's
+coroutines. Time spent in services during a request is also attributed to
+that request's route, so ``http_request_duration_seconds`` minus
+``http_request_service_seconds`` is what validation, controllers and
+response serialization cost.
+"""
+
+import os
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Optional
+from src.services.instrumentation import CoroutineProxy
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+
+# Limites dos buckets em segundos, no estilo dos clientes Prometheus
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Tempo acumulado em serviços pela requisição corrente (uma lista de um item, mutável)
+request_service_time: ContextVar[Optional[list[float]]] = ContextVar("request_service_time", default=None)
+
+
+class Histogram:
+    """Cumulative-on-render bucketed histogram."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        separator = "," if labels else ""
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}{separator}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class RouteSeries:
+    """Latency of one ``(route, method, status)``, in total and inside services."""
+
+    __slots__ = ("labels", "duration", "service")
+
+    def __init__(self, labels: str) -> None:
+        self.labels = labels
+        self.duration = Histogram()
+        self.service = Histogram()
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self._routes: dict[tuple[str, str, int], RouteSeries] = {}
+        self._services: dict[tuple[str, str], Histogram] = {}
+
+    def observe_request(self, route: str, method: str, status: int, duration: float, service: float) -> None:
+        key = (route, method, status)
+        series = self._routes.get(key)
+        if series is None:
+            series = self._routes[key] = RouteSeries(_labels(route=route, method=method, status=status))
+        series.duration.observe(duration)
+        series.service.observe(service)
+
+    def service_histogram(self, service: str, operation: str) -> Histogram:
+        histogram = self._services.get((service, operation))
+        if histogram is None:
+            histogram = self._services[(service, operation)] = Histogram()
+        return histogram
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        lines = [
+            "# HELP http_requests_in_flight Requests being handled right now.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_requests_total Requests handled, by route template, method and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        routes = list(self._routes.values())
+        lines += [f"http_requests_total{{{series.labels}}} {series.duration.count}" for series in routes]
+        lines += [
+            "# HELP http_request_duration_seconds Time from the request to the end of the response body.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for series in routes:
+            lines += series.duration.render("http_request_duration_seconds", series.labels)
+        lines += [
+            "# HELP http_request_service_seconds Part of the request spent in the service layer.",
+            "# TYPE http_request_service_seconds histogram",
+        ]
+        for series in routes:
+            lines += series.service.render("http_request_service_seconds", series.labels)
+        lines += [
+            "# HELP service_call_duration_seconds Duration of each service call.",
+            "# TYPE service_call_duration_seconds histogram",
+        ]
+        for (service, operation), histogram in list(self._services.items()):
+            lines += histogram.render("service_call_duration_seconds", _labels(service=service, operation=operation))
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+class InstrumentedService(CoroutineProxy):
+    """Times every coroutine of ``service`` (a module or an object) as ``name``."""
+
+    def __init__(self, name: str, service: Any, registry: MetricsRegistry = metrics) -> None:
+        super().__init__(service, lambda attribute, function: _timed(function, registry.service_histogram(name, attribute)))
+
+
+def instrument(name: str, service: Any) -> Any:
+    return InstrumentedService(name, service)
+
+
+def _timed(function: Callable, histogram: Histogram) -> Callable:
+    @wraps(function)
+    async def timed(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return await function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            histogram.observe(elapsed)
+            spent = request_service_time.get()
+            if spent is not None:
+                spent[0] += elapsed
+
+    return timed
+
+
+def _labels(**labels: object) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
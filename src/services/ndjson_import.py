@@ -0,0 +1,116 @@
+"""Incremental NDJSON import shared by every resource."""
+
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, TypeVar, Union
+from pydantic import BaseModel, ValidationError
+from src.services.bulk import NOT_APPLIED
+from src.services.repository import DEFAULT_BATCH_SIZE
+from src.types.types import BulkResult, ImportBatch, ImportLineError, ImportReport
+
+D = TypeVar("D", bound=BaseModel)
+
+ImportEvent = Union[ImportLineError, ImportBatch, ImportReport]
+
+MAX_LINE_BYTES = 1024 * 1024
+MAX_REPORTED_ERRORS = 100
+
+
+class LineTooLongError(ValueError):
+    """Raised when a single NDJSON line exceeds ``MAX_LINE_BYTES``."""
+
+
+async def import_ndjson(
+    chunks: AsyncIterator[bytes],
+    dto: type[D],
+    insert_batch: Callable[[list[D]], Awaitable[BulkResult]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncIterator[ImportEvent]:
+    """Validate and insert NDJSON records as the body arrives, reporting as it goes.
+
+    At most one batch of DTOs plus one partial line is held in memory.
+    Yields an ``ImportLineError`` for every line that fails validation or
+    that made the service roll its batch back (up to ``MAX_REPORTED_ERRORS``),
+    an ``ImportBatch`` after each batch is written, and a final
+    ``ImportReport``. Counts come from the ``BulkResult`` of each batch.
+    When the service rolls a batch back, the lines it blamed are rejected
+    and the rest of the batch is submitted again, so one bad record never
+    drops its neighbours. A line over ``MAX_LINE_BYTES`` stops the import
+    after the lines before it are written, and the summary says why.
+    """
+    report = ImportReport()
+    batch: list[D] = []
+    lines: list[int] = []
+    buffer = b""
+    line_number = 0
+
+    def line_error(line: int, error: str) -> list[ImportLineError]:
+        if len(report.errors) >= MAX_REPORTED_ERRORS:
+            report.errors_truncated = True
+            return []
+        reported = ImportLineError(line=line, error=error)
+        report.errors.append(reported)
+        return [reported]
+
+    async def flush() -> list[ImportEvent]:
+        report.batches += 1
+        events: list[ImportEvent] = []
+        pending, pending_lines = list(batch), list(lines)
+        imported = rejected = 0
+        applied = False
+        while pending:
+            result = await insert_batch(pending)
+            if result.applied:
+                imported, applied = len(result.results), True
+                break
+            # Só os itens que causaram o rollback são rejeitados; os demais (NOT_APPLIED) vão de novo
+            failed = {item.index: item.error for item in result.results if item.error not in (None, NOT_APPLIED)}
+            if not failed:
+                failed = {index: NOT_APPLIED for index in range(len(pending))}
+            for index, error in failed.items():
+                events += line_error(pending_lines[index], error)
+            rejected += len(failed)
+            pending = [dto for index, dto in enumerate(pending) if index not in failed]
+            pending_lines = [line for index, line in enumerate(pending_lines) if index not in failed]
+        report.imported += imported
+        report.rejected += rejected
+        events.append(ImportBatch(batch=report.batches, applied=applied, imported=imported, rejected=rejected))
+        batch.clear()
+        lines.clear()
+        await asyncio.sleep(0)
+        return events
+
+    def consume(line: bytes) -> list[ImportEvent]:
+        if not line.strip():
+            return []
+        try:
+            batch.append(dto.model_validate_json(line))
+        except ValidationError as exc:
+            report.failed += 1
+            return line_error(line_number, str(exc))
+        lines.append(line_number)
+        return []
+
+    try:
+        async for chunk in chunks:
+            buffer += chunk
+            *complete, buffer = buffer.split(b"\n")
+            for line in complete:
+                line_number += 1
+                for event in consume(line):
+                    yield event
+                if len(batch) >= batch_size:
+                    for event in await flush():
+                        yield event
+            if len(buffer) > MAX_LINE_BYTES:
+                raise LineTooLongError(f"Line {line_number + 1} exceeds {MAX_LINE_BYTES} bytes")
+        if buffer:
+            line_number += 1
+            for event in consume(buffer):
+                yield event
+    except LineTooLongError as exc:
+        # As linhas completas anteriores ainda são gravadas
+        report.aborted = str(exc)
+    if batch:
+        for event in await flush():
+            yield event
+    yield report
@@ -0,0 +1,196 @@
+"""Order placement: server-side pricing and all-or-nothing stock reservation.
+
+``reserve`` only reads products and plans the outcome; each backend then
+applies the new stock levels as compare-and-swap writes on the product
+versions read here, together with the order inserts. Only the products
+named by the orders are touched, so placements on disjoint products never
+conflict with each other.
+
+An order holds its stock while it is pending or processing. Once it is
+completed, shipped or delivered the goods are gone, so its stock is never
+returned. ``release`` (deletions) and ``revise`` (updates) give stock back
+only for orders that still hold it, and a cancelled order stays cancelled.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Optional, Protocol, Sequence
+from pydantic import BaseModel
+from src.models.schemas import CreateOrderDto, Order, OrderItem
+from src.services.records import field_changes
+from src.types.enums import OrderStatus
+
+# Pedidos que ainda reservam estoque, sem ter sido entregues
+HOLDING_STOCK = frozenset({OrderStatus.PENDING, OrderStatus.PROCESSING})
+
+
+class StockedProduct(Protocol):
+    id: str
+    price: float
+    stock: int
+    version: Optional[int]
+
+
+class OrderLine(Protocol):
+    productId: str
+    quantity: int
+
+
+class PlacedOrder(Protocol):
+    id: str
+    items: Sequence[OrderLine]
+    status: str
+
+
+class PlacementError(ValueError):
+    """An order in the request cannot be placed; nothing was written."""
+
+    status = 422
+
+    def __init__(self, index: int, product_id: str, message: str) -> None:
+        super().__init__(message)
+        self.index = index
+        self.product_id = product_id
+
+
+class InvalidOrderLineError(PlacementError):
+    """A line item names an unknown product or a non-positive quantity."""
+
+
+class InsufficientStockError(PlacementError):
+    """The requested quantity exceeds the product's remaining stock."""
+
+    status = 409
+
+
+class OrderStateError(ValueError):
+    """The change is not allowed in the order's current status; nothing was written."""
+
+    status = 409
+
+
+class StockPlan:
+    """Stock levels after the planned moves, read once per product from the catalog."""
+
+    def __init__(self, get_product: Callable[[str], Optional[StockedProduct]]) -> None:
+        self.get_product = get_product
+        # product_id -> (versão lida, estoque restante)
+        self.stock: dict[str, tuple[Optional[int], int]] = {}
+        self.prices: dict[str, float] = {}
+
+    def _load(self, product_id: str) -> bool:
+        if product_id not in self.stock:
+            product = self.get_product(product_id)
+            if product is None:
+                return False
+            self.prices[product_id] = product.price
+            self.stock[product_id] = (product.version, product.stock)
+        return True
+
+    def price(self, index: int, line: OrderLine) -> OrderItem:
+        """The line priced from the catalog, without touching stock."""
+        if line.quantity <= 0:
+            raise InvalidOrderLineError(index, line.productId, f"Invalid quantity for product {line.productId}")
+        if not self._load(line.productId):
+            raise InvalidOrderLineError(index, line.productId, f"Product {line.productId} not found")
+        return OrderItem(productId=line.productId, quantity=line.quantity, price=self.prices[line.productId])
+
+    def take(self, index: int, line: OrderLine) -> OrderItem:
+        """The line priced from the catalog, with its quantity drawn from stock."""
+        item = self.price(index, line)
+        version, available = self.stock[line.productId]
+        if line.quantity > available:
+            raise InsufficientStockError(
+                index,
+                line.productId,
+                f"Insufficient stock for product {line.productId}: requested {line.quantity}, available {available}",
+            )
+        self.stock[line.productId] = (version, available - line.quantity)
+        return item
+
+    def put_back(self, line: OrderLine) -> None:
+        """Return the line's quantity; products deleted since are skipped."""
+        if self._load(line.productId):
+            version, available = self.stock[line.productId]
+            self.stock[line.productId] = (version, available + line.quantity)
+
+
+def holds_stock(order: PlacedOrder) -> bool:
+    return OrderStatus(order.status) in HOLDING_STOCK
+
+
+@dataclass
+class Reservation:
+    # (itens com o preço atual, total) de cada pedido, na ordem recebida
+    priced: list[tuple[list[OrderItem], float]] = field(default_factory=list)
+    # product_id -> (versão lida, estoque restante)
+    stock: dict[str, tuple[Optional[int], int]] = field(default_factory=dict)
+
+
+def reserve(
+    orders_data: Sequence[CreateOrderDto],
+    get_product: Callable[[str], Optional[StockedProduct]],
+) -> Reservation:
+    """Price every line from the catalog and check stock across all orders.
+
+    Repeated products (within an order or across the batch) draw from the
+    same remaining stock. Client-supplied prices and totals are ignored.
+    Orders created as cancelled are priced but take no stock. Raises a
+    ``PlacementError`` for the first order that cannot be placed.
+    """
+    plan = StockPlan(get_product)
+    priced: list[tuple[list[OrderItem], float]] = []
+    for index, order_data in enumerate(orders_data):
+        place = plan.price if order_data.status == OrderStatus.CANCELLED else plan.take
+        items = [place(index, line) for line in order_data.items]
+        priced.append((items, _total(items)))
+    return Reservation(priced=priced, stock=plan.stock)
+
+
+def release(
+    orders: Iterable[PlacedOrder],
+    get_product: Callable[[str], Optional[StockedProduct]],
+) -> dict[str, tuple[Optional[int], int]]:
+    """Stock levels once deleted orders that still hold stock return it.
+
+    Maps product_id -> (version read, new stock), like ``Reservation.stock``.
+    Fulfilled and cancelled orders return nothing.
+    """
+    plan = StockPlan(get_product)
+    for order in orders:
+        if holds_stock(order):
+            for line in order.items:
+                plan.put_back(line)
+    return plan.stock
+
+
+def revise(order: PlacedOrder, order_data: BaseModel, plan: StockPlan) -> dict[str, Any]:
+    """Field changes for an update of ``order``, with its stock moves added to ``plan``.
+
+    New items are repriced from the catalog like a placement: the old lines
+    go back to stock before the new ones are reserved, and ``total`` is
+    recomputed (a client-supplied total is ignored). Items can only change
+    while the order holds stock. Cancelling an order that still holds stock
+    returns it; a cancelled order cannot move to another status. Both rules
+    raise ``OrderStateError``; unknown products and missing stock raise a
+    ``PlacementError``.
+    """
+    changes = field_changes(Order, order_data)
+    changes.pop("total", None)
+    current = OrderStatus(order.status)
+    status = OrderStatus(changes.get("status", current))
+    if status != current and current == OrderStatus.CANCELLED:
+        raise OrderStateError(f"Order {order.id} is cancelled and cannot become {status.value}")
+    if "items" in changes and current not in HOLDING_STOCK:
+        raise OrderStateError(f"Items of order {order.id} cannot change once it is {current.value}")
+    if current in HOLDING_STOCK and ("items" in changes or status == OrderStatus.CANCELLED):
+        for line in order.items:
+            plan.put_back(line)
+    if "items" in changes:
+        place = plan.price if status == OrderStatus.CANCELLED else plan.take
+        changes["items"] = [place(0, line) for line in changes["items"]]
+        changes["total"] = _total(changes["items"])
+    return changes
+
+
+def _total(items: Iterable[OrderItem]) -> float:
+    return round(sum(item.price * item.quantity for item in items), 2)
@@ -1,10 +1,18 @@
-from typing import Optional
-from datetime import datetime
-from src.models.schemas import Order, CreateOrderDto, UpdateOrderDto, OrderItem
+from __future__ import annotations
+
+from typing import AsyncIterator, Optional
+from datetime import datetime, timezone
+from src.models.schemas import Order, CreateOrderDto, UpdateOrderDto, BulkUpdateOrderDto, OrderItem
+from src.services import bulk, order_placement, product_service
+from src.services.repository import DEFAULT_BATCH_SIZE, ChangeListener, Repository, check_version
+from src.services.records import ORDER_CODEC, OrderRow
+from src.services.indexes import HashIndex, Mirror
+from src.services.id_allocator import create_id_allocator
+from src.types.types import BulkResult, PaginatedResult
 from src.types.enums import OrderStatus
 
 # Simulação de banco de dados em memória
-orders: list[Order] = [
+orders: Repository[Order] = Repository([
     Order(
         id="1",
         userId="1",
@@ -29,56 +37,182 @@ orders: list[Order] = [
         status=OrderStatus.PROCESSING,
         createdAt="2025-11-07T18:18:08.792Z",
     ),
-]
+], codec=ORDER_CODEC)
+order_ids = create_id_allocator(start=len(orders))
+
+# Índices secundários: userId -> pedidos e status -> pedidos
+orders_by_user: HashIndex[str] = HashIndex()
+orders_by_status: HashIndex[OrderStatus] = HashIndex()
+
+
+def _on_order_change(old_order: Optional[OrderRow], new_order: Optional[OrderRow]) -> None:
+    if old_order is None:
+        orders_by_user.add(new_order.userId, new_order.id)
+        orders_by_status.add(OrderStatus(new_order.status), new_order.id)
+    elif new_order is None:
+        orders_by_user.remove(old_order.userId, old_order.id)
+        orders_by_status.remove(OrderStatus(old_order.status), old_order.id)
+    else:
+        orders_by_user.move(old_order.userId, new_order.userId, new_order.id)
+        orders_by_status.move(OrderStatus(old_order.status), OrderStatus(new_order.status), new_order.id)
+
+
+def _reset_order_indexes() -> None:
+    orders_by_user.clear()
+    orders_by_status.clear()
+
+
+# Construídos no primeiro filtro, não no carregamento do snapshot
+order_indexes = Mirror(orders, _on_order_change, _reset_order_indexes)
+
+
+def _filter_order_ids(user_id: Optional[str], status: Optional[OrderStatus]) -> list[str]:
+    order_indexes.ensure()
+    if user_id is not None and status is not None:
+        # Percorre o menor bucket e confere a presença no outro
+        if orders_by_user.count(user_id) <= orders_by_status.count(status):
+            return [i for i in orders_by_user.get(user_id) if orders_by_status.contains(status, i)]
+        return [i for i in orders_by_status.get(status) if orders_by_user.contains(user_id, i)]
+    if user_id is not None:
+        return orders_by_user.get(user_id)
+    return orders_by_status.get(status)
 
 
 async def get_all_orders() -> list[Order]:
-    return orders
+    return orders.all()
+
+
+async def get_orders_page(
+    page: int,
+    page_size: int,
+    user_id: Optional[str] = None,
+    status: Optional[OrderStatus] = None,
+) -> PaginatedResult[Order]:
+    if user_id is None and status is None:
+        return orders.paginate(page, page_size)
+    return orders.paginate_subset(_filter_order_ids(user_id, status), page, page_size)
+
+
+async def get_orders_after(
+    cursor: Optional[str],
+    limit: int,
+    user_id: Optional[str] = None,
+    status: Optional[OrderStatus] = None,
+) -> PaginatedResult[Order]:
+    if user_id is None and status is None:
+        return orders.paginate_after(cursor, limit)
+    return orders.paginate_subset_after(_filter_order_ids(user_id, status), cursor, limit)
+
+
+async def stream_orders(
+    user_id: Optional[str] = None,
+    status: Optional[OrderStatus] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncIterator[list[Order]]:
+    if user_id is None and status is None:
+        batches = orders.iter_batches(batch_size)
+    else:
+        batches = orders.iter_subset_batches(sorted(_filter_order_ids(user_id, status), key=orders.seq_of), batch_size)
+    for batch in batches:
+        yield batch
 
 
 async def get_order_by_id(order_id: str) -> Optional[Order]:
-    return next((order for order in orders if order.id == order_id), None)
+    return orders.get(order_id)
 
 
-async def create_order(order_data: CreateOrderDto) -> Order:
-    total = order_data.total if order_data.total is not None else 0.0
+def _build_order(order_data: CreateOrderDto, items: list[OrderItem], total: float) -> Order:
     status = order_data.status if order_data.status is not None else OrderStatus.PENDING
     
-    new_order = Order(
-        id=str(len(orders) + 1),
+    return Order(
+        id=order_ids.next_id(),
         userId=order_data.userId,
-        items=order_data.items,
+        items=items,
         total=total,
         status=status,
-        createdAt=datetime.now().isoformat(),
+        createdAt=datetime.now(timezone.utc).isoformat(),
     )
-    orders.append(new_order)
-    return new_order
 
 
-async def update_order(order_id: str, order_data: UpdateOrderDto) -> Optional[Order]:
-    order_index = next((i for i, order in enumerate(orders) if order.id == order_id), None)
-    
-    if order_index is None:
+def _place_orders(orders_data: list[CreateOrderDto]) -> list[Order]:
+    """Price the orders, reserve their stock and insert them, all or nothing.
+
+    Nothing here awaits, so reading the products, the compare-and-swap stock
+    writes and the inserts form one step on the event loop.
+    """
+    reservation = order_placement.reserve(orders_data, product_service.products.stored)
+    _write_stock(reservation.stock)
+    return [
+        orders.add(_build_order(order_data, items, total))
+        for order_data, (items, total) in zip(orders_data, reservation.priced)
+    ]
+
+
+def _write_stock(stock: dict[str, tuple[Optional[int], int]]) -> None:
+    products = product_service.products
+    for product_id, (version, level) in stock.items():
+        products.update(product_id, {"stock": level}, expected_version=version)
+
+
+async def create_order(order_data: CreateOrderDto) -> Order:
+    return _place_orders([order_data])[0]
+
+
+async def update_order(
+    order_id: str,
+    order_data: UpdateOrderDto,
+    expected_version: Optional[int] = None,
+) -> Optional[Order]:
+    order = orders.stored(order_id)
+    check_version(order_id, expected_version, getattr(order, "version", None))
+    if order is None:
         return None
-    
-    order_dict = orders[order_index].model_dump()
-    update_dict = order_data.model_dump(exclude_unset=True)
-    # Preserva o ID e createdAt
-    updated_order = Order(
-        **{**order_dict, **update_dict, "id": orders[order_index].id, "createdAt": orders[order_index].createdAt}
-    )
-    orders[order_index] = updated_order
-    
-    return updated_order
+    plan = order_placement.StockPlan(product_service.products.stored)
+    updated = orders.update(order_id, order_placement.revise(order, order_data, plan), expected_version)
+    _write_stock(plan.stock)
+    return updated
 
 
-async def delete_order(order_id: str) -> bool:
-    order_index = next((i for i, order in enumerate(orders) if order.id == order_id), None)
-    
-    if order_index is None:
+async def delete_order(order_id: str, expected_version: Optional[int] = None) -> bool:
+    order = orders.stored(order_id)
+    check_version(order_id, expected_version, getattr(order, "version", None))
+    if order is None:
         return False
-    
-    orders.pop(order_index)
+    # Devolve ao estoque o que o pedido ainda reservava, no mesmo passo da remoção
+    restocked = order_placement.release([order], product_service.products.stored)
+    orders.remove(order_id)
+    _write_stock(restocked)
     return True
 
+
+async def bulk_create_orders(orders_data: list[CreateOrderDto]) -> BulkResult[Order]:
+    try:
+        placed = _place_orders(orders_data)
+    except order_placement.PlacementError as exc:
+        return bulk.rejected(len(orders_data), exc.index, exc.status, str(exc))
+    return bulk.created(placed)
+
+
+async def bulk_update_orders(orders_data: list[BulkUpdateOrderDto]) -> BulkResult[Order]:
+    plan = order_placement.StockPlan(product_service.products.stored)
+    result = bulk.update_all(
+        orders,
+        orders_data,
+        lambda order, order_data: order.model_copy(update=order_placement.revise(order, order_data, plan)),
+        not_found="Order not found",
+    )
+    if result.applied:
+        _write_stock(plan.stock)
+    return result
+
+
+async def bulk_delete_orders(ids: list[str]) -> BulkResult[Order]:
+    removed = [orders.stored(order_id) for order_id in ids]
+    result = bulk.delete_all(orders, ids, not_found="Order not found")
+    if result.applied:
+        _write_stock(order_placement.release(removed, product_service.products.stored))
+    return result
+
+
+def subscribe(listener: ChangeListener) -> None:
+    orders.subscribe(listener)
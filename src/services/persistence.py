@@ -0,0 +1,192 @@
+"""Durability for the in-memory backend: a write-ahead log plus snapshots.
+
+Every change a repository reports is appended to the log as
+``[resource, id, values]``, where ``values`` is the row dumped by its
+``RecordCodec`` (``None`` for a deletion). At startup the latest snapshot is
+memory-mapped and handed to each repository as its base table, so rows are
+decoded on first access and boot time does not grow with the data set; the
+log tail is then replayed through ``Repository.restore``. Indexes and
+mirrors rebuild themselves on first use (``indexes.Mirror``). Snapshots are
+taken periodically and on shutdown, which keeps the tail to replay short.
+"""
+
+import asyncio
+import contextlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Optional
+import anyio.to_thread
+import msgpack
+from src.services import snapshots, wal, user_service, car_service, product_service, order_service
+from src.services.id_allocator import create_id_allocator
+from src.services.records import USER_CODEC, CAR_CODEC, PRODUCT_CODEC, ORDER_CODEC, RecordCodec
+from src.services.repository import Repository
+
+SNAPSHOT_FILE = "snapshot.bin"
+DEFAULT_SNAPSHOT_INTERVAL_SECONDS = 300.0
+
+
+def _numeric_id(record_id: str) -> int:
+    return int(record_id) if record_id.isdigit() else 0
+
+
+@dataclass
+class _Store:
+    repository: Repository
+    codec: RecordCodec
+    # Maior ID numérico já emitido, para que IDs removidos não sejam reemitidos
+    high_water: int = 0
+
+
+class Persistence:
+    """Logs the registered repositories and restores them at startup."""
+
+    def __init__(
+        self,
+        directory: str,
+        group_commit_delay: float = wal.DEFAULT_GROUP_COMMIT_DELAY_SECONDS,
+        snapshot_interval: float = DEFAULT_SNAPSHOT_INTERVAL_SECONDS,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.group_commit_delay = group_commit_delay
+        self.snapshot_interval = snapshot_interval
+        self.log: Optional[wal.WriteAheadLog] = None
+        self._stores: dict[str, _Store] = {}
+        self._snapshot_lsn = 1
+        self._snapshot_lock = asyncio.Lock()
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.directory / SNAPSHOT_FILE
+
+    def register(self, name: str, repository: Repository, codec: RecordCodec) -> None:
+        self._stores[name] = _Store(repository, codec)
+
+    def recover(self) -> dict[str, int]:
+        """Load the snapshot, replay the log and start logging new changes.
+
+        On the first start (no snapshot, no log) the current contents, i.e.
+        the seed data, become the first snapshot. Returns the highest
+        numeric ID issued per resource.
+        """
+        snapshot = snapshots.open_snapshot(self.snapshot_path)
+        segments = wal.segments(self.directory)
+        next_lsn = 1
+        if snapshot is None and not segments:
+            for store in self._stores.values():
+                store.high_water = max((_numeric_id(row.id) for row in store.repository.rows()), default=0)
+            snapshots.write(self.snapshot_path, next_lsn, self._sections())
+        else:
+            for store in self._stores.values():
+                store.repository.clear()
+            if snapshot is not None:
+                next_lsn = self._load(snapshot)
+            for first_lsn, path in segments:
+                for lsn, payload in wal.read_segment(path, first_lsn):
+                    if lsn >= next_lsn:
+                        self._apply(payload)
+                        next_lsn = lsn + 1
+        self._snapshot_lsn = next_lsn
+        self.log = wal.WriteAheadLog(self.directory, next_lsn, self.group_commit_delay)
+        for name, store in self._stores.items():
+            store.repository.subscribe(self._listener(name, store))
+        return {name: store.high_water for name, store in self._stores.items()}
+
+    async def sync(self) -> None:
+        """Wait until every change made so far is on disk."""
+        await self.log.sync()
+
+    async def snapshot(self) -> None:
+        """Snapshot the current contents and drop the log segments it covers."""
+        async with self._snapshot_lock:
+            # Rotação e captura no mesmo passo do event loop: o snapshot cobre exatamente os LSNs < lsn
+            lsn = self.log.rotate()
+            sections = self._sections()
+            await anyio.to_thread.run_sync(snapshots.write, self.snapshot_path, lsn, sections)
+            await self.log.sync()
+            self.log.remove_segments_before(lsn)
+            self._snapshot_lsn = lsn
+
+    @contextlib.asynccontextmanager
+    async def running(self) -> AsyncIterator[None]:
+        """Snapshot periodically while the block runs, and once more on exit."""
+        task = asyncio.create_task(self._snapshot_periodically())
+        try:
+            yield
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            if self.log.next_lsn > self._snapshot_lsn:
+                await self.snapshot()
+            await self.log.close()
+
+    async def _snapshot_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            if self.log.next_lsn > self._snapshot_lsn:
+                await self.snapshot()
+
+    def _sections(self) -> dict[str, snapshots.SnapshotSection]:
+        return {
+            name: snapshots.SnapshotSection(store.repository.snapshot_rows(), store.codec.dump, store.high_water)
+            for name, store in self._stores.items()
+        }
+
+    def _load(self, snapshot: snapshots.Snapshot) -> int:
+        lazy = False
+        for name, store in self._stores.items():
+            resource = snapshot.resources.get(name)
+            if resource is None:
+                continue
+            store.high_water = resource.high_water
+            table = snapshot.table(name, store.codec.load)
+            if table is not None:
+                # O mapeamento fica aberto enquanto o repositório usar a tabela
+                store.repository.load_base(table)
+                lazy = True
+                continue
+            for values in snapshot.rows(name):
+                store.repository.restore(store.codec.load(values))
+        if not lazy:
+            snapshot.close()
+        return snapshot.lsn
+
+    def _apply(self, payload: bytes) -> None:
+        name, record_id, values = msgpack.unpackb(payload)
+        store = self._stores[name]
+        if values is None:
+            store.repository.remove(record_id)
+            return
+        store.repository.restore(store.codec.load(values))
+        store.high_water = max(store.high_water, _numeric_id(record_id))
+
+    def _listener(self, name: str, store: _Store) -> Callable[[Any, Any], None]:
+        def on_change(old: Any, new: Any) -> None:
+            if new is None:
+                self.log.append(msgpack.packb([name, old.id, None]))
+                return
+            store.high_water = max(store.high_water, _numeric_id(new.id))
+            self.log.append(msgpack.packb([name, new.id, store.codec.dump(new)]))
+
+        return on_change
+
+
+def persist_memory_services(
+    directory: str,
+    group_commit_delay: float = wal.DEFAULT_GROUP_COMMIT_DELAY_SECONDS,
+    snapshot_interval: float = DEFAULT_SNAPSHOT_INTERVAL_SECONDS,
+) -> Persistence:
+    """Restore the in-memory services from ``directory`` and log them from now on."""
+    persistence = Persistence(directory, group_commit_delay, snapshot_interval)
+    persistence.register("users", user_service.users, USER_CODEC)
+    persistence.register("cars", car_service.cars, CAR_CODEC)
+    persistence.register("products", product_service.products, PRODUCT_CODEC)
+    persistence.register("orders", order_service.orders, ORDER_CODEC)
+    high_water = persistence.recover()
+    user_service.user_ids = create_id_allocator(start=high_water["users"])
+    car_service.car_ids = create_id_allocator(start=high_water["cars"])
+    product_service.product_ids = create_id_allocator(start=high_water["products"])
+    order_service.order_ids = create_id_allocator(start=high_water["orders"])
+    return persistence
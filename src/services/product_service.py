@@ -1,9 +1,17 @@
-from typing import Optional
-from src.models.schemas import Product, CreateProductDto, UpdateProductDto
+from __future__ import annotations
+
+from typing import AsyncIterator, Optional
+from src.models.schemas import Product, CreateProductDto, UpdateProductDto, BulkUpdateProductDto, ProductFilters
+from src.services.repository import DEFAULT_BATCH_SIZE, ChangeListener, Repository, build_page
+from src.services.records import PRODUCT_CODEC, ProductRow, field_changes
+from src.services.indexes import HashIndex, Mirror, SortedIndex
+from src.services import bulk
+from src.services.id_allocator import create_id_allocator
+from src.types.types import BulkResult, PaginatedResult
 from src.types.enums import ProductCategory
 
 # Simulação de banco de dados em memória
-products: list[Product] = [
+products: Repository[Product] = Repository([
     Product(
         id="1",
         name="Notebook",
@@ -28,50 +36,176 @@ products: list[Product] = [
         stock=25,
         category=ProductCategory.ELECTRONICS,
     ),
-]
+], codec=PRODUCT_CODEC)
+product_ids = create_id_allocator(start=len(products))
+
+# Índices secundários usados pela busca de produtos
+products_by_category: HashIndex[ProductCategory] = HashIndex()
+products_by_stock: HashIndex[bool] = HashIndex()
+products_by_price: SortedIndex[float] = SortedIndex()
+
+
+def _on_product_change(old_product: Optional[ProductRow], new_product: Optional[ProductRow]) -> None:
+    if old_product is None:
+        products_by_category.add(new_product.category, new_product.id)
+        products_by_stock.add(new_product.stock > 0, new_product.id)
+        products_by_price.add(new_product.price, new_product.id)
+    elif new_product is None:
+        products_by_category.remove(old_product.category, old_product.id)
+        products_by_stock.remove(old_product.stock > 0, old_product.id)
+        products_by_price.remove(old_product.price, old_product.id)
+    else:
+        products_by_category.move(old_product.category, new_product.category, new_product.id)
+        products_by_stock.move(old_product.stock > 0, new_product.stock > 0, new_product.id)
+        products_by_price.move(old_product.price, new_product.price, new_product.id)
+
+
+def _reset_product_indexes() -> None:
+    products_by_category.clear()
+    products_by_stock.clear()
+    products_by_price.clear()
+
+
+# Construídos na primeira busca, não no carregamento do snapshot
+product_indexes = Mirror(products, _on_product_change, _reset_product_indexes)
+
+
+def _matches(product: ProductRow, filters: ProductFilters) -> bool:
+    return (
+        (filters.category is None or product.category == filters.category)
+        and (filters.minPrice is None or product.price >= filters.minPrice)
+        and (filters.maxPrice is None or product.price <= filters.maxPrice)
+        and (filters.inStock is None or (product.stock > 0) == filters.inStock)
+    )
+
+
+def _search_product_ids(filters: ProductFilters) -> tuple[list[str], bool]:
+    """Return matching IDs and whether they are already in ascending price order.
+    
+    The most selective index drives the scan; the remaining predicates are
+    checked on each candidate, so the cost is O(log n + k).
+    """
+    product_indexes.ensure()
+    candidates = []
+    if filters.category is not None:
+        candidates.append((products_by_category.count(filters.category), False, lambda: products_by_category.get(filters.category)))
+    if filters.inStock is not None:
+        candidates.append((products_by_stock.count(filters.inStock), False, lambda: products_by_stock.get(filters.inStock)))
+    if filters.minPrice is not None or filters.maxPrice is not None or not candidates:
+        candidates.append((
+            products_by_price.count_range(filters.minPrice, filters.maxPrice),
+            True,
+            lambda: products_by_price.range(filters.minPrice, filters.maxPrice),
+        ))
+    _, by_price, load = min(candidates, key=lambda candidate: candidate[0])
+    return [product_id for product_id in load() if _matches(products.stored(product_id), filters)], by_price
+
+
+def _sort_by_price(product_ids: list[str], already_sorted: bool, descending: bool) -> list[str]:
+    if not already_sorted:
+        product_ids = sorted(product_ids, key=lambda product_id: products.stored(product_id).price)
+    return product_ids[::-1] if descending else product_ids
 
 
 async def get_all_products() -> list[Product]:
-    return products
+    return products.all()
+
+
+async def get_products_page(
+    page: int,
+    page_size: int,
+    filters: Optional[ProductFilters] = None,
+) -> PaginatedResult[Product]:
+    if filters is None or filters.is_empty:
+        return products.paginate(page, page_size)
+    
+    product_ids, by_price = _search_product_ids(filters)
+    if filters.sort is None:
+        return products.paginate_subset(product_ids, page, page_size)
+    
+    product_ids = _sort_by_price(product_ids, by_price, descending=filters.sort == "-price")
+    start = (page - 1) * page_size
+    items = [products.get(product_id) for product_id in product_ids[start:start + page_size]]
+    return build_page(items, len(product_ids), page_size, page=page)
+
+
+async def get_products_after(
+    cursor: Optional[str],
+    limit: int,
+    filters: Optional[ProductFilters] = None,
+) -> PaginatedResult[Product]:
+    if filters is None or filters.is_empty:
+        return products.paginate_after(cursor, limit)
+    if filters.sort is not None:
+        raise ValueError("Cursor pagination does not support sort; use page/page_size")
+    
+    product_ids, _ = _search_product_ids(filters)
+    return products.paginate_subset_after(product_ids, cursor, limit)
+
+
+async def stream_products(
+    filters: Optional[ProductFilters] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncIterator[list[Product]]:
+    if filters is None or filters.is_empty:
+        batches = products.iter_batches(batch_size)
+    else:
+        product_ids, by_price = _search_product_ids(filters)
+        if filters.sort is None:
+            product_ids = sorted(product_ids, key=products.seq_of)
+        else:
+            product_ids = _sort_by_price(product_ids, by_price, descending=filters.sort == "-price")
+        batches = products.iter_subset_batches(product_ids, batch_size)
+    for batch in batches:
+        yield batch
 
 
 async def get_product_by_id(product_id: str) -> Optional[Product]:
-    return next((product for product in products if product.id == product_id), None)
+    return products.get(product_id)
 
 
-async def create_product(product_data: CreateProductDto) -> Product:
-    new_product = Product(
-        id=str(len(products) + 1),
+def _build_product(product_data: CreateProductDto) -> Product:
+    return Product(
+        id=product_ids.next_id(),
         name=product_data.name,
         description=product_data.description,
         price=product_data.price,
         stock=product_data.stock,
         category=product_data.category,
     )
-    products.append(new_product)
-    return new_product
 
 
-async def update_product(product_id: str, product_data: UpdateProductDto) -> Optional[Product]:
-    product_index = next((i for i, product in enumerate(products) if product.id == product_id), None)
-    
-    if product_index is None:
-        return None
-    
-    product_dict = products[product_index].model_dump()
-    update_dict = product_data.model_dump(exclude_unset=True)
-    updated_product = Product(**{**product_dict, **update_dict})
-    products[product_index] = updated_product
-    
-    return updated_product
+def _merge_product(existing_product: Product, product_data: UpdateProductDto) -> Product:
+    return existing_product.model_copy(update=field_changes(Product, product_data))
 
 
-async def delete_product(product_id: str) -> bool:
-    product_index = next((i for i, product in enumerate(products) if product.id == product_id), None)
-    
-    if product_index is None:
-        return False
-    
-    products.pop(product_index)
-    return True
+async def create_product(product_data: CreateProductDto) -> Product:
+    return products.add(_build_product(product_data))
+
+
+async def update_product(
+    product_id: str,
+    product_data: UpdateProductDto,
+    expected_version: Optional[int] = None,
+) -> Optional[Product]:
+    return products.update(product_id, field_changes(Product, product_data), expected_version)
+
+
+async def delete_product(product_id: str, expected_version: Optional[int] = None) -> bool:
+    return products.remove(product_id, expected_version) is not None
+
+
+async def bulk_create_products(products_data: list[CreateProductDto]) -> BulkResult[Product]:
+    return bulk.create_all(products, [_build_product(product_data) for product_data in products_data])
+
+
+async def bulk_update_products(products_data: list[BulkUpdateProductDto]) -> BulkResult[Product]:
+    return bulk.update_all(products, products_data, _merge_product, not_found="Product not found")
+
+
+async def bulk_delete_products(ids: list[str]) -> BulkResult[Product]:
+    return bulk.delete_all(products, ids, not_found="Product not found")
+
 
+def subscribe(listener: ChangeListener) -> None:
+    products.subscribe(listener)
@@ -0,0 +1,175 @@
+"""On-demand sampling profiler for the request handlers.
+
+While enabled, a daemon thread wakes up every ``interval`` seconds and
+reads the stack of the event loop thread (``sys._current_frames``). Frames
+are walked outwards until the frame of a request that was picked for
+profiling (see ``routes.profiling.ProfilingMiddleware``); the sample is then
+counted for that request's ``METHOD /route/{template}``. Samples taken
+while the loop runs anything else are dropped, so this is an on-CPU view of
+the event loop; work handed to worker threads is not seen.
+
+Samples are aggregated per distinct stack and exported as collapsed stacks
+(``flamegraph.pl``, speedscope, inferno) or as speedscope JSON.
+"""
+
+import os
+import random
+import sys
+import threading
+from types import CodeType, FrameType
+from typing import Any, Optional
+
+DEFAULT_INTERVAL_SECONDS = 0.005
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class SamplingProfiler:
+    """Samples the stacks of a fraction of requests, or of a single route."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.sample_rate = 1.0
+        self.route: Optional[str] = None
+        self.interval = DEFAULT_INTERVAL_SECONDS
+        self.samples = 0
+        # Frame do middleware de cada requisição perfilada -> escopo ASGI dela
+        self._active: dict[FrameType, dict] = {}
+        self._stacks: dict[tuple[str, tuple[CodeType, ...]], int] = {}
+        self._lock = threading.Lock()
+        # Um Event por thread de amostragem: uma thread antiga nunca é reativada
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, sample_rate: float = 1.0, route: Optional[str] = None, interval: float = DEFAULT_INTERVAL_SECONDS) -> None:
+        """(Re)start profiling from the event loop thread, dropping earlier samples."""
+        self.stop()
+        self.sample_rate = sample_rate
+        self.route = route
+        self.interval = interval
+        self.reset()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop, threading.get_ident()), name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+        self.enabled = True
+
+    def stop(self) -> None:
+        """Stop sampling; collected samples stay available.
+
+        Does not wait for the sampling thread, which runs on the event loop
+        thread's behalf: it exits on its own, and no sample is counted once
+        this returns.
+        """
+        self.enabled = False
+        with self._lock:
+            self._stop.set()
+        self._thread = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stacks.clear()
+            self.samples = 0
+
+    def should_sample(self) -> bool:
+        # Com um filtro de rota toda requisição é candidata; a rota só é conhecida após o roteamento
+        return self.enabled and (self.route is not None or self.sample_rate >= 1.0 or random.random() < self.sample_rate)
+
+    def begin(self, frame: FrameType, scope: dict) -> None:
+        self._active[frame] = scope
+
+    def end(self, frame: FrameType) -> None:
+        self._active.pop(frame, None)
+
+    def collapsed(self) -> str:
+        """One ``endpoint;outer;...;inner count`` line per distinct stack."""
+        lines = []
+        for (endpoint, codes), count in sorted(self._snapshot().items(), key=lambda item: item[0][0]):
+            lines.append(";".join([endpoint, *map(_frame_name, codes)]) + f" {count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def speedscope(self) -> dict[str, Any]:
+        """The samples as a speedscope file, one sampled profile per endpoint."""
+        frames: list[dict[str, Any]] = []
+        frame_index: dict[CodeType, int] = {}
+        profiles: dict[str, dict[str, Any]] = {}
+        for (endpoint, codes), count in self._snapshot().items():
+            stack = []
+            for code in codes:
+                index = frame_index.get(code)
+                if index is None:
+                    index = frame_index[code] = len(frames)
+                    frames.append({"name": code.co_qualname, "file": _relative(code.co_filename), "line": code.co_firstlineno})
+                stack.append(index)
+            profile = profiles.get(endpoint)
+            if profile is None:
+                profile = profiles[endpoint] = {
+                    "type": "sampled",
+                    "name": endpoint,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": 0,
+                    "samples": [],
+                    "weights": [],
+                }
+            weight = count * self.interval
+            profile["samples"].append(stack)
+            profile["weights"].append(weight)
+            profile["endValue"] += weight
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": "API request profile",
+            "exporter": "src.services.profiler",
+            "shared": {"frames": frames},
+            "profiles": list(profiles.values()),
+        }
+
+    def _snapshot(self) -> dict[tuple[str, tuple[CodeType, ...]], int]:
+        with self._lock:
+            return dict(self._stacks)
+
+    def _run(self, stop: threading.Event, loop_thread_id: int) -> None:
+        while not stop.wait(self.interval):
+            frame = sys._current_frames().get(loop_thread_id)
+            if frame is not None:
+                self._sample(frame, stop)
+
+    def _sample(self, frame: Optional[FrameType], stop: threading.Event) -> None:
+        codes = []
+        while frame is not None:
+            scope = self._active.get(frame)
+            if scope is not None:
+                break
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        else:
+            return
+        route = scope.get("route")
+        template = route.path if route is not None else UNMATCHED_ROUTE
+        if self.route is not None and template != self.route:
+            return
+        key = (f"{scope['method']} {template}", tuple(reversed(codes)))
+        with self._lock:
+            if stop.is_set():
+                return
+            self._stacks[key] = self._stacks.get(key, 0) + 1
+            self.samples += 1
+
+
+profiler = SamplingProfiler()
+
+
+def _frame_name(code: CodeType) -> str:
+    return f"{code.co_qualname} ({_relative(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _relative(filename: str) -> str:
+    # Caminhos do projeto relativos ao diretório atual; bibliotecas a partir de site-packages
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    try:
+        return os.path.relpath(filename)
+    except ValueError:
+        return filename
@@ -0,0 +1,215 @@
+"""Compact storage rows for the in-memory repositories.
+
+Pydantic models carry a ``__dict__``, a fields-set ``set`` and a private
+attribute dict per instance. Repositories store these ``__slots__``
+dataclasses instead and rebuild the model (without re-validating) only
+when a record leaves the store. Rows use the model's attribute names, so
+indexes, columnar mirrors and filters read them directly.
+
+Every row carries a ``version`` that starts at 1 and is bumped on each
+update. Partial updates (``RecordCodec.patch``) copy the row and only the
+changed fields, sharing everything else, e.g. an order's items.
+"""
+
+import dataclasses
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Generic, Iterable, Optional, Sequence, TypeVar
+from pydantic import BaseModel, TypeAdapter
+from src.models.schemas import Record, User, Car, Product, Order, OrderItem
+from src.types.enums import CarColor, OrderStatus, ProductCategory
+
+M = TypeVar("M", bound=Record)
+R = TypeVar("R")
+
+
+@dataclass(slots=True)
+class UserRow:
+    id: str
+    name: str
+    email: str
+    age: int
+    version: int = 1
+    # Codificações memoizadas, compartilhadas com os modelos gerados a partir da linha
+    encoded: Optional[dict[str, bytes]] = field(default=None, compare=False, repr=False)
+
+
+@dataclass(slots=True)
+class CarRow:
+    id: str
+    brand: str
+    model: str
+    year: int
+    color: CarColor
+    price: float
+    version: int = 1
+    encoded: Optional[dict[str, bytes]] = field(default=None, compare=False, repr=False)
+
+
+@dataclass(slots=True)
+class ProductRow:
+    id: str
+    name: str
+    description: str
+    price: float
+    stock: int
+    category: ProductCategory
+    version: int = 1
+    encoded: Optional[dict[str, bytes]] = field(default=None, compare=False, repr=False)
+
+
+@dataclass(slots=True, frozen=True)
+class OrderItemRow:
+    productId: str
+    quantity: int
+    price: float
+
+
+@dataclass(slots=True)
+class OrderRow:
+    id: str
+    userId: str
+    items: tuple[OrderItemRow, ...]
+    total: float
+    status: OrderStatus
+    createdAt: str
+    version: int = 1
+    encoded: Optional[dict[str, bytes]] = field(default=None, compare=False, repr=False)
+
+
+@dataclass(frozen=True)
+class RecordCodec(Generic[M, R]):
+    """Converts between the API model and its storage row."""
+
+    pack: Callable[[M], R]
+    build: Callable[[R], M]
+    # Linha <-> tupla de valores primitivos (log e snapshots), versão incluída
+    dump: Callable[[R], tuple]
+    load: Callable[[Sequence[Any]], R]
+    # Converte valores validados do modelo para a representação da linha
+    converters: dict[str, Callable[[Any], Any]] = field(default_factory=dict)
+
+    def unpack(self, row: R) -> M:
+        """Rebuild the model, sharing the row's encoding memo with it."""
+        model = self.build(row)
+        if row.encoded is None:
+            row.encoded = {}
+        model._encoded = row.encoded
+        model._version = row.version
+        return model
+
+    def patch(self, row: R, changes: dict[str, Any]) -> R:
+        """Copy ``row`` with ``changes`` applied and its version bumped.
+
+        Unchanged fields are shared with the previous row, so the cost is
+        O(changed fields) regardless of the record's size.
+        """
+        for name, convert in self.converters.items():
+            if name in changes:
+                changes = {**changes, name: convert(changes[name])}
+        return dataclasses.replace(row, **changes, version=row.version + 1, encoded=None)
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(model: type[Record], name: str) -> TypeAdapter:
+    return TypeAdapter(model.model_fields[name].annotation)
+
+
+def field_changes(model: type[Record], update_data: BaseModel, exclude: Iterable[str] = ("id",)) -> dict[str, Any]:
+    """Validate only the fields set on ``update_data`` against ``model``.
+
+    Raises ``ValidationError`` just like building the whole model would
+    (e.g. for an explicit ``null``), without re-validating unchanged fields.
+    """
+    return {
+        name: _field_adapter(model, name).validate_python(getattr(update_data, name))
+        for name in update_data.model_fields_set
+        if name not in exclude
+    }
+
+
+def _item_rows(items: Iterable[OrderItem]) -> tuple[OrderItemRow, ...]:
+    return tuple(OrderItemRow(item.productId, item.quantity, item.price) for item in items)
+
+
+USER_CODEC: RecordCodec[User, UserRow] = RecordCodec(
+    pack=lambda user: UserRow(user.id, user.name, user.email, user.age),
+    build=lambda row: User.model_construct(id=row.id, name=row.name, email=row.email, age=row.age),
+    dump=lambda row: (row.id, row.name, row.email, row.age, row.version),
+    load=lambda values: UserRow(*values),
+)
+
+CAR_CODEC: RecordCodec[Car, CarRow] = RecordCodec(
+    pack=lambda car: CarRow(car.id, car.brand, car.model, car.year, CarColor(car.color), car.price),
+    converters={"color": CarColor},
+    build=lambda row: Car.model_construct(
+        id=row.id, brand=row.brand, model=row.model, year=row.year, color=row.color, price=row.price
+    ),
+    dump=lambda row: (row.id, row.brand, row.model, row.year, row.color.value, row.price, row.version),
+    load=lambda values: CarRow(values[0], values[1], values[2], values[3], CarColor(values[4]), values[5], values[6]),
+)
+
+PRODUCT_CODEC: RecordCodec[Product, ProductRow] = RecordCodec(
+    pack=lambda product: ProductRow(
+        product.id,
+        product.name,
+        product.description,
+        product.price,
+        product.stock,
+        ProductCategory(product.category),
+    ),
+    converters={"category": ProductCategory},
+    build=lambda row: Product.model_construct(
+        id=row.id,
+        name=row.name,
+        description=row.description,
+        price=row.price,
+        stock=row.stock,
+        category=row.category,
+    ),
+    dump=lambda row: (row.id, row.name, row.description, row.price, row.stock, row.category.value, row.version),
+    load=lambda values: ProductRow(
+        values[0], values[1], values[2], values[3], values[4], ProductCategory(values[5]), values[6]
+    ),
+)
+
+ORDER_CODEC: RecordCodec[Order, OrderRow] = RecordCodec(
+    pack=lambda order: OrderRow(
+        order.id,
+        order.userId,
+        _item_rows(order.items),
+        order.total,
+        OrderStatus(order.status),
+        order.createdAt,
+    ),
+    converters={"items": _item_rows, "status": OrderStatus},
+    build=lambda row: Order.model_construct(
+        id=row.id,
+        userId=row.userId,
+        items=[
+            OrderItem.model_construct(productId=item.productId, quantity=item.quantity, price=item.price)
+            for item in row.items
+        ],
+        total=row.total,
+        status=row.status,
+        createdAt=row.createdAt,
+    ),
+    dump=lambda row: (
+        row.id,
+        row.userId,
+        [(item.productId, item.quantity, item.price) for item in row.items],
+        row.total,
+        row.status.value,
+        row.createdAt,
+        row.version,
+    ),
+    load=lambda values: OrderRow(
+        values[0],
+        values[1],
+        tuple(OrderItemRow(*item) for item in values[2]),
+        values[3],
+        OrderStatus(values[4]),
+        values[5],
+        values[6],
+    ),
+)
@@ -0,0 +1,482 @@
+"""Generic in-memory repository shared by all services."""
+
+from bisect import bisect_right, insort
+from itertools import islice
+from math import ceil
+from operator import itemgetter
+from typing import Any, Callable, Generic, Iterable, Iterator, Optional, Protocol, TypeVar
+from src.types.types import PaginatedResult
+
+
+class Identifiable(Protocol):
+    """Any record exposing a string ``id``."""
+
+    id: str
+
+
+T = TypeVar("T", bound=Identifiable)
+
+# Listener(old, new): old é None em inserções e new é None em remoções
+ChangeListener = Callable[[Optional[T], Optional[T]], None]
+
+
+class Codec(Protocol):
+    """Storage representation used by a ``Repository`` (see ``records``)."""
+
+    def pack(self, record: Any) -> Any: ...
+
+    def unpack(self, row: Any) -> Any: ...
+
+    def patch(self, row: Any, changes: dict[str, Any]) -> Any: ...
+
+
+class BaseTable(Protocol):
+    """Read-only rows a repository starts from (see ``snapshots.SnapshotTable``)."""
+
+    def __len__(self) -> int: ...
+
+    def row(self, position: int) -> Any: ...
+
+    def encoded(self, position: int) -> Any: ...
+
+    def id_at(self, position: int) -> str: ...
+
+    def position_of(self, record_id: str) -> Optional[int]: ...
+
+# Tamanho padrão dos lotes usados em exportações e importações em streaming
+DEFAULT_BATCH_SIZE = 500
+
+# Compacta a ordem de inserção quando mais da metade das posições são lápides
+COMPACT_MIN_TOMBSTONES = 64
+
+
+class VersionConflictError(Exception):
+    """A compare-and-swap write found a different version than expected."""
+
+    def __init__(self, record_id: str, expected: int, actual: Optional[int]) -> None:
+        super().__init__(f"Version conflict on {record_id}: expected {expected}, found {actual}")
+        self.record_id = record_id
+        self.expected = expected
+        self.actual = actual
+
+
+def check_version(record_id: str, expected: Optional[int], actual: Optional[int]) -> None:
+    """Raise ``VersionConflictError`` unless ``expected`` is ``None`` or equals ``actual``."""
+    if expected is not None and expected != actual:
+        raise VersionConflictError(record_id, expected, actual)
+
+
+class Repository(Generic[T]):
+    """Hash-indexed store that preserves insertion order.
+
+    Records live in an ``id -> record`` dict, so lookups, replacements and
+    deletions are O(1). Alongside it, every record gets a monotonic sequence
+    number kept in an append-only list; deletions leave a tombstone that is
+    compacted by ``remove`` once tombstones outnumber live entries. The
+    sequence list makes keyset pagination a bisect plus O(page) scan,
+    independent of how deep the cursor is; offset pagination finds its first
+    live entry by bisecting the sorted tombstone positions instead of
+    compacting, so reads never pay for deletions.
+
+    With a ``codec``, records are stored packed (e.g. as ``__slots__`` rows)
+    and unpacked only when they are returned; listeners and ``stored``
+    see the packed rows, which also carry the record's version.
+
+    ``update`` and ``remove`` accept an ``expected_version`` and act as
+    compare-and-swap: the check and the write happen without yielding to
+    the event loop, so no lock is needed.
+
+    ``load_base`` starts the repository from a read-only ``BaseTable`` (a
+    memory-mapped snapshot): base rows are decoded into the dict the first
+    time they are read, base row ``p`` has sequence number ``p + 1`` and
+    deletions are kept as a sorted list of base positions.
+    """
+
+    def __init__(self, records: Iterable[T] = (), codec: Optional[Codec] = None) -> None:
+        self._codec = codec
+        self._records: dict[str, Any] = {}
+        self._seq_of: dict[str, int] = {}
+        self._order_ids: list[Optional[str]] = []
+        self._order_seqs: list[int] = []
+        self._next_seq = 1
+        self._tombstones: list[int] = []
+        self._listeners: list[ChangeListener] = []
+        self._base: Optional[BaseTable] = None
+        self._base_positions: dict[str, int] = {}
+        self._base_deleted: list[int] = []
+        self._base_deleted_set: set[int] = set()
+        # Muda a cada load_base; espelhos derivados (``indexes.Mirror``) se reconstroem
+        self.generation = 0
+        for record in records:
+            self.add(record)
+
+    def __len__(self) -> int:
+        if self._base is None:
+            return len(self._records)
+        return len(self._base) - len(self._base_deleted) + len(self._seq_of)
+
+    def __contains__(self, record_id: object) -> bool:
+        return record_id in self._records or (self._base is not None and self._base_position(record_id) is not None)
+
+    def __iter__(self) -> Iterator[T]:
+        return map(self._unpack, self._ordered_rows())
+
+    def all(self) -> list[T]:
+        """Return every record in insertion order."""
+        return [self._unpack(row) for row in self._ordered_rows()]
+
+    def get(self, record_id: str) -> Optional[T]:
+        """Return the record with the given ID, if any."""
+        row = self._row(record_id)
+        return self._unpack(row) if row is not None else None
+
+    def stored(self, record_id: str) -> Optional[Any]:
+        """Return the stored (packed) row, for read-only checks on hot paths."""
+        return self._row(record_id)
+
+    def rows(self) -> list[Any]:
+        """Return every stored (packed) row in insertion order."""
+        return list(self._ordered_rows())
+
+    def snapshot_rows(self) -> Iterator[Any]:
+        """Point-in-time rows in insertion order, safe to consume on another thread.
+
+        Base rows never read since ``load_base`` are yielded as
+        ``BaseTable.encoded`` entries, so they are copied without decoding.
+        """
+        if self._base is None:
+            return iter(list(self._records.values()))
+        base = self._base
+        deleted = frozenset(self._base_deleted_set)
+        records = dict(self._records)
+        new_ids = [record_id for record_id in self._order_ids if record_id is not None]
+
+        def rows() -> Iterator[Any]:
+            for position in range(len(base)):
+                if position not in deleted:
+                    row = records.get(base.id_at(position))
+                    yield row if row is not None else base.encoded(position)
+            for record_id in new_ids:
+                yield records[record_id]
+
+        return rows()
+
+    def load_base(self, table: BaseTable) -> None:
+        """Replace every record with the rows of ``table``, decoded on first access.
+
+        Listeners are not called for the base rows; they see ``generation``
+        change instead.
+        """
+        self.clear()
+        self._base = table
+        self._next_seq = max(self._next_seq, len(table) + 1)
+        self.generation += 1
+
+    def add(self, record: T) -> T:
+        """Insert a new record at the end of the collection."""
+        if record.id in self:
+            raise KeyError(f"Duplicate id: {record.id}")
+        row = self._pack(record)
+        self._append(row)
+        return self._unpack(row)
+
+    def restore(self, row: Any) -> None:
+        """Insert or overwrite a stored row as is, keeping its version (recovery)."""
+        previous = self._row(row.id)
+        if previous is None:
+            self._append(row)
+            return
+        self._records[row.id] = row
+        self._notify(previous, row)
+
+    def replace(self, record_id: str, record: T) -> Optional[T]:
+        """Swap the stored record in place, keeping its position."""
+        previous = self._row(record_id)
+        if previous is None:
+            return None
+        row = self._pack(record)
+        if self._codec is not None:
+            row.version = previous.version + 1
+        self._records[record_id] = row
+        self._notify(previous, row)
+        return self._unpack(row)
+
+    def update(self, record_id: str, changes: dict[str, Any], expected_version: Optional[int] = None) -> Optional[T]:
+        """Apply already validated field ``changes`` without rebuilding the record.
+
+        The stored row is copied with only ``changes`` replaced (structural
+        sharing) and its version bumped; returns ``None`` when missing and
+        raises ``VersionConflictError`` when ``expected_version`` is stale,
+        or given for a missing record (the precondition is checked first).
+        """
+        previous = self._row(record_id)
+        check_version(record_id, expected_version, getattr(previous, "version", None))
+        if previous is None:
+            return None
+        if self._codec is not None:
+            row = self._codec.patch(previous, changes)
+        else:
+            row = previous.model_copy(update=changes)
+        self._records[record_id] = row
+        self._notify(previous, row)
+        return self._unpack(row)
+
+    def version_of(self, record_id: str) -> Optional[int]:
+        """Return the stored version of a record (repositories with a codec)."""
+        return getattr(self._row(record_id), "version", None)
+
+    def remove(self, record_id: str, expected_version: Optional[int] = None) -> Optional[T]:
+        """Delete a record and return it, or ``None`` when missing.
+
+        Raises ``VersionConflictError`` when ``expected_version`` is stale,
+        or given for a missing record.
+        """
+        record = self._row(record_id)
+        check_version(record_id, expected_version, getattr(record, "version", None))
+        if record is None:
+            return None
+        del self._records[record_id]
+        seq = self._seq_of.pop(record_id, None)
+        if seq is None:
+            position = self._base_positions.pop(record_id)
+            insort(self._base_deleted, position)
+            self._base_deleted_set.add(position)
+        else:
+            position = bisect_right(self._order_seqs, seq) - 1
+            self._order_ids[position] = None
+            insort(self._tombstones, position)
+            if len(self._tombstones) >= COMPACT_MIN_TOMBSTONES and len(self._tombstones) * 2 > len(self._order_ids):
+                self._compact()
+        self._notify(record, None)
+        return self._unpack(record)
+
+    def clear(self) -> None:
+        """Drop every record."""
+        removed = list(self._ordered_rows())
+        self._records.clear()
+        self._seq_of.clear()
+        self._order_ids.clear()
+        self._order_seqs.clear()
+        self._tombstones.clear()
+        self._base = None
+        self._base_positions.clear()
+        self._base_deleted.clear()
+        self._base_deleted_set.clear()
+        for record in removed:
+            self._notify(record, None)
+
+    def subscribe(self, listener: ChangeListener) -> None:
+        """Call ``listener(old, new)`` after every add, replace and remove."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: ChangeListener) -> None:
+        self._listeners.remove(listener)
+
+    def seq_of(self, record_id: str) -> Optional[int]:
+        """Return the insertion sequence number of a record."""
+        seq = self._seq_of.get(record_id)
+        if seq is None and self._base is not None:
+            position = self._base_position(record_id)
+            if position is not None:
+                return position + 1
+        return seq
+
+    def iter_batches(self, batch_size: int) -> Iterator[list[T]]:
+        """Yield every record in insertion order, ``batch_size`` at a time.
+
+        Each batch resumes from the last sequence number seen, so records
+        added, replaced or removed between batches never break iteration.
+        """
+        after_seq = 0
+        while True:
+            scanned = list(islice(self._scan(after_seq), batch_size))
+            if not scanned:
+                return
+            after_seq = scanned[-1][0]
+            yield [self._unpack(row) for _, row in scanned]
+
+    def iter_subset_batches(self, record_ids: list[str], batch_size: int) -> Iterator[list[T]]:
+        """Yield the given records batch by batch, skipping any removed meanwhile."""
+        for start in range(0, len(record_ids), batch_size):
+            rows = map(self._row, record_ids[start:start + batch_size])
+            batch = [self._unpack(row) for row in rows if row is not None]
+            if batch:
+                yield batch
+
+    def paginate(self, page: int, page_size: int) -> PaginatedResult:
+        """Return the 1-based ``page`` of ``page_size`` records.
+
+        Costs O(log t + page + tombstones inside the page) for ``t`` tombstones.
+        """
+        start = (page - 1) * page_size
+        if self._base is None:
+            position = _nth_live(self._tombstones, start)
+            ids: list[str] = []
+            while position < len(self._order_ids) and len(ids) < page_size:
+                if self._order_ids[position] is not None:
+                    ids.append(self._order_ids[position])
+                position += 1
+            items = [self._unpack(self._records[record_id]) for record_id in ids]
+            return build_page(items, len(self._records), page_size, page=page)
+        base_live = len(self._base) - len(self._base_deleted)
+        if start < base_live:
+            after_seq = _nth_live(self._base_deleted, start)
+        else:
+            position = _nth_live(self._tombstones, start - base_live)
+            after_seq = self._order_seqs[position] - 1 if position < len(self._order_seqs) else self._next_seq
+        items = [self._unpack(row) for _, row in islice(self._scan(after_seq), page_size)]
+        return build_page(items, len(self), page_size, page=page)
+
+    def paginate_after(self, cursor: Optional[str], limit: int) -> PaginatedResult:
+        """Return up to ``limit`` records following ``cursor`` (keyset pagination).
+
+        Raises ``ValueError`` when the cursor is malformed.
+        """
+        after_seq = decode_cursor(cursor)
+        scanned = list(islice(self._scan(after_seq), limit + 1))
+        has_more = len(scanned) > limit
+        items = [self._unpack(row) for _, row in scanned[:limit]]
+        next_cursor = None
+        if has_more:
+            next_cursor = encode_cursor(scanned[limit - 1][0] if limit else after_seq)
+        return build_page(items, len(self), limit, next_cursor=next_cursor)
+
+    def paginate_subset(self, record_ids: Iterable[str], page: int, page_size: int) -> PaginatedResult:
+        """Offset-paginate a subset of records (e.g. from a secondary index).
+
+        The subset is returned in insertion order; cost is O(k log k) in the
+        size of the subset, independent of the collection size.
+        """
+        ordered = self._order_subset(record_ids)
+        start = (page - 1) * page_size
+        items = [self._unpack(self._row(record_id)) for _, record_id in ordered[start:start + page_size]]
+        return build_page(items, len(ordered), page_size, page=page)
+
+    def paginate_subset_after(self, record_ids: Iterable[str], cursor: Optional[str], limit: int) -> PaginatedResult:
+        """Keyset-paginate a subset of records, sharing cursors with ``paginate_after``."""
+        after_seq = decode_cursor(cursor)
+        ordered = self._order_subset(record_ids)
+        position = bisect_right(ordered, after_seq, key=itemgetter(0))
+        window = ordered[position:position + limit]
+        items = [self._unpack(self._row(record_id)) for _, record_id in window]
+        has_more = position + limit < len(ordered)
+        next_cursor = encode_cursor(window[-1][0]) if has_more and window else None
+        return build_page(items, len(ordered), limit, next_cursor=next_cursor)
+
+    def _order_subset(self, record_ids: Iterable[str]) -> list[tuple[int, str]]:
+        if self._base is None:
+            seq_of = self._seq_of
+            return sorted((seq_of[record_id], record_id) for record_id in record_ids if record_id in seq_of)
+        seqs = ((self.seq_of(record_id), record_id) for record_id in record_ids)
+        return sorted((seq, record_id) for seq, record_id in seqs if seq is not None)
+
+    def _row(self, record_id: str) -> Optional[Any]:
+        row = self._records.get(record_id)
+        if row is None and self._base is not None:
+            position = self._base_position(record_id)
+            if position is not None:
+                row = self._records[record_id] = self._base.row(position)
+        return row
+
+    def _base_position(self, record_id: str) -> Optional[int]:
+        position = self._base_positions.get(record_id)
+        if position is None and record_id not in self._seq_of:
+            position = self._base.position_of(record_id)
+            if position is None or position in self._base_deleted_set:
+                return None
+            self._base_positions[record_id] = position
+        return position
+
+    def _base_row(self, position: int) -> Any:
+        record_id = self._base.id_at(position)
+        row = self._records.get(record_id)
+        if row is None:
+            row = self._records[record_id] = self._base.row(position)
+            self._base_positions[record_id] = position
+        return row
+
+    def _ordered_rows(self) -> Iterator[Any]:
+        if self._base is None:
+            return iter(self._records.values())
+        return (row for _, row in self._scan(0))
+
+    def _scan(self, after_seq: int) -> Iterator[tuple[int, Any]]:
+        """Yield ``(seq, row)`` for every record after ``after_seq``, in order."""
+        base = self._base
+        if base is not None:
+            for position in range(min(after_seq, len(base)), len(base)):
+                if position not in self._base_deleted_set:
+                    yield position + 1, self._base_row(position)
+        position = bisect_right(self._order_seqs, after_seq)
+        while position < len(self._order_ids):
+            record_id = self._order_ids[position]
+            if record_id is not None:
+                yield self._order_seqs[position], self._records[record_id]
+            position += 1
+
+    def _append(self, row: Any) -> None:
+        self._records[row.id] = row
+        self._seq_of[row.id] = self._next_seq
+        self._order_ids.append(row.id)
+        self._order_seqs.append(self._next_seq)
+        self._next_seq += 1
+        self._notify(None, row)
+
+    def _pack(self, record: T) -> Any:
+        return self._codec.pack(record) if self._codec is not None else record
+
+    def _unpack(self, row: Any) -> T:
+        return self._codec.unpack(row) if self._codec is not None else row
+
+    def _notify(self, old: Optional[T], new: Optional[T]) -> None:
+        for listener in self._listeners:
+            listener(old, new)
+
+    def _compact(self) -> None:
+        live = [(record_id, seq) for record_id, seq in zip(self._order_ids, self._order_seqs) if record_id is not None]
+        self._order_ids = [record_id for record_id, _ in live]
+        self._order_seqs = [seq for _, seq in live]
+        self._tombstones = []
+
+
+def _nth_live(deleted: list[int], index: int) -> int:
+    """Position of the ``index``-th (0-based) live entry, given the sorted ``deleted`` positions."""
+    # deleted[j] - j (vivos antes da j-ésima lápide) não decresce: a resposta pula as j primeiras lápides
+    skipped = bisect_right(range(len(deleted)), index, key=lambda j: deleted[j] - j)
+    return index + skipped
+
+
+def encode_cursor(seq: int) -> str:
+    """Encode an insertion sequence number as an opaque cursor."""
+    return format(seq, "x")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """Decode a cursor produced by ``encode_cursor``; ``None`` means the start."""
+    if not cursor:
+        return 0
+    try:
+        seq = int(cursor, 16)
+    except ValueError:
+        raise ValueError("Invalid cursor") from None
+    if seq < 0:
+        raise ValueError("Invalid cursor")
+    return seq
+
+
+def build_page(
+    items: list,
+    total: int,
+    page_size: int,
+    page: Optional[int] = None,
+    next_cursor: Optional[str] = None,
+) -> PaginatedResult:
+    """Wrap a slice of records in a ``PaginatedResult``."""
+    return PaginatedResult(
+        items=items,
+        total=total,
+        page=page,
+        page_size=page_size,
+        total_pages=ceil(total / page_size) if page_size else 0,
+        next_cursor=next_cursor,
+    )
@@ -0,0 +1,211 @@
+"""Compact binary snapshots of the in-memory repositories.
+
+Layout: ``MAGIC``, then for every resource its rows (one MessagePack array
+per row, as produced by ``RecordCodec.dump``) followed by a native-endian
+``u64`` table with the offset of each row plus the end of the last one, the
+UTF-8 IDs with their own offset table, and the row positions sorted by ID.
+A MessagePack header with the covered LSN and, per resource, the row count,
+the highest numeric ID issued and the region offsets comes last, followed
+by its own ``u64`` offset and ``MAGIC``. Every offset is absolute, so the
+file can be memory-mapped and any row found by ID (a bisect over the sorted
+positions) and decoded on its own, without reading the rest of the file.
+
+Files are written next to their final path, fsynced and renamed, so a
+crash never leaves a partial snapshot behind.
+"""
+
+import mmap
+from bisect import bisect_left
+import os
+import struct
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+import msgpack
+
+MAGIC = b"RSTSNAP1"
+TRAILER = struct.Struct("<Q8s")
+
+
+@dataclass(frozen=True)
+class EncodedRow:
+    """A row copied as is from an earlier snapshot, without decoding it."""
+
+    id: str
+    data: bytes
+
+
+@dataclass(frozen=True)
+class SnapshotSection:
+    """One resource to write: its stored rows and how to dump them.
+
+    ``rows`` may mix stored rows and ``EncodedRow``s, and is consumed once.
+    """
+
+    rows: Iterable[Any]
+    dump: Callable[[Any], tuple]
+    high_water: int
+
+
+@dataclass(frozen=True)
+class SnapshotResource:
+    count: int
+    high_water: int
+    rows_start: int
+    offsets_start: int
+    # Ausentes em snapshots gravados antes do índice por ID
+    ids_start: Optional[int] = None
+    id_offsets_start: Optional[int] = None
+    sorted_start: Optional[int] = None
+
+
+class SnapshotTable:
+    """Random access by position or ID to the rows of one resource.
+
+    Rows are decoded (and built with ``load``) only when asked for, so
+    opening a table costs the same for ten rows or ten million.
+    """
+
+    def __init__(self, buffer: mmap.mmap, resource: SnapshotResource, load: Callable[[list], Any]) -> None:
+        self._buffer = buffer
+        self._load = load
+        self._count = resource.count
+        self._offsets = _u64_table(buffer, resource.offsets_start, resource.count + 1)
+        self._id_offsets = _u64_table(buffer, resource.id_offsets_start, resource.count + 1)
+        self._sorted = _u64_table(buffer, resource.sorted_start, resource.count)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def row(self, position: int) -> Any:
+        return self._load(msgpack.unpackb(self._buffer[self._offsets[position]:self._offsets[position + 1]]))
+
+    def encoded(self, position: int) -> EncodedRow:
+        return EncodedRow(self.id_at(position), self._buffer[self._offsets[position]:self._offsets[position + 1]])
+
+    def id_at(self, position: int) -> str:
+        return self._raw_id(position).decode()
+
+    def position_of(self, record_id: str) -> Optional[int]:
+        """Position of the row with ``record_id``, or ``None``; O(log n)."""
+        key = record_id.encode()
+        index = bisect_left(self._sorted, key, key=self._raw_id)
+        if index < self._count and self._raw_id(self._sorted[index]) == key:
+            return self._sorted[index]
+        return None
+
+    def _raw_id(self, position: int) -> bytes:
+        return self._buffer[self._id_offsets[position]:self._id_offsets[position + 1]]
+
+
+class Snapshot:
+    """A memory-mapped snapshot; rows are decoded only when iterated."""
+
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        header_offset, magic = TRAILER.unpack_from(self._buffer, len(self._buffer) - TRAILER.size)
+        if self._buffer[:len(MAGIC)] != MAGIC or magic != MAGIC:
+            self._buffer.close()
+            raise ValueError(f"Not a snapshot file: {path}")
+        header = msgpack.unpackb(self._buffer[header_offset:len(self._buffer) - TRAILER.size])
+        self.lsn: int = header["lsn"]
+        self.resources = {name: SnapshotResource(**resource) for name, resource in header["resources"].items()}
+
+    def rows(self, name: str) -> Iterator[list]:
+        """Decode the rows of ``name`` in insertion order."""
+        resource = self.resources[name]
+        view = memoryview(self._buffer)[resource.rows_start:resource.offsets_start]
+        try:
+            unpacker = msgpack.Unpacker(max_buffer_size=len(view) or 1)
+            unpacker.feed(view)
+            yield from unpacker
+        finally:
+            view.release()
+
+    def table(self, name: str, load: Callable[[list], Any]) -> Optional[SnapshotTable]:
+        """Lazy view of ``name``, or ``None`` for files without the ID index."""
+        resource = self.resources[name]
+        if resource.sorted_start is None:
+            return None
+        return SnapshotTable(self._buffer, resource, load)
+
+    def close(self) -> None:
+        self._buffer.close()
+
+
+def write(path: Path, lsn: int, sections: dict[str, SnapshotSection]) -> None:
+    """Write a snapshot covering every log entry before ``lsn``."""
+    temporary = path.with_name(path.name + ".tmp")
+    resources: dict[str, dict[str, int]] = {}
+    packer = msgpack.Packer()
+    with open(temporary, "wb") as file:
+        file.write(MAGIC)
+        position = len(MAGIC)
+        for name, section in sections.items():
+            rows_start = position
+            offsets = array("Q")
+            ids: list[bytes] = []
+            for row in section.rows:
+                offsets.append(position)
+                if isinstance(row, EncodedRow):
+                    data = row.data
+                else:
+                    data = packer.pack(section.dump(row))
+                ids.append(row.id.encode())
+                file.write(data)
+                position += len(data)
+            offsets.append(position)
+            offsets_start = position
+            position += _write_table(file, offsets)
+            ids_start = position
+            id_offsets = array("Q", [ids_start])
+            for record_id in ids:
+                file.write(record_id)
+                position += len(record_id)
+                id_offsets.append(position)
+            id_offsets_start = position
+            position += _write_table(file, id_offsets)
+            sorted_start = position
+            position += _write_table(file, array("Q", sorted(range(len(ids)), key=ids.__getitem__)))
+            resources[name] = {
+                "count": len(ids),
+                "high_water": section.high_water,
+                "rows_start": rows_start,
+                "offsets_start": offsets_start,
+                "ids_start": ids_start,
+                "id_offsets_start": id_offsets_start,
+                "sorted_start": sorted_start,
+            }
+        header = msgpack.packb({"lsn": lsn, "resources": resources})
+        file.write(header)
+        file.write(TRAILER.pack(position, MAGIC))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+    _sync_directory(path.parent)
+
+
+def open_snapshot(path: Path) -> Optional[Snapshot]:
+    return Snapshot(path) if path.exists() else None
+
+
+def _write_table(file, table: array) -> int:
+    file.write(table.tobytes())
+    return len(table) * table.itemsize
+
+
+def _u64_table(buffer: mmap.mmap, start: int, count: int) -> memoryview:
+    return memoryview(buffer)[start:start + count * 8].cast("Q")
+
+
+def _sync_directory(directory: Path) -> None:
+    # Garante que o rename sobreviva a uma queda de energia (POSIX)
+    if os.name != "posix":
+        return
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
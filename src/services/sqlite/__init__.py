@@ -0,0 +1,15 @@
+"""SQLite storage backend implementing the ``I*Service`` protocols."""
+
+from .database import SqliteDatabase
+from .user_service import SqliteUserService
+from .car_service import SqliteCarService
+from .product_service import SqliteProductService
+from .order_service import SqliteOrderService
+
+__all__ = [
+    "SqliteDatabase",
+    "SqliteUserService",
+    "SqliteCarService",
+    "SqliteProductService",
+    "SqliteOrderService",
+]
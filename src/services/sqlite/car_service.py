@@ -0,0 +1,57 @@
+from typing import AsyncIterator, Optional
+from src.models.schemas import Car, CreateCarDto, UpdateCarDto, BulkUpdateCarDto
+from src.services import bulk
+from src.services.repository import DEFAULT_BATCH_SIZE
+from src.services.sqlite.schemas import CARS
+from src.services.sqlite.service import SqliteService
+from src.services.sqlite.table import SqliteTable
+from src.types.types import BulkResult, PaginatedResult
+
+
+class SqliteCarService(SqliteService[Car]):
+    """``ICarService`` implementation backed by the ``cars`` table."""
+
+    schema = CARS
+
+    async def get_all_cars(self) -> list[Car]:
+        return await self._read(lambda table: table.all())
+
+    async def get_cars_page(self, page: int, page_size: int) -> PaginatedResult[Car]:
+        return await self._read(lambda table: table.paginate(page, page_size))
+
+    async def get_cars_after(self, cursor: Optional[str], limit: int) -> PaginatedResult[Car]:
+        return await self._read(lambda table: table.paginate_after(cursor, limit))
+
+    def stream_cars(self, batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[list[Car]]:
+        return self._stream(batch_size=batch_size)
+
+    async def get_car_by_id(self, car_id: str) -> Optional[Car]:
+        return await self._read(lambda table: table.get(car_id))
+
+    async def create_car(self, car_data: CreateCarDto) -> Car:
+        return await self._write(lambda table: table.add(self._build(car_data, table)))
+
+    async def update_car(
+        self,
+        car_id: str,
+        car_data: UpdateCarDto,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Car]:
+        return await self._update(car_id, car_data, expected_version)
+
+    async def delete_car(self, car_id: str, expected_version: Optional[int] = None) -> bool:
+        return await self._delete(car_id, expected_version)
+
+    async def bulk_create_cars(self, cars_data: list[CreateCarDto]) -> BulkResult[Car]:
+        return await self._write(
+            lambda table: bulk.create_all(table, [self._build(car_data, table) for car_data in cars_data])
+        )
+
+    async def bulk_update_cars(self, cars_data: list[BulkUpdateCarDto]) -> BulkResult[Car]:
+        return await self._write(lambda table: bulk.update_all(table, cars_data, self._merge, not_found="Car not found"))
+
+    async def bulk_delete_cars(self, ids: list[str]) -> BulkResult[Car]:
+        return await self._write(lambda table: bulk.delete_all(table, ids, not_found="Car not found"))
+
+    def _build(self, car_data: CreateCarDto, table: SqliteTable[Car]) -> Car:
+        return Car(id=self._next_id(table), **car_data.model_dump())
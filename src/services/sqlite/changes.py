@@ -0,0 +1,81 @@
+"""Change notification between processes sharing one SQLite database.
+
+Every write transaction bumps its table's row in ``table_generations``.
+Each process remembers the last generation it accounted for: its own
+commits advance it, and ``poll`` reports a table whose generation moved
+anyway, meaning another worker wrote it. Those callbacks cannot tell which
+records changed, so listeners receive ``(None, None)``.
+"""
+
+import asyncio
+import contextlib
+import sqlite3
+from typing import AsyncIterator, Callable
+from src.services.sqlite.database import SqliteDatabase
+
+DDL = ("CREATE TABLE IF NOT EXISTS table_generations (name TEXT PRIMARY KEY, generation INTEGER NOT NULL)",)
+DEFAULT_POLL_INTERVAL_SECONDS = 0.1
+
+
+def bump(connection: sqlite3.Connection, table: str) -> int:
+    """Advance ``table``'s generation inside the caller's transaction."""
+    return connection.execute(
+        "INSERT INTO table_generations (name, generation) VALUES (?, 1) "
+        "ON CONFLICT (name) DO UPDATE SET generation = generation + 1 RETURNING generation",
+        (table,),
+    ).fetchone()[0]
+
+
+class ChangeFeed:
+    """Detects writes made by other processes by polling table generations.
+
+    ``committed`` and ``poll`` must run on the event loop, like the
+    listeners they end up calling.
+    """
+
+    def __init__(self, database: SqliteDatabase, poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS) -> None:
+        self.database = database
+        self.poll_interval = poll_interval
+        self._callbacks: dict[str, list[Callable[[], None]]] = {}
+        database.initialize(DDL)
+        self._seen = database.run_sync(self._generations)
+
+    def register(self, table: str, callback: Callable[[], None]) -> None:
+        """Call ``callback()`` whenever another process writes ``table``."""
+        self._callbacks.setdefault(table, []).append(callback)
+
+    def committed(self, table: str, generation: int) -> None:
+        """Account for a local commit that bumped ``table`` to ``generation``."""
+        # Uma lacuna significa que outro processo escreveu antes: fica para o poll
+        if self._seen.get(table, 0) == generation - 1:
+            self._seen[table] = generation
+
+    async def poll(self) -> list[str]:
+        """Notify the tables written by other processes since the last poll."""
+        generations = await self.database.run(self._generations)
+        changed = [table for table, generation in generations.items() if generation != self._seen.get(table, 0)]
+        self._seen = generations
+        for table in changed:
+            for callback in self._callbacks.get(table, ()):
+                callback()
+        return changed
+
+    async def watch(self) -> None:
+        while True:
+            await self.poll()
+            await asyncio.sleep(self.poll_interval)
+
+    @contextlib.asynccontextmanager
+    async def running(self) -> AsyncIterator[None]:
+        """Poll in the background for the lifetime of the block."""
+        task = asyncio.create_task(self.watch())
+        try:
+            yield
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    @staticmethod
+    def _generations(connection: sqlite3.Connection) -> dict[str, int]:
+        return {row["name"]: row["generation"] for row in connection.execute("SELECT name, generation FROM table_generations")}
@@ -0,0 +1,71 @@
+"""SQLite connection pool with WAL mode, used by the SQLite backend."""
+
+import queue
+import sqlite3
+from typing import Callable, Iterable, TypeVar
+import anyio.to_thread
+
+R = TypeVar("R")
+
+DEFAULT_POOL_SIZE = 4
+STATEMENT_CACHE_SIZE = 256
+BUSY_TIMEOUT_MS = 5000
+
+
+class SqliteDatabase:
+    """A fixed-size pool of SQLite connections driven from worker threads.
+
+    Every ``run`` borrows a connection, executes the callable inside a
+    transaction on a thread (so the event loop never blocks on disk I/O) and
+    returns the connection to the pool. Statements are parameterized and
+    reused from each connection's prepared statement cache.
+    """
+
+    def __init__(self, path: str, pool_size: int = DEFAULT_POOL_SIZE) -> None:
+        self.path = path
+        self._pool: queue.Queue[sqlite3.Connection] = queue.Queue()
+        self._connections = [self._connect() for _ in range(pool_size)]
+        for connection in self._connections:
+            self._pool.put(connection)
+        self._limiter = anyio.CapacityLimiter(pool_size)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        connection.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        return connection
+
+    def initialize(self, ddl: Iterable[str]) -> None:
+        """Create tables and indexes that do not exist yet."""
+        self.run_sync(lambda connection: [connection.execute(statement) for statement in ddl], write=True)
+
+    async def run(self, operation: Callable[[sqlite3.Connection], R], write: bool = False) -> R:
+        """Run ``operation`` in a transaction on a pooled connection."""
+        return await anyio.to_thread.run_sync(self.run_sync, operation, write, limiter=self._limiter)
+
+    def run_sync(self, operation: Callable[[sqlite3.Connection], R], write: bool = False) -> R:
+        connection = self._pool.get()
+        try:
+            # BEGIN IMMEDIATE reserva a escrita já no início, evitando deadlocks entre leitura e escrita
+            connection.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+            try:
+                result = operation(connection)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+            return result
+        finally:
+            self._pool.put(connection)
+
+    def close(self) -> None:
+        for connection in self._connections:
+            connection.close()
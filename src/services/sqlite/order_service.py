@@ -0,0 +1,197 @@
+from typing import AsyncIterator, Callable, Optional
+from datetime import datetime, timezone
+from src.models.schemas import Order, CreateOrderDto, UpdateOrderDto, BulkUpdateOrderDto
+from src.models.schemas import OrderItem, Product
+from src.services import bulk, order_placement
+from src.services.repository import DEFAULT_BATCH_SIZE, check_version
+from src.services.sqlite.changes import ChangeFeed
+from src.services.sqlite.database import SqliteDatabase
+from src.services.sqlite.product_service import SqliteProductService
+from src.services.sqlite.schemas import ORDERS, PRODUCTS
+from src.services.sqlite.service import R, SqliteService
+from src.services.sqlite.table import SqliteTable
+from src.types.enums import OrderStatus
+from src.types.types import BulkResult, PaginatedResult
+
+
+def _where(user_id: Optional[str], status: Optional[OrderStatus]) -> tuple[str, list]:
+    clauses: list[str] = []
+    params: list = []
+    if user_id is not None:
+        clauses.append("user_id = ?")
+        params.append(user_id)
+    if status is not None:
+        clauses.append("status = ?")
+        params.append(OrderStatus(status).value)
+    return " AND ".join(clauses), params
+
+
+class SqliteOrderService(SqliteService[Order]):
+    """``IOrderService`` implementation backed by the ``orders`` table."""
+
+    schema = ORDERS
+
+    def __init__(
+        self,
+        database: SqliteDatabase,
+        products: Optional[SqliteProductService] = None,
+        changes: Optional[ChangeFeed] = None,
+    ) -> None:
+        super().__init__(database, changes)
+        # Serviço cujos listeners são avisados das baixas de estoque
+        self.products = products if products is not None else SqliteProductService(database, changes)
+
+    async def get_all_orders(self) -> list[Order]:
+        return await self._read(lambda table: table.all())
+
+    async def get_orders_page(
+        self,
+        page: int,
+        page_size: int,
+        user_id: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+    ) -> PaginatedResult[Order]:
+        where, params = _where(user_id, status)
+        return await self._read(lambda table: table.paginate(page, page_size, where, params))
+
+    async def get_orders_after(
+        self,
+        cursor: Optional[str],
+        limit: int,
+        user_id: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+    ) -> PaginatedResult[Order]:
+        where, params = _where(user_id, status)
+        return await self._read(lambda table: table.paginate_after(cursor, limit, where, params))
+
+    def stream_orders(
+        self,
+        user_id: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> AsyncIterator[list[Order]]:
+        where, params = _where(user_id, status)
+        return self._stream(where, params, batch_size)
+
+    async def get_order_by_id(self, order_id: str) -> Optional[Order]:
+        return await self._read(lambda table: table.get(order_id))
+
+    async def create_order(self, order_data: CreateOrderDto) -> Order:
+        return (await self._place([order_data]))[0]
+
+    async def update_order(
+        self,
+        order_id: str,
+        order_data: UpdateOrderDto,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Order]:
+        def operation(table: SqliteTable[Order], products: SqliteTable[Product]) -> Optional[Order]:
+            order = table.get(order_id)
+            check_version(order_id, expected_version, getattr(order, "version", None))
+            if order is None:
+                return None
+            plan = order_placement.StockPlan(products.get)
+            updated = table.replace(order_id, self._revise(order, order_data, plan), expected_version)
+            self._restock(products, plan.stock)
+            return updated
+
+        return await self._write_with_products(operation)
+
+    async def delete_order(self, order_id: str, expected_version: Optional[int] = None) -> bool:
+        def operation(table: SqliteTable[Order], products: SqliteTable[Product]) -> bool:
+            order = table.get(order_id)
+            check_version(order_id, expected_version, getattr(order, "version", None))
+            if order is None:
+                return False
+            table.remove(order_id)
+            self._restock(products, order_placement.release([order], products.get))
+            return True
+
+        return await self._write_with_products(operation)
+
+    async def bulk_create_orders(self, orders_data: list[CreateOrderDto]) -> BulkResult[Order]:
+        try:
+            placed = await self._place(orders_data)
+        except order_placement.PlacementError as exc:
+            return bulk.rejected(len(orders_data), exc.index, exc.status, str(exc))
+        return bulk.created(placed)
+
+    async def bulk_update_orders(self, orders_data: list[BulkUpdateOrderDto]) -> BulkResult[Order]:
+        def operation(table: SqliteTable[Order], products: SqliteTable[Product]) -> BulkResult[Order]:
+            plan = order_placement.StockPlan(products.get)
+            result = bulk.update_all(
+                table,
+                orders_data,
+                lambda order, order_data: self._revise(order, order_data, plan),
+                not_found="Order not found",
+            )
+            if result.applied:
+                self._restock(products, plan.stock)
+            return result
+
+        return await self._write_with_products(operation)
+
+    async def bulk_delete_orders(self, ids: list[str]) -> BulkResult[Order]:
+        def operation(table: SqliteTable[Order], products: SqliteTable[Product]) -> BulkResult[Order]:
+            removed = [table.get(order_id) for order_id in ids]
+            result = bulk.delete_all(table, ids, not_found="Order not found")
+            if result.applied:
+                self._restock(products, order_placement.release(removed, products.get))
+            return result
+
+        return await self._write_with_products(operation)
+
+    async def _place(self, orders_data: list[CreateOrderDto]) -> list[Order]:
+        """Price the orders, reserve their stock and insert them in one transaction.
+
+        The write transaction (``BEGIN IMMEDIATE``) already excludes other
+        writers; the version checks on the products keep the same contract
+        as the in-memory backend.
+        """
+
+        def operation(table: SqliteTable[Order], products: SqliteTable[Product]) -> list[Order]:
+            reservation = order_placement.reserve(orders_data, products.get)
+            self._restock(products, reservation.stock)
+            return [
+                table.add(self._build(order_data, items, total, table))
+                for order_data, (items, total) in zip(orders_data, reservation.priced)
+            ]
+
+        return await self._write_with_products(operation)
+
+    async def _write_with_products(self, operation: Callable[[SqliteTable[Order], SqliteTable[Product]], R]) -> R:
+        """Run ``operation`` over the orders and products tables in one write transaction."""
+        product_changes: list = []
+        product_generations: list = []
+
+        def run(table: SqliteTable[Order]) -> R:
+            products = SqliteTable(PRODUCTS, table.connection)
+            result = operation(table, products)
+            product_changes.extend(products.changes)
+            product_generations.extend(self.products._bump(products))
+            return result
+
+        result = await self._write(run)
+        self.products._committed(product_generations)
+        self.products._notify(product_changes)
+        return result
+
+    @staticmethod
+    def _revise(order: Order, order_data: UpdateOrderDto, plan: order_placement.StockPlan) -> Order:
+        return order.model_copy(update=order_placement.revise(order, order_data, plan))
+
+    @staticmethod
+    def _restock(products: SqliteTable[Product], stock: dict[str, tuple[Optional[int], int]]) -> None:
+        for product_id, (version, level) in stock.items():
+            product = products.get(product_id)
+            products.replace(product_id, product.model_copy(update={"stock": level}), version)
+
+    def _build(self, order_data: CreateOrderDto, items: list[OrderItem], total: float, table: SqliteTable[Order]) -> Order:
+        return Order(
+            id=self._next_id(table),
+            userId=order_data.userId,
+            items=items,
+            total=total,
+            status=order_data.status if order_data.status is not None else OrderStatus.PENDING,
+            createdAt=datetime.now(timezone.utc).isoformat(),
+        )
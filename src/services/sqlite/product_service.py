@@ -0,0 +1,109 @@
+from typing import AsyncIterator, Optional
+from src.models.schemas import Product, CreateProductDto, UpdateProductDto, BulkUpdateProductDto, ProductFilters
+from src.services import bulk
+from src.services.repository import DEFAULT_BATCH_SIZE
+from src.services.sqlite.schemas import PRODUCTS
+from src.services.sqlite.service import SqliteService
+from src.services.sqlite.table import SqliteTable
+from src.types.types import BulkResult, PaginatedResult
+
+ORDER_BY = {None: "seq", "price": "price, seq", "-price": "price DESC, seq DESC"}
+
+
+def _where(filters: Optional[ProductFilters]) -> tuple[str, list]:
+    if filters is None:
+        return "", []
+    clauses: list[str] = []
+    params: list = []
+    if filters.category is not None:
+        clauses.append("category = ?")
+        params.append(filters.category.value)
+    if filters.minPrice is not None:
+        clauses.append("price >= ?")
+        params.append(filters.minPrice)
+    if filters.maxPrice is not None:
+        clauses.append("price <= ?")
+        params.append(filters.maxPrice)
+    if filters.inStock is not None:
+        clauses.append("stock > 0" if filters.inStock else "stock <= 0")
+    return " AND ".join(clauses), params
+
+
+class SqliteProductService(SqliteService[Product]):
+    """``IProductService`` implementation backed by the ``products`` table."""
+
+    schema = PRODUCTS
+
+    async def get_all_products(self) -> list[Product]:
+        return await self._read(lambda table: table.all())
+
+    async def get_products_page(
+        self,
+        page: int,
+        page_size: int,
+        filters: Optional[ProductFilters] = None,
+    ) -> PaginatedResult[Product]:
+        where, params = _where(filters)
+        order_by = ORDER_BY[filters.sort if filters else None]
+        return await self._read(lambda table: table.paginate(page, page_size, where, params, order_by))
+
+    async def get_products_after(
+        self,
+        cursor: Optional[str],
+        limit: int,
+        filters: Optional[ProductFilters] = None,
+    ) -> PaginatedResult[Product]:
+        if filters is not None and filters.sort is not None:
+            raise ValueError("Cursor pagination does not support sort; use page/page_size")
+        where, params = _where(filters)
+        return await self._read(lambda table: table.paginate_after(cursor, limit, where, params))
+
+    async def stream_products(
+        self,
+        filters: Optional[ProductFilters] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> AsyncIterator[list[Product]]:
+        where, params = _where(filters)
+        if filters is None or filters.sort is None:
+            async for batch in self._stream(where, params, batch_size):
+                yield batch
+            return
+        # Ordenação por preço: pagina por offset, pois o cursor segue a ordem de inserção
+        page = 1
+        while True:
+            result = await self.get_products_page(page, batch_size, filters)
+            if not result.items:
+                return
+            yield result.items
+            page += 1
+
+    async def get_product_by_id(self, product_id: str) -> Optional[Product]:
+        return await self._read(lambda table: table.get(product_id))
+
+    async def create_product(self, product_data: CreateProductDto) -> Product:
+        return await self._write(lambda table: table.add(self._build(product_data, table)))
+
+    async def update_product(
+        self,
+        product_id: str,
+        product_data: UpdateProductDto,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Product]:
+        return await self._update(product_id, product_data, expected_version)
+
+    async def delete_product(self, product_id: str, expected_version: Optional[int] = None) -> bool:
+        return await self._delete(product_id, expected_version)
+
+    async def bulk_create_products(self, products_data: list[CreateProductDto]) -> BulkResult[Product]:
+        return await self._write(
+            lambda table: bulk.create_all(table, [self._build(product_data, table) for product_data in products_data])
+        )
+
+    async def bulk_update_products(self, products_data: list[BulkUpdateProductDto]) -> BulkResult[Product]:
+        return await self._write(lambda table: bulk.update_all(table, products_data, self._merge, not_found="Product not found"))
+
+    async def bulk_delete_products(self, ids: list[str]) -> BulkResult[Product]:
+        return await self._write(lambda table: bulk.delete_all(table, ids, not_found="Product not found"))
+
+    def _build(self, product_data: CreateProductDto, table: SqliteTable[Product]) -> Product:
+        return Product(id=self._next_id(table), **product_data.model_dump())
@@ -0,0 +1,115 @@
+"""Table definitions for the SQLite backend."""
+
+import sqlite3
+from pydantic import TypeAdapter
+from src.models.schemas import User, Car, Product, Order, OrderItem
+from src.services.sqlite.table import TableSchema
+from src.types.enums import CarColor, OrderStatus, ProductCategory
+
+order_items_adapter = TypeAdapter(list[OrderItem])
+
+
+def _user_from_row(row: sqlite3.Row) -> User:
+    return User.model_construct(id=row["id"], name=row["name"], email=row["email"], age=row["age"])
+
+
+def _car_from_row(row: sqlite3.Row) -> Car:
+    return Car.model_construct(
+        id=row["id"],
+        brand=row["brand"],
+        model=row["model"],
+        year=row["year"],
+        color=CarColor(row["color"]),
+        price=row["price"],
+    )
+
+
+def _product_from_row(row: sqlite3.Row) -> Product:
+    return Product.model_construct(
+        id=row["id"],
+        name=row["name"],
+        description=row["description"],
+        price=row["price"],
+        stock=row["stock"],
+        category=ProductCategory(row["category"]),
+    )
+
+
+def _order_from_row(row: sqlite3.Row) -> Order:
+    return Order.model_construct(
+        id=row["id"],
+        userId=row["user_id"],
+        items=order_items_adapter.validate_json(row["items"]),
+        total=row["total"],
+        status=OrderStatus(row["status"]),
+        createdAt=row["created_at"],
+    )
+
+
+USERS: TableSchema[User] = TableSchema(
+    table="users",
+    columns=("name", "email", "age"),
+    ddl=(
+        "CREATE TABLE IF NOT EXISTS users ("
+        "seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, "
+        "name TEXT NOT NULL, email TEXT NOT NULL, age INTEGER NOT NULL)",
+    ),
+    to_row=lambda user: (user.name, user.email, user.age),
+    from_row=_user_from_row,
+)
+
+CARS: TableSchema[Car] = TableSchema(
+    table="cars",
+    columns=("brand", "model", "year", "color", "price"),
+    ddl=(
+        "CREATE TABLE IF NOT EXISTS cars ("
+        "seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, "
+        "brand TEXT NOT NULL, model TEXT NOT NULL, year INTEGER NOT NULL, "
+        "color TEXT NOT NULL, price REAL NOT NULL)",
+    ),
+    to_row=lambda car: (car.brand, car.model, car.year, CarColor(car.color).value, car.price),
+    from_row=_car_from_row,
+)
+
+PRODUCTS: TableSchema[Product] = TableSchema(
+    table="products",
+    columns=("name", "description", "price", "stock", "category"),
+    ddl=(
+        "CREATE TABLE IF NOT EXISTS products ("
+        "seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, "
+        "name TEXT NOT NULL, description TEXT NOT NULL, price REAL NOT NULL, "
+        "stock INTEGER NOT NULL, category TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_products_category_price ON products (category, price)",
+        "CREATE INDEX IF NOT EXISTS idx_products_price ON products (price)",
+    ),
+    to_row=lambda product: (
+        product.name,
+        product.description,
+        product.price,
+        product.stock,
+        ProductCategory(product.category).value,
+    ),
+    from_row=_product_from_row,
+)
+
+# userId não tem REFERENCES: a API aceita pedidos de usuários ainda não cadastrados
+ORDERS: TableSchema[Order] = TableSchema(
+    table="orders",
+    columns=("user_id", "items", "total", "status", "created_at"),
+    ddl=(
+        "CREATE TABLE IF NOT EXISTS orders ("
+        "seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, "
+        "user_id TEXT NOT NULL, items TEXT NOT NULL, total REAL NOT NULL, "
+        "status TEXT NOT NULL, created_at TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_user_id ON orders (user_id, seq)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_status ON orders (status, seq)",
+    ),
+    to_row=lambda order: (
+        order.userId,
+        order_items_adapter.dump_json(order.items).decode(),
+        order.total,
+        OrderStatus(order.status).value,
+        order.createdAt,
+    ),
+    from_row=_order_from_row,
+)
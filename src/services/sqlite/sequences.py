@@ -0,0 +1,31 @@
+"""Sequential IDs shared by every process that opens the same database.
+
+IDs are taken from the ``sequences`` table inside the transaction that
+inserts the record, so workers never issue the same ID, and a rolled back
+insert gives its ID back instead of leaving a gap.
+"""
+
+import sqlite3
+from src.services.sqlite.database import SqliteDatabase
+
+DDL = ("CREATE TABLE IF NOT EXISTS sequences (name TEXT PRIMARY KEY, last INTEGER NOT NULL)",)
+
+
+def initialize(database: SqliteDatabase, name: str, start: int = 0) -> None:
+    """Create the ``name`` sequence; it never goes back below ``start``."""
+    database.initialize(DDL)
+    # Bancos anteriores à tabela sequences continuam após o maior ID existente
+    database.run_sync(
+        lambda connection: connection.execute(
+            "INSERT INTO sequences (name, last) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET last = MAX(last, excluded.last)",
+            (name, start),
+        ),
+        write=True,
+    )
+
+
+def next_id(connection: sqlite3.Connection, name: str) -> str:
+    """Advance the ``name`` sequence inside the caller's write transaction."""
+    row = connection.execute("UPDATE sequences SET last = last + 1 WHERE name = ? RETURNING last", (name,)).fetchone()
+    return str(row[0])
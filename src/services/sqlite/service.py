@@ -0,0 +1,119 @@
+"""Shared plumbing for the SQLite-backed services."""
+
+import sqlite3
+from typing import AsyncIterator, Callable, Generic, Optional, Sequence, TypeVar
+from pydantic import BaseModel
+from src.services import id_allocator
+from src.services.records import field_changes
+from src.services.repository import DEFAULT_BATCH_SIZE, ChangeListener, check_version
+from src.services.sqlite import changes as change_feed
+from src.services.sqlite.database import SqliteDatabase
+from src.services.sqlite import sequences, workers
+from src.services.sqlite.table import SqliteTable, TableSchema
+
+T = TypeVar("T", bound=BaseModel)
+R = TypeVar("R")
+
+
+class SqliteService(Generic[T]):
+    """Base class binding a ``TableSchema`` to a database.
+
+    Subclasses expose the ``I*Service`` protocol methods on top of these
+    helpers; every helper runs as one transaction on a pooled connection.
+    """
+
+    schema: TableSchema[T]
+
+    def __init__(self, database: SqliteDatabase, changes: Optional[change_feed.ChangeFeed] = None) -> None:
+        self.database = database
+        self.changes = changes
+        database.initialize(self.schema.ddl)
+        database.run_sync(lambda connection: SqliteTable(self.schema, connection).ensure_version_column(), write=True)
+        last_id = database.run_sync(lambda connection: SqliteTable(self.schema, connection).max_numeric_id())
+        # IDs sequenciais vêm do banco, para que vários workers não os repitam
+        self.ids: Optional[id_allocator.IdAllocator] = None
+        if id_allocator.id_strategy() == "sequential":
+            sequences.initialize(database, self.schema.table, start=last_id)
+        else:
+            self.ids = id_allocator.create_id_allocator(allocate_worker_id=lambda: workers.lease(database).worker_id)
+        self._listeners: list[ChangeListener] = []
+        if changes is not None:
+            changes.register(self.schema.table, lambda: self._notify([(None, None)]))
+
+    def subscribe(self, listener: ChangeListener) -> None:
+        """Call ``listener(old, new)`` for every committed write."""
+        self._listeners.append(listener)
+
+    async def _read(self, operation: Callable[[SqliteTable[T]], R]) -> R:
+        return await self.database.run(lambda connection: operation(SqliteTable(self.schema, connection)))
+
+    async def _write(self, operation: Callable[[SqliteTable[T]], R]) -> R:
+        changes: list = []
+        generations: list[tuple[str, int]] = []
+
+        def run(connection: sqlite3.Connection) -> R:
+            table = SqliteTable(self.schema, connection)
+            result = operation(table)
+            changes.extend(table.changes)
+            generations.extend(self._bump(table))
+            return result
+
+        result = await self.database.run(run, write=True)
+        self._committed(generations)
+        self._notify(changes)
+        return result
+
+    def _next_id(self, table: SqliteTable[T]) -> str:
+        """Allocate an ID inside the write transaction that inserts the record."""
+        if self.ids is not None:
+            lease = workers.current(self.database)
+            if lease is not None:
+                lease.check()
+            return self.ids.next_id()
+        return sequences.next_id(table.connection, self.schema.table)
+
+    def _bump(self, table: SqliteTable) -> list[tuple[str, int]]:
+        """Advance the table's shared generation if ``table`` was written."""
+        if self.changes is None or not table.changes:
+            return []
+        return [(table.schema.table, change_feed.bump(table.connection, table.schema.table))]
+
+    def _committed(self, generations: Sequence[tuple[str, int]]) -> None:
+        for name, generation in generations:
+            self.changes.committed(name, generation)
+
+    def _notify(self, changes: Sequence[tuple[Optional[T], Optional[T]]]) -> None:
+        for old, new in changes:
+            for listener in self._listeners:
+                listener(old, new)
+
+    @staticmethod
+    def _merge(existing: T, update_data: BaseModel) -> T:
+        return existing.model_copy(update=field_changes(type(existing), update_data))
+
+    async def _update(self, record_id: str, update_data: BaseModel, expected_version: Optional[int] = None) -> Optional[T]:
+        def operation(table: SqliteTable[T]) -> Optional[T]:
+            existing = table.get(record_id)
+            # A pré-condição vale antes da existência: If-Match sem registro é 412
+            check_version(record_id, expected_version, getattr(existing, "version", None))
+            if existing is None:
+                return None
+            return table.replace(record_id, self._merge(existing, update_data), expected_version)
+
+        return await self._write(operation)
+
+    async def _delete(self, record_id: str, expected_version: Optional[int] = None) -> bool:
+        return await self._write(lambda table: table.remove(record_id, expected_version) is not None)
+
+    async def _stream(
+        self,
+        where: str = "",
+        params: Sequence = (),
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> AsyncIterator[list[T]]:
+        after_seq = 0
+        while True:
+            batch, after_seq = await self._read(lambda table: table.batch_after(after_seq, batch_size, where, params))
+            if not batch:
+                return
+            yield batch
@@ -0,0 +1,163 @@
+"""Table mapping and a synchronous, Repository-like view of one SQLite table."""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable, Generic, Iterator, Optional, Sequence, TypeVar
+from src.services.repository import build_page, check_version, decode_cursor, encode_cursor
+from src.types.types import PaginatedResult
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class TableSchema(Generic[T]):
+    """How a model maps onto a table.
+
+    Every table has an ``seq INTEGER PRIMARY KEY`` (insertion order, used for
+    keyset cursors), a unique ``id`` and a ``version`` bumped on every
+    update; ``columns`` lists the remaining columns in the order produced
+    by ``to_row``.
+    """
+
+    table: str
+    columns: tuple[str, ...]
+    ddl: tuple[str, ...]
+    to_row: Callable[[T], tuple]
+    from_row: Callable[[sqlite3.Row], T]
+
+    @property
+    def select(self) -> str:
+        return f"SELECT seq, id, version, {', '.join(self.columns)} FROM {self.table}"
+
+
+class SqliteTable(Generic[T]):
+    """Exposes ``get``/``add``/``replace``/``remove`` over one connection.
+
+    It mirrors ``Repository`` closely enough for the ``bulk`` helpers, and
+    runs inside the caller's transaction.
+    """
+
+    def __init__(self, schema: TableSchema[T], connection: sqlite3.Connection) -> None:
+        self.schema = schema
+        self.connection = connection
+        # (antigo, novo) de cada escrita, notificados após o commit
+        self.changes: list[tuple[Optional[T], Optional[T]]] = []
+
+    def __contains__(self, record_id: object) -> bool:
+        row = self.connection.execute(f"SELECT 1 FROM {self.schema.table} WHERE id = ?", (record_id,)).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def count(self, where: str = "", params: Sequence = ()) -> int:
+        sql = f"SELECT COUNT(*) FROM {self.schema.table}"
+        if where:
+            sql += f" WHERE {where}"
+        return self.connection.execute(sql, params).fetchone()[0]
+
+    def ensure_version_column(self) -> None:
+        """Add the ``version`` column to tables created before it existed."""
+        columns = {row["name"] for row in self.connection.execute(f"PRAGMA table_info({self.schema.table})")}
+        if "version" not in columns:
+            self.connection.execute(f"ALTER TABLE {self.schema.table} ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+
+    def get(self, record_id: str) -> Optional[T]:
+        row = self.connection.execute(f"{self.schema.select} WHERE id = ?", (record_id,)).fetchone()
+        return self._from_row(row) if row is not None else None
+
+    def add(self, record: T) -> T:
+        placeholders = ", ".join("?" for _ in range(len(self.schema.columns) + 1))
+        self.connection.execute(
+            f"INSERT INTO {self.schema.table} (id, {', '.join(self.schema.columns)}) VALUES ({placeholders})",
+            (record.id, *self.schema.to_row(record)),
+        )
+        record._version = 1
+        self.changes.append((None, record))
+        return record
+
+    def replace(self, record_id: str, record: T, expected_version: Optional[int] = None) -> Optional[T]:
+        """Overwrite a row and bump its version (compare-and-swap with ``expected_version``)."""
+        previous = self.get(record_id)
+        check_version(record_id, expected_version, getattr(previous, "version", None))
+        if previous is None:
+            return None
+        assignments = ", ".join(f"{column} = ?" for column in self.schema.columns)
+        self.connection.execute(
+            f"UPDATE {self.schema.table} SET {assignments}, version = version + 1 WHERE id = ?",
+            (*self.schema.to_row(record), record_id),
+        )
+        record._version = previous.version + 1
+        self.changes.append((previous, record))
+        return record
+
+    def remove(self, record_id: str, expected_version: Optional[int] = None) -> Optional[T]:
+        record = self.get(record_id)
+        check_version(record_id, expected_version, getattr(record, "version", None))
+        if record is not None:
+            self.connection.execute(f"DELETE FROM {self.schema.table} WHERE id = ?", (record_id,))
+            self.changes.append((record, None))
+        return record
+
+    def all(self, where: str = "", params: Sequence = (), order_by: str = "seq") -> list[T]:
+        return list(self._query(where, params, order_by))
+
+    def max_numeric_id(self) -> int:
+        row = self.connection.execute(
+            f"SELECT MAX(CAST(id AS INTEGER)) FROM {self.schema.table} WHERE id GLOB '[0-9]*'"
+        ).fetchone()
+        return row[0] or 0
+
+    def paginate(
+        self,
+        page: int,
+        page_size: int,
+        where: str = "",
+        params: Sequence = (),
+        order_by: str = "seq",
+    ) -> PaginatedResult:
+        items = list(self._query(where, params, order_by, limit=page_size, offset=(page - 1) * page_size))
+        return build_page(items, self.count(where, params), page_size, page=page)
+
+    def paginate_after(self, cursor: Optional[str], limit: int, where: str = "", params: Sequence = ()) -> PaginatedResult:
+        after_seq = decode_cursor(cursor)
+        keyset = "seq > ?" + (f" AND ({where})" if where else "")
+        rows = self.connection.execute(
+            f"{self.schema.select} WHERE {keyset} ORDER BY seq LIMIT ?",
+            (after_seq, *params, limit + 1),
+        ).fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["seq"]) if has_more else None
+        items = [self._from_row(row) for row in rows]
+        return build_page(items, self.count(where, params), limit, next_cursor=next_cursor)
+
+    def batch_after(self, after_seq: int, batch_size: int, where: str = "", params: Sequence = ()) -> tuple[list[T], int]:
+        """Return the next batch in insertion order and the last ``seq`` it covers."""
+        keyset = "seq > ?" + (f" AND ({where})" if where else "")
+        rows = self.connection.execute(
+            f"{self.schema.select} WHERE {keyset} ORDER BY seq LIMIT ?",
+            (after_seq, *params, batch_size),
+        ).fetchall()
+        last_seq = rows[-1]["seq"] if rows else after_seq
+        return [self._from_row(row) for row in rows], last_seq
+
+    def _query(
+        self,
+        where: str,
+        params: Sequence,
+        order_by: str,
+        limit: int = -1,
+        offset: int = 0,
+    ) -> Iterator[T]:
+        sql = self.schema.select
+        if where:
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {order_by} LIMIT ? OFFSET ?"
+        for row in self.connection.execute(sql, (*params, limit, offset)):
+            yield self._from_row(row)
+
+    def _from_row(self, row: sqlite3.Row) -> T:
+        record = self.schema.from_row(row)
+        record._version = row["version"]
+        return record
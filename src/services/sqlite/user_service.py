@@ -0,0 +1,57 @@
+from typing import AsyncIterator, Optional
+from src.models.schemas import User, CreateUserDto, UpdateUserDto, BulkUpdateUserDto
+from src.services import bulk
+from src.services.repository import DEFAULT_BATCH_SIZE
+from src.services.sqlite.schemas import USERS
+from src.services.sqlite.service import SqliteService
+from src.services.sqlite.table import SqliteTable
+from src.types.types import BulkResult, PaginatedResult
+
+
+class SqliteUserService(SqliteService[User]):
+    """``IUserService`` implementation backed by the ``users`` table."""
+
+    schema = USERS
+
+    async def get_all_users(self) -> list[User]:
+        return await self._read(lambda table: table.all())
+
+    async def get_users_page(self, page: int, page_size: int) -> PaginatedResult[User]:
+        return await self._read(lambda table: table.paginate(page, page_size))
+
+    async def get_users_after(self, cursor: Optional[str], limit: int) -> PaginatedResult[User]:
+        return await self._read(lambda table: table.paginate_after(cursor, limit))
+
+    def stream_users(self, batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[list[User]]:
+        return self._stream(batch_size=batch_size)
+
+    async def get_user_by_id(self, user_id: str) -> Optional[User]:
+        return await self._read(lambda table: table.get(user_id))
+
+    async def create_user(self, user_data: CreateUserDto) -> User:
+        return await self._write(lambda table: table.add(self._build(user_data, table)))
+
+    async def update_user(
+        self,
+        user_id: str,
+        user_data: UpdateUserDto,
+        expected_version: Optional[int] = None,
+    ) -> Optional[User]:
+        return await self._update(user_id, user_data, expected_version)
+
+    async def delete_user(self, user_id: str, expected_version: Optional[int] = None) -> bool:
+        return await self._delete(user_id, expected_version)
+
+    async def bulk_create_users(self, users_data: list[CreateUserDto]) -> BulkResult[User]:
+        return await self._write(
+            lambda table: bulk.create_all(table, [self._build(user_data, table) for user_data in users_data])
+        )
+
+    async def bulk_update_users(self, users_data: list[BulkUpdateUserDto]) -> BulkResult[User]:
+        return await self._write(lambda table: bulk.update_all(table, users_data, self._merge, not_found="User not found"))
+
+    async def bulk_delete_users(self, ids: list[str]) -> BulkResult[User]:
+        return await self._write(lambda table: bulk.delete_all(table, ids, not_found="User not found"))
+
+    def _build(self, user_data: CreateUserDto, table: SqliteTable[User]) -> User:
+        return User(id=self._next_id(table), **user_data.model_dump())
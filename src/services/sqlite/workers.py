@@ -0,0 +1,120 @@
+"""Snowflake worker IDs leased from the database shared by every process.
+
+Each process takes the lowest worker ID whose lease is free or expired and
+renews it in the background. The ID of a process that died becomes
+reusable only once its lease expires, so two live processes never share
+one; when all ``MAX_WORKER_ID + 1`` IDs are leased, the process refuses to
+start. A process that could not renew in time stops issuing IDs.
+"""
+
+import asyncio
+import contextlib
+import sqlite3
+import time
+import uuid
+import weakref
+from typing import AsyncIterator, Optional
+from src.services.id_allocator import MAX_WORKER_ID
+from src.services.sqlite.database import SqliteDatabase
+
+DDL = (
+    "CREATE TABLE IF NOT EXISTS worker_leases ("
+    "worker_id INTEGER PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)",
+)
+DEFAULT_LEASE_SECONDS = 30.0
+
+
+class WorkerIdsExhaustedError(RuntimeError):
+    """Every worker ID is leased by a live process."""
+
+
+class LeaseLostError(RuntimeError):
+    """The lease expired before it was renewed; its worker ID may be reused."""
+
+
+class WorkerLease:
+    """A worker ID held by this process until ``expires_at``."""
+
+    def __init__(self, database: SqliteDatabase, ttl: float = DEFAULT_LEASE_SECONDS) -> None:
+        self.database = database
+        self.ttl = ttl
+        self.owner = uuid.uuid4().hex
+        database.initialize(DDL)
+        self.worker_id, self.expires_at = database.run_sync(self._acquire, write=True)
+
+    def _acquire(self, connection: sqlite3.Connection) -> tuple[int, float]:
+        now = time.time()
+        leased = {row[0] for row in connection.execute("SELECT worker_id FROM worker_leases WHERE expires_at > ?", (now,))}
+        worker_id = next((i for i in range(MAX_WORKER_ID + 1) if i not in leased), None)
+        if worker_id is None:
+            raise WorkerIdsExhaustedError(f"All {MAX_WORKER_ID + 1} snowflake worker IDs are leased")
+        # O prazo local é calculado antes do commit, então nunca passa do prazo gravado
+        expires_at = now + self.ttl
+        connection.execute(
+            "INSERT INTO worker_leases (worker_id, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (worker_id) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at",
+            (worker_id, self.owner, expires_at),
+        )
+        return worker_id, expires_at
+
+    def _renew(self, connection: sqlite3.Connection) -> float:
+        expires_at = time.time() + self.ttl
+        renewed = connection.execute(
+            "UPDATE worker_leases SET expires_at = ? WHERE worker_id = ? AND owner = ?",
+            (expires_at, self.worker_id, self.owner),
+        ).rowcount
+        if not renewed:
+            raise LeaseLostError(f"Snowflake worker ID {self.worker_id} was taken over")
+        return expires_at
+
+    def check(self) -> None:
+        """Raise ``LeaseLostError`` once the lease may have been taken over."""
+        if time.time() >= self.expires_at:
+            raise LeaseLostError(f"Lease of snowflake worker ID {self.worker_id} expired")
+
+    async def renew(self) -> None:
+        self.check()
+        self.expires_at = await self.database.run(self._renew, write=True)
+
+    def release(self) -> None:
+        self.database.run_sync(
+            lambda connection: connection.execute(
+                "DELETE FROM worker_leases WHERE worker_id = ? AND owner = ?", (self.worker_id, self.owner)
+            ),
+            write=True,
+        )
+
+    async def heartbeat(self) -> None:
+        # Um lease perdido não é renovado de novo: check() passa a recusar novos IDs
+        with contextlib.suppress(LeaseLostError):
+            while True:
+                await asyncio.sleep(self.ttl / 3)
+                await self.renew()
+
+    @contextlib.asynccontextmanager
+    async def running(self) -> AsyncIterator[None]:
+        """Renew the lease in the background for the lifetime of the block, then release it."""
+        task = asyncio.create_task(self.heartbeat())
+        try:
+            yield
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            self.release()
+
+
+# Um lease por processo e banco, compartilhado pelas tabelas
+_leases: "weakref.WeakKeyDictionary[SqliteDatabase, WorkerLease]" = weakref.WeakKeyDictionary()
+
+
+def lease(database: SqliteDatabase) -> WorkerLease:
+    """This process's worker lease on ``database``, taken on first use."""
+    if database not in _leases:
+        _leases[database] = WorkerLease(database)
+    return _leases[database]
+
+
+def current(database: SqliteDatabase) -> Optional[WorkerLease]:
+    """The lease taken by ``lease``, or ``None`` when worker IDs are configured."""
+    return _leases.get(database)
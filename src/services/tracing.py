@@ -0,0 +1,275 @@
+"""Lightweight request tracing with OTLP-compatible JSON export.
+
+A request picked by head sampling (``TRACE_SAMPLE_RATE``) gets a root span
+from ``routes.tracing.TracingMiddleware``; the current span lives in a
+``ContextVar``. Route endpoints, controller functions and service calls are
+wrapped by ``traced``, which opens a child span only when there is a current
+span, so requests that were not sampled pay one ``ContextVar.get`` per layer.
+``NegotiatedRoute`` adds ``validate`` and ``encode`` spans around the
+endpoint, for request parsing and response serialization.
+
+With ``TRACING_ENABLED=0`` nothing is wrapped at all. Otherwise the
+sample rate can be changed at runtime through ``/admin/tracing``, and a
+trace keeps at most ``TRACE_MAX_SPANS`` spans (the rest are counted in the
+root span's ``trace.dropped_spans`` attribute).
+
+Finished traces are kept in a ring buffer of ``TRACE_BUFFER_SIZE`` traces
+and, with ``TRACE_FILE`` set, appended to that file as OTLP
+``ExportTraceServiceRequest`` JSON documents, one per line. The export runs
+on a background thread: ``end_trace`` only queues the trace, and the writer
+serializes whatever has queued up since its last write as one document.
+Traces finished while ``TRACE_BUFFER_SIZE`` of them are still waiting are
+not written (they are counted in ``Tracer.dropped_exports``).
+"""
+
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+from types import ModuleType
+from typing import IO, Any, Callable, Optional
+import orjson
+from src.services.instrumentation import CoroutineProxy, wrap_module
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "1") != "0"
+
+SERVICE_NAME = "restful-api"
+DEFAULT_BUFFER_SIZE = 1000
+DEFAULT_MAX_SPANS_PER_TRACE = 256
+EXPORT_BATCH_SIZE = 64
+
+# Valores de SpanKind e StatusCode do OTLP
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_CODE_UNSET = 0
+STATUS_CODE_ERROR = 2
+
+
+class Trace:
+    __slots__ = ("trace_id", "spans", "phase", "dropped_spans")
+
+    def __init__(self) -> None:
+        self.trace_id = f"{random.getrandbits(128):032x}"
+        self.spans: list[Span] = []
+        # Span de fase aberto (validate/encode), fechado por ``end_phase``
+        self.phase: Optional[Span] = None
+        self.dropped_spans = 0
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "start", "end", "attributes", "error")
+
+    def __init__(self, trace: Trace, name: str, parent_id: str = "", kind: int = SPAN_KIND_INTERNAL) -> None:
+        self.trace = trace
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start = time.time_ns()
+        self.end = 0
+        self.attributes: Optional[dict[str, Any]] = None
+        self.error: Optional[str] = None
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """Samples requests, records their spans and exports finished traces."""
+
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        max_spans_per_trace: int = DEFAULT_MAX_SPANS_PER_TRACE,
+        path: Optional[str] = None,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.max_spans_per_trace = max_spans_per_trace
+        self.traces: deque[Trace] = deque(maxlen=buffer_size)
+        self.path = path
+        self.dropped_exports = 0
+        self._file: Optional[IO[bytes]] = None
+        self._writer: Optional[threading.Thread] = None
+        # Traces a exportar; None pede ao writer que termine
+        self._pending: queue.Queue[Optional[Trace]] = queue.Queue(maxsize=buffer_size)
+        if path:
+            self._file = open(path, "ab")
+            self._writer = threading.Thread(target=self._write_forever, name="trace-export", daemon=True)
+            self._writer.start()
+
+    def start_trace(self, name: str) -> Optional[Span]:
+        """Root span of a new trace, or ``None`` when the request is not sampled."""
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return None
+        trace = Trace()
+        root = Span(trace, name, kind=SPAN_KIND_SERVER)
+        trace.spans.append(root)
+        return root
+
+    def start_span(self, name: str) -> Optional[Span]:
+        """Child of the current span, or ``None`` outside a sampled request."""
+        parent = current_span.get()
+        if parent is None:
+            return None
+        trace = parent.trace
+        if len(trace.spans) >= self.max_spans_per_trace:
+            trace.dropped_spans += 1
+            return None
+        span = Span(trace, name, parent.span_id)
+        trace.spans.append(span)
+        return span
+
+    def end_trace(self, root: Span) -> None:
+        root.end = time.time_ns()
+        trace = root.trace
+        if trace.dropped_spans:
+            root.attributes = {**(root.attributes or {}), "trace.dropped_spans": trace.dropped_spans}
+        self.traces.append(trace)
+        if self._writer is not None:
+            try:
+                self._pending.put_nowait(trace)
+            except queue.Full:
+                self.dropped_exports += 1
+
+    def clear(self) -> None:
+        self.traces.clear()
+
+    def close(self) -> None:
+        """Write the traces still queued and close the file."""
+        if self._writer is not None:
+            if self._writer.is_alive():
+                self._pending.put(None)
+                self._writer.join()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write_forever(self) -> None:
+        assert self._file is not None
+        while True:
+            batch = [self._pending.get()]
+            while len(batch) < EXPORT_BATCH_SIZE and batch[-1] is not None:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            traces = [trace for trace in batch if trace is not None]
+            if traces:
+                self._file.write(orjson.dumps(export(traces)) + b"\n")
+                self._file.flush()
+            if batch[-1] is None:
+                return
+
+
+tracer = Tracer(
+    sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", 0)),
+    buffer_size=int(os.getenv("TRACE_BUFFER_SIZE", DEFAULT_BUFFER_SIZE)),
+    max_spans_per_trace=int(os.getenv("TRACE_MAX_SPANS", DEFAULT_MAX_SPANS_PER_TRACE)),
+    path=os.getenv("TRACE_FILE") or None,
+)
+
+
+def traced(name: str, function: Callable) -> Callable:
+    """Wrap a coroutine function in a span named ``name``."""
+
+    @wraps(function)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        span = tracer.start_span(name)
+        if span is None:
+            return await function(*args, **kwargs)
+        token = current_span.set(span)
+        try:
+            return await function(*args, **kwargs)
+        except Exception as exc:
+            span.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            span.end = time.time_ns()
+            current_span.reset(token)
+
+    return wrapper
+
+
+def instrument(name: str, service: Any) -> Any:
+    """Trace every coroutine of a service module or object as ``name.<function>``."""
+    return CoroutineProxy(service, lambda attribute, function: traced(f"{name}.{attribute}", function))
+
+
+def instrument_module(module: ModuleType) -> None:
+    """Trace the coroutines of ``module`` (a controller) in place, as ``<module>.<function>``."""
+    prefix = module.__name__.rsplit(".", 1)[-1]
+    wrap_module(module, lambda attribute, function: traced(f"{prefix}.{attribute}", function))
+
+
+def start_phase(name: str) -> None:
+    span = tracer.start_span(name)
+    if span is not None:
+        span.trace.phase = span
+
+
+def end_phase() -> None:
+    parent = current_span.get()
+    if parent is not None and parent.trace.phase is not None:
+        parent.trace.phase.end = time.time_ns()
+        parent.trace.phase = None
+
+
+def traced_endpoint(name: str, endpoint: Callable) -> Callable:
+    """Trace a route endpoint, closing ``validate`` before it and opening ``encode`` after."""
+    endpoint = traced(name, endpoint)
+
+    @wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        end_phase()
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            start_phase("encode")
+
+    return wrapper
+
+
+def export(traces: list[Trace]) -> dict[str, Any]:
+    """``traces`` as an OTLP/JSON ``ExportTraceServiceRequest``."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{
+                "scope": {"name": __name__},
+                "spans": [_span(span) for trace in traces for span in trace.spans],
+            }],
+        }],
+    }
+
+
+def _span(span: Span) -> dict[str, Any]:
+    exported = {
+        "traceId": span.trace.trace_id,
+        "spanId": span.span_id,
+        "parentSpanId": span.parent_id,
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start),
+        "endTimeUnixNano": str(span.end or span.start),
+        "attributes": [_attribute(key, value) for key, value in (span.attributes or {}).items()],
+        "status": {"code": STATUS_CODE_UNSET},
+    }
+    if span.error is not None:
+        exported["status"] = {"code": STATUS_CODE_ERROR, "message": span.error}
+    return exported
+
+
+def _attribute(key: str, value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
@@ -1,53 +1,83 @@
-from typing import Optional
-from src.models.schemas import User, CreateUserDto, UpdateUserDto
+from __future__ import annotations
+
+from typing import AsyncIterator, Optional
+from src.models.schemas import User, CreateUserDto, UpdateUserDto, BulkUpdateUserDto
+from src.services.repository import DEFAULT_BATCH_SIZE, ChangeListener, Repository
+from src.services.records import USER_CODEC, field_changes
+from src.services import bulk
+from src.services.id_allocator import create_id_allocator
+from src.types.types import BulkResult, PaginatedResult
 
 # Simulação de banco de dados em memória
-users: list[User] = [
+users: Repository[User] = Repository([
     User(id="1", name="João Silva", email="joao@example.com", age=30),
     User(id="2", name="Maria Santos", email="maria@example.com", age=25),
     User(id="3", name="Pedro Oliveira", email="pedro@example.com", age=35),
-]
+], codec=USER_CODEC)
+user_ids = create_id_allocator(start=len(users))
 
 
 async def get_all_users() -> list[User]:
-    return users
+    return users.all()
+
+
+async def get_users_page(page: int, page_size: int) -> PaginatedResult[User]:
+    return users.paginate(page, page_size)
+
+
+async def get_users_after(cursor: Optional[str], limit: int) -> PaginatedResult[User]:
+    return users.paginate_after(cursor, limit)
+
+
+async def stream_users(batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[list[User]]:
+    for batch in users.iter_batches(batch_size):
+        yield batch
 
 
 async def get_user_by_id(user_id: str) -> Optional[User]:
-    return next((user for user in users if user.id == user_id), None)
+    return users.get(user_id)
 
 
-async def create_user(user_data: CreateUserDto) -> User:
-    new_user = User(
-        id=str(len(users) + 1),
+def _build_user(user_data: CreateUserDto) -> User:
+    return User(
+        id=user_ids.next_id(),
         name=user_data.name,
         email=user_data.email,
         age=user_data.age,
     )
-    users.append(new_user)
-    return new_user
-
-
-async def update_user(user_id: str, user_data: UpdateUserDto) -> Optional[User]:
-    user_index = next((i for i, user in enumerate(users) if user.id == user_id), None)
-    
-    if user_index is None:
-        return None
-    
-    user_dict = users[user_index].model_dump()
-    update_dict = user_data.model_dump(exclude_unset=True)
-    updated_user = User(**{**user_dict, **update_dict})
-    users[user_index] = updated_user
-    
-    return updated_user
-
-
-async def delete_user(user_id: str) -> bool:
-    user_index = next((i for i, user in enumerate(users) if user.id == user_id), None)
-    
-    if user_index is None:
-        return False
-    
-    users.pop(user_index)
-    return True
 
+
+def _merge_user(existing_user: User, user_data: UpdateUserDto) -> User:
+    return existing_user.model_copy(update=field_changes(User, user_data))
+
+
+async def create_user(user_data: CreateUserDto) -> User:
+    return users.add(_build_user(user_data))
+
+
+async def update_user(
+    user_id: str,
+    user_data: UpdateUserDto,
+    expected_version: Optional[int] = None,
+) -> Optional[User]:
+    return users.update(user_id, field_changes(User, user_data), expected_version)
+
+
+async def delete_user(user_id: str, expected_version: Optional[int] = None) -> bool:
+    return users.remove(user_id, expected_version) is not None
+
+
+async def bulk_create_users(users_data: list[CreateUserDto]) -> BulkResult[User]:
+    return bulk.create_all(users, [_build_user(user_data) for user_data in users_data])
+
+
+async def bulk_update_users(users_data: list[BulkUpdateUserDto]) -> BulkResult[User]:
+    return bulk.update_all(users, users_data, _merge_user, not_found="User not found")
+
+
+async def bulk_delete_users(ids: list[str]) -> BulkResult[User]:
+    return bulk.delete_all(users, ids, not_found="User not found")
+
+
+def subscribe(listener: ChangeListener) -> None:
+    users.subscribe(listener)
@@ -0,0 +1,165 @@
+"""Append-only write-ahead log with group commit.
+
+Entries are opaque payloads framed as ``<u32 length><u32 crc32><payload>``
+and numbered by a log sequence number (LSN). ``append`` only buffers the
+frame; a background flusher writes everything buffered so far and fsyncs it
+once, so all writers waiting in ``sync`` share a single fsync.
+
+The log is split into segments named after the LSN of their first entry
+(``00000000000000000001.wal``), so segments fully covered by a snapshot can
+be deleted. A torn frame at the end of the last segment (a crash during a
+write) ends the replay and is truncated away.
+"""
+
+import asyncio
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Iterator, Optional, Union
+import anyio.to_thread
+
+FRAME = struct.Struct("<II")
+SEGMENT_SUFFIX = ".wal"
+DEFAULT_GROUP_COMMIT_DELAY_SECONDS = 0.002
+
+
+def segment_path(directory: Path, first_lsn: int) -> Path:
+    return directory / f"{first_lsn:020d}{SEGMENT_SUFFIX}"
+
+
+def segments(directory: Path) -> list[tuple[int, Path]]:
+    """Existing segments as ``(first LSN, path)``, oldest first."""
+    return sorted((int(path.stem), path) for path in directory.glob(f"*{SEGMENT_SUFFIX}") if path.stem.isdigit())
+
+
+def read_segment(path: Path, first_lsn: int) -> Iterator[tuple[int, bytes]]:
+    """Yield ``(lsn, payload)`` for every intact frame, truncating a torn tail."""
+    with open(path, "r+b") as file:
+        data = file.read()
+        offset = 0
+        lsn = first_lsn
+        while offset + FRAME.size <= len(data):
+            length, checksum = FRAME.unpack_from(data, offset)
+            payload = data[offset + FRAME.size:offset + FRAME.size + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            yield lsn, payload
+            offset += FRAME.size + length
+            lsn += 1
+        if offset < len(data):
+            file.truncate(offset)
+
+
+class WriteAheadLog:
+    """Buffers appends and makes them durable in batches.
+
+    Appends, ``rotate`` and ``sync`` must run on the event loop; the file
+    is only touched by the flusher, one batch at a time, on a worker thread.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        next_lsn: int = 1,
+        group_commit_delay: float = DEFAULT_GROUP_COMMIT_DELAY_SECONDS,
+    ) -> None:
+        self.directory = directory
+        self.group_commit_delay = group_commit_delay
+        self._next_lsn = next_lsn
+        # Frames a gravar e, como int, trocas de segmento (LSN do novo segmento)
+        self._pending: list[Union[bytes, int]] = []
+        self._queued = 0
+        self._written = 0
+        self._error: Optional[BaseException] = None
+        self._file = open(segment_path(directory, next_lsn), "ab")
+        self._wakeup = asyncio.Event()
+        self._flushed = asyncio.Condition()
+        self._flusher: Optional[asyncio.Task] = None
+
+    @property
+    def next_lsn(self) -> int:
+        return self._next_lsn
+
+    def append(self, payload: bytes) -> int:
+        """Buffer one entry and return its LSN; ``sync`` makes it durable."""
+        lsn = self._next_lsn
+        self._next_lsn += 1
+        self._enqueue(FRAME.pack(len(payload), zlib.crc32(payload)) + payload)
+        return lsn
+
+    def rotate(self) -> int:
+        """Send entries appended from now on to a new segment; returns its first LSN."""
+        self._enqueue(self._next_lsn)
+        return self._next_lsn
+
+    async def sync(self) -> None:
+        """Wait until everything appended or rotated so far is on disk."""
+        target = self._queued
+        if self._written >= target:
+            return
+        self._start()
+        async with self._flushed:
+            await self._flushed.wait_for(lambda: self._written >= target or self._error is not None)
+        if self._error is not None:
+            raise self._error
+
+    def remove_segments_before(self, lsn: int) -> None:
+        """Delete segments whose entries all precede ``lsn``."""
+        existing = segments(self.directory)
+        for (first_lsn, path), (next_first_lsn, _) in zip(existing, existing[1:]):
+            if next_first_lsn <= lsn:
+                path.unlink()
+
+    async def close(self) -> None:
+        await self.sync()
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        self._file.close()
+
+    def _enqueue(self, item: Union[bytes, int]) -> None:
+        self._pending.append(item)
+        self._queued += 1
+        self._wakeup.set()
+
+    def _start(self) -> None:
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_forever())
+
+    async def _flush_forever(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if self.group_commit_delay:
+                # Espera um pouco para juntar mais escritas no mesmo fsync
+                await asyncio.sleep(self.group_commit_delay)
+            batch, self._pending = self._pending, []
+            try:
+                await anyio.to_thread.run_sync(self._write, batch)
+            except BaseException as exc:
+                self._error = exc
+                raise
+            finally:
+                async with self._flushed:
+                    if self._error is None:
+                        self._written += len(batch)
+                    self._flushed.notify_all()
+
+    def _write(self, batch: list[Union[bytes, int]]) -> None:
+        for item in batch:
+            if isinstance(item, int):
+                self._sync_file()
+                self._file.close()
+                self._file = open(segment_path(self.directory, item), "ab")
+            else:
+                self._file.write(item)
+        self._sync_file()
+
+    def _sync_file(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
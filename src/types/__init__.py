@@ -2,7 +2,7 @@
 
 from .enums import OrderStatus, ProductCategory, CarColor, UserRole
 from .interfaces import IUserService, IProductService, ICarService, IOrderService
-from .types import ServiceResponse, PaginatedResult
+from .types import ServiceResponse, PaginatedResult, PaginationParams, BulkItemResult, BulkResult, ImportLineError, ImportBatch, ImportReport
 
 __all__ = [
     "OrderStatus",
@@ -15,4 +15,10 @@ __all__ = [
     "IOrderService",
     "ServiceResponse",
     "PaginatedResult",
+    "PaginationParams",
+    "BulkItemResult",
+    "BulkResult",
+    "ImportLineError",
+    "ImportBatch",
+    "ImportReport",
 ]
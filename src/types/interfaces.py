@@ -1,12 +1,20 @@
 """Service interfaces using Protocol."""
 
-from typing import Protocol, Optional
-from src.models.schemas import (
-    User, CreateUserDto, UpdateUserDto,
-    Product, CreateProductDto, UpdateProductDto,
-    Car, CreateCarDto, UpdateCarDto,
-    Order, CreateOrderDto, UpdateOrderDto
-)
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, AsyncIterator, Protocol, Optional
+
+from src.types.enums import OrderStatus
+from src.types.types import BulkResult, PaginatedResult
+
+if TYPE_CHECKING:
+    from src.services.repository import ChangeListener
+    from src.models.schemas import (
+        User, CreateUserDto, UpdateUserDto, BulkUpdateUserDto,
+        Product, CreateProductDto, UpdateProductDto, BulkUpdateProductDto, ProductFilters,
+        Car, CreateCarDto, UpdateCarDto, BulkUpdateCarDto,
+        Order, CreateOrderDto, UpdateOrderDto, BulkUpdateOrderDto
+    )
 
 
 class IUserService(Protocol):
@@ -16,6 +24,18 @@ class IUserService(Protocol):
         """Get all users."""
         ...
     
+    async def get_users_page(self, page: int, page_size: int) -> PaginatedResult[User]:
+        """Get one offset page of users."""
+        ...
+    
+    async def get_users_after(self, cursor: Optional[str], limit: int) -> PaginatedResult[User]:
+        """Get the users following a keyset cursor."""
+        ...
+    
+    def stream_users(self) -> AsyncIterator[list[User]]:
+        """Yield all users in batches, for streaming exports."""
+        ...
+    
     async def get_user_by_id(self, user_id: str) -> Optional[User]:
         """Get user by ID."""
         ...
@@ -24,12 +44,33 @@ class IUserService(Protocol):
         """Create a new user."""
         ...
     
-    async def update_user(self, user_id: str, user_data: UpdateUserDto) -> Optional[User]:
-        """Update an existing user."""
+    async def update_user(
+        self,
+        user_id: str,
+        user_data: UpdateUserDto,
+        expected_version: Optional[int] = None,
+    ) -> Optional[User]:
+        """Update an existing user; with ``expected_version``, only if it still matches."""
+        ...
+    
+    async def delete_user(self, user_id: str, expected_version: Optional[int] = None) -> bool:
+        """Delete a user; with ``expected_version``, only if it still matches."""
+        ...
+    
+    async def bulk_create_users(self, users_data: list[CreateUserDto]) -> BulkResult[User]:
+        """Create several users at once."""
+        ...
+    
+    async def bulk_update_users(self, users_data: list[BulkUpdateUserDto]) -> BulkResult[User]:
+        """Update several users; nothing is applied if any item fails."""
         ...
     
-    async def delete_user(self, user_id: str) -> bool:
-        """Delete a user."""
+    async def bulk_delete_users(self, ids: list[str]) -> BulkResult[User]:
+        """Delete several users; nothing is deleted if any ID is missing."""
+        ...
+    
+    def subscribe(self, listener: ChangeListener) -> None:
+        """Call ``listener(old, new)`` after every user write."""
         ...
 
 
@@ -40,6 +81,28 @@ class IProductService(Protocol):
         """Get all products."""
         ...
     
+    async def get_products_page(
+        self,
+        page: int,
+        page_size: int,
+        filters: Optional[ProductFilters] = None,
+    ) -> PaginatedResult[Product]:
+        """Get one offset page of products matching the filters."""
+        ...
+    
+    async def get_products_after(
+        self,
+        cursor: Optional[str],
+        limit: int,
+        filters: Optional[ProductFilters] = None,
+    ) -> PaginatedResult[Product]:
+        """Get the products matching the filters after a keyset cursor."""
+        ...
+    
+    def stream_products(self, filters: Optional[ProductFilters] = None) -> AsyncIterator[list[Product]]:
+        """Yield all products in batches, for streaming exports."""
+        ...
+    
     async def get_product_by_id(self, product_id: str) -> Optional[Product]:
         """Get product by ID."""
         ...
@@ -48,12 +111,33 @@ class IProductService(Protocol):
         """Create a new product."""
         ...
     
-    async def update_product(self, product_id: str, product_data: UpdateProductDto) -> Optional[Product]:
-        """Update an existing product."""
+    async def update_product(
+        self,
+        product_id: str,
+        product_data: UpdateProductDto,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Product]:
+        """Update an existing product; with ``expected_version``, only if it still matches."""
         ...
     
-    async def delete_product(self, product_id: str) -> bool:
-        """Delete a product."""
+    async def delete_product(self, product_id: str, expected_version: Optional[int] = None) -> bool:
+        """Delete a product; with ``expected_version``, only if it still matches."""
+        ...
+    
+    async def bulk_create_products(self, products_data: list[CreateProductDto]) -> BulkResult[Product]:
+        """Create several products at once."""
+        ...
+    
+    async def bulk_update_products(self, products_data: list[BulkUpdateProductDto]) -> BulkResult[Product]:
+        """Update several products; nothing is applied if any item fails."""
+        ...
+    
+    async def bulk_delete_products(self, ids: list[str]) -> BulkResult[Product]:
+        """Delete several products; nothing is deleted if any ID is missing."""
+        ...
+    
+    def subscribe(self, listener: ChangeListener) -> None:
+        """Call ``listener(old, new)`` after every product write."""
         ...
 
 
@@ -64,6 +148,18 @@ class ICarService(Protocol):
         """Get all cars."""
         ...
     
+    async def get_cars_page(self, page: int, page_size: int) -> PaginatedResult[Car]:
+        """Get one offset page of cars."""
+        ...
+    
+    async def get_cars_after(self, cursor: Optional[str], limit: int) -> PaginatedResult[Car]:
+        """Get the cars following a keyset cursor."""
+        ...
+    
+    def stream_cars(self) -> AsyncIterator[list[Car]]:
+        """Yield all cars in batches, for streaming exports."""
+        ...
+    
     async def get_car_by_id(self, car_id: str) -> Optional[Car]:
         """Get car by ID."""
         ...
@@ -72,12 +168,33 @@ class ICarService(Protocol):
         """Create a new car."""
         ...
     
-    async def update_car(self, car_id: str, car_data: UpdateCarDto) -> Optional[Car]:
-        """Update an existing car."""
+    async def update_car(
+        self,
+        car_id: str,
+        car_data: UpdateCarDto,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Car]:
+        """Update an existing car; with ``expected_version``, only if it still matches."""
+        ...
+    
+    async def delete_car(self, car_id: str, expected_version: Optional[int] = None) -> bool:
+        """Delete a car; with ``expected_version``, only if it still matches."""
+        ...
+    
+    async def bulk_create_cars(self, cars_data: list[CreateCarDto]) -> BulkResult[Car]:
+        """Create several cars at once."""
+        ...
+    
+    async def bulk_update_cars(self, cars_data: list[BulkUpdateCarDto]) -> BulkResult[Car]:
+        """Update several cars; nothing is applied if any item fails."""
+        ...
+    
+    async def bulk_delete_cars(self, ids: list[str]) -> BulkResult[Car]:
+        """Delete several cars; nothing is deleted if any ID is missing."""
         ...
     
-    async def delete_car(self, car_id: str) -> bool:
-        """Delete a car."""
+    def subscribe(self, listener: ChangeListener) -> None:
+        """Call ``listener(old, new)`` after every car write."""
         ...
 
 
@@ -88,18 +205,63 @@ class IOrderService(Protocol):
         """Get all orders."""
         ...
     
+    async def get_orders_page(
+        self,
+        page: int,
+        page_size: int,
+        user_id: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+    ) -> PaginatedResult[Order]:
+        """Get one offset page of orders, optionally filtered by user and status."""
+        ...
+    
+    async def get_orders_after(
+        self,
+        cursor: Optional[str],
+        limit: int,
+        user_id: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+    ) -> PaginatedResult[Order]:
+        """Get the orders following a keyset cursor, optionally filtered by user and status."""
+        ...
+    
+    def stream_orders(self, user_id: Optional[str] = None, status: Optional[OrderStatus] = None) -> AsyncIterator[list[Order]]:
+        """Yield all orders in batches, for streaming exports."""
+        ...
+    
     async def get_order_by_id(self, order_id: str) -> Optional[Order]:
         """Get order by ID."""
         ...
     
     async def create_order(self, order_data: CreateOrderDto) -> Order:
-        """Create a new order."""
+        """Price an order from the catalog and reserve its stock; raises ``PlacementError``."""
+        ...
+    
+    async def update_order(
+        self,
+        order_id: str,
+        order_data: UpdateOrderDto,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Order]:
+        """Update an existing order; with ``expected_version``, only if it still matches."""
+        ...
+    
+    async def delete_order(self, order_id: str, expected_version: Optional[int] = None) -> bool:
+        """Delete an order; with ``expected_version``, only if it still matches."""
+        ...
+    
+    async def bulk_create_orders(self, orders_data: list[CreateOrderDto]) -> BulkResult[Order]:
+        """Place several orders; nothing is applied if any of them cannot be placed."""
+        ...
+    
+    async def bulk_update_orders(self, orders_data: list[BulkUpdateOrderDto]) -> BulkResult[Order]:
+        """Update several orders; nothing is applied if any item fails."""
         ...
     
-    async def update_order(self, order_id: str, order_data: UpdateOrderDto) -> Optional[Order]:
-        """Update an existing order."""
+    async def bulk_delete_orders(self, ids: list[str]) -> BulkResult[Order]:
+        """Delete several orders; nothing is deleted if any ID is missing."""
         ...
     
-    async def delete_order(self, order_id: str) -> bool:
-        """Delete an order."""
+    def subscribe(self, listener: ChangeListener) -> None:
+        """Call ``listener(old, new)`` after every order write."""
         ...
@@ -1,6 +1,6 @@
 """Type definitions for the application."""
 
-from typing import TypeVar, Generic, Optional
+from typing import Literal, TypeVar, Generic, Optional
 from pydantic import BaseModel
 
 
@@ -17,13 +17,83 @@ class ServiceResponse(BaseModel, Generic[T]):
 
 
 class PaginatedResult(BaseModel, Generic[T]):
-    """Generic paginated result wrapper."""
+    """Generic paginated result wrapper.
+    
+    ``page`` is set for offset pagination; ``next_cursor`` is set for keyset
+    pagination while more items remain.
+    """
     
     items: list[T]
     total: int
-    page: int
+    page: Optional[int] = None
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None
+
+
+class BulkItemResult(BaseModel, Generic[T]):
+    """Outcome of one item in a bulk request."""
+    
+    index: int
+    id: Optional[str] = None
+    status: int
+    data: Optional[T] = None
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel, Generic[T]):
+    """Per-item outcomes of a bulk request; ``applied`` is False when it was rolled back."""
+    
+    applied: bool
+    results: list[BulkItemResult[T]]
+
+
+class ImportLineError(BaseModel):
+    """A rejected line of an NDJSON import."""
+    
+    event: Literal["error"] = "error"
+    line: int
+    error: str
+
+
+class ImportBatch(BaseModel):
+    """Outcome of one batch of an NDJSON import, streamed as it is written."""
+    
+    event: Literal["batch"] = "batch"
+    batch: int
+    applied: bool
+    imported: int
+    rejected: int
+
+
+class ImportReport(BaseModel):
+    """Summary of an NDJSON import, the last line of its response."""
+    
+    event: Literal["summary"] = "summary"
+    imported: int = 0
+    failed: int = 0
+    rejected: int = 0
+    batches: int = 0
+    errors: list[ImportLineError] = []
+    errors_truncated: bool = False
+    aborted: Optional[str] = None
+
+
+class PaginationParams(BaseModel):
+    """Pagination options for collection endpoints.
+    
+    Keyset mode (``cursor``/``limit``) is used whenever either is given;
+    otherwise ``page``/``page_size`` select an offset page.
+    """
+    
+    page: int = 1
+    page_size: int = 20
+    cursor: Optional[str] = None
+    limit: Optional[int] = None
+    
+    @property
+    def is_keyset(self) -> bool:
+        return self.cursor is not None or self.limit is not None
 
 
 class ErrorDetail(BaseModel):
@@ -0,0 +1,25 @@
+import pytest
+from src.services import user_service, car_service, product_service, order_service
+from src.services.id_allocator import SequentialIdAllocator
+
+SERVICES = [
+    (user_service, "users", "user_ids"),
+    (car_service, "cars", "car_ids"),
+    (product_service, "products", "product_ids"),
+    (order_service, "orders", "order_ids"),
+]
+
+
+@pytest.fixture(autouse=True)
+def restore_seed_data(monkeypatch):
+    """Give every test the seed records and restore them afterwards."""
+    snapshots = []
+    for service, repository_name, allocator_name in SERVICES:
+        repository = getattr(service, repository_name)
+        snapshots.append((repository, repository.all()))
+        monkeypatch.setattr(service, allocator_name, SequentialIdAllocator(start=len(repository)))
+    yield
+    for repository, records in snapshots:
+        repository.clear()
+        for record in records:
+            repository.add(record)
@@ -0,0 +1,76 @@
+import time
+import pytest
+from datetime import datetime
+from src.services.analytics_service import _epoch_seconds, get_order_revenue, get_order_stats, get_inventory_by_category
+from src.services.order_service import create_order, update_order, delete_order
+from src.services.product_service import create_product, delete_product
+from src.models.schemas import CreateOrderDto, UpdateOrderDto, OrderItem, CreateProductDto
+from src.types.enums import OrderStatus, ProductCategory
+
+@pytest.mark.asyncio
+async def test_get_order_revenue_should_follow_order_changes():
+    # Arrange
+    first = await create_order(CreateOrderDto(userId="77", items=[OrderItem(productId="1", quantity=1, price=10.0)], total=10.0))
+    second = await create_order(CreateOrderDto(userId="77", items=[OrderItem(productId="1", quantity=3, price=10.0)], total=30.0))
+    await update_order(second.id, UpdateOrderDto(status=OrderStatus.COMPLETED))
+    third = await create_order(CreateOrderDto(userId="77", items=[OrderItem(productId="1", quantity=1, price=10.0)], total=99.0))
+    await delete_order(third.id)
+
+    # Act
+    result = await get_order_revenue("user")
+
+    # Assert
+    group = next(group for group in result if group.key == "77")
+    assert group.count == 2
+    assert group.sum == 14000.0
+    assert group.mean == 7000.0
+
+@pytest.mark.asyncio
+async def test_get_order_stats_should_filter_by_status():
+    # Arrange
+    product = await create_product(
+        CreateProductDto(name="Cabo", description="Cabo USB", price=5.0, stock=10, category=ProductCategory.ELECTRONICS)
+    )
+    await create_order(CreateOrderDto(userId="78", items=[OrderItem(productId=product.id, quantity=1, price=0.0)], status=OrderStatus.DELIVERED))
+    await create_order(CreateOrderDto(userId="78", items=[OrderItem(productId=product.id, quantity=3, price=0.0)], status=OrderStatus.DELIVERED))
+
+    # Act
+    result = await get_order_stats(OrderStatus.DELIVERED)
+
+    # Assert
+    assert result.count == 2
+    assert result.sum == 20.0
+    assert result.p50 == 10.0
+
+@pytest.mark.asyncio
+async def test_get_inventory_by_category_should_sum_price_times_stock():
+    # Arrange
+    toy = await create_product(CreateProductDto(name="Bola", description="Bola", price=20.0, stock=3, category=ProductCategory.TOYS))
+    removed = await create_product(CreateProductDto(name="Pipa", description="Pipa", price=5.0, stock=10, category=ProductCategory.TOYS))
+    await delete_product(removed.id)
+
+    # Act
+    result = await get_inventory_by_category()
+
+    # Assert
+    group = next(group for group in result if group.key == ProductCategory.TOYS.value)
+    assert group.count == 1
+    assert group.sum == 60.0
+
+@pytest.mark.asyncio
+async def test_created_at_should_be_bucketed_in_utc_whatever_the_server_timezone(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("TZ", "America/Sao_Paulo")
+    time.tzset()
+    order = await create_order(CreateOrderDto(userId="79", items=[OrderItem(productId="1", quantity=1, price=0.0)]))
+
+    # Act
+    created = _epoch_seconds(order.createdAt)
+    legacy = _epoch_seconds("2025-01-01T21:30:00")
+    monkeypatch.undo()
+    time.tzset()
+
+    # Assert
+    assert datetime.fromisoformat(order.createdAt).utcoffset() is not None
+    assert abs(created - time.time()) < 60
+    assert legacy == _epoch_seconds("2025-01-02T00:30:00+00:00")
@@ -0,0 +1,58 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import pytest
+from types import SimpleNamespace
+from src.services import backend
+
+
+def spawned_by_uvicorn(monkeypatch, workers: int) -> list[int]:
+    signalled: list[int] = []
+    monkeypatch.setattr(multiprocessing, "parent_process", lambda: SimpleNamespace(pid=1))
+    monkeypatch.setattr(
+        multiprocessing,
+        "current_process",
+        lambda: SimpleNamespace(_kwargs={"config": SimpleNamespace(workers=workers)}),
+    )
+    monkeypatch.setattr(os, "kill", lambda pid, sig: signalled.append(pid))
+    return signalled
+
+
+def test_check_single_process_should_refuse_memory_backend_under_uvicorn_workers(monkeypatch):
+    # Arrange
+    signalled = spawned_by_uvicorn(monkeypatch, workers=4)
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        backend.check_single_process()
+    assert signalled == [os.getppid()]
+
+
+def test_check_single_process_should_allow_a_single_uvicorn_worker(monkeypatch):
+    # Arrange
+    signalled = spawned_by_uvicorn(monkeypatch, workers=1)
+
+    # Act
+    backend.check_single_process()
+
+    # Assert
+    assert signalled == []
+
+
+def test_sqlite_backend_should_not_load_the_memory_services(tmp_path):
+    # Arrange
+    env = {**os.environ, "STORAGE_BACKEND": "sqlite", "SQLITE_PATH": str(tmp_path / "api.db"), "ID_STRATEGY": "snowflake"}
+    env.pop("WORKER_ID", None)
+    script = (
+        "import sys, main\n"
+        "[main.load_router(resource) for resource in main.RESOURCES.values()]\n"
+        "print(any(name in sys.modules for name in ('src.services.order_service', 'src.services.analytics_service')))"
+    )
+
+    # Act
+    result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, timeout=60)
+
+    # Assert
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,51 @@
+from benchmarks.compare import compare
+from benchmarks.results import summarize
+from benchmarks.startup import import_report
+
+
+def make_run(commit: str, per_second: float, p99_us: float) -> dict:
+    result = {"route": "GET /health", "concurrency": 1, **summarize([1000], 1.0)}
+    result.update(per_second=per_second, p99_us=p99_us)
+    return {"commit": commit, "results": [result]}
+
+
+def test_summarize_should_report_throughput_and_percentiles():
+    # Act
+    summary = summarize([1000 * latency for latency in range(1, 101)], elapsed=0.5, errors=2)
+
+    # Assert
+    assert summary["count"] == 100
+    assert summary["per_second"] == 200.0
+    assert summary["p50_us"] == 50.5
+    assert summary["p99_us"] == 99.0
+    assert summary["errors"] == 2
+
+
+def test_compare_should_flag_only_results_beyond_the_threshold():
+    # Arrange
+    baseline = make_run("a", per_second=1000.0, p99_us=100.0)
+
+    # Act
+    steady = compare(baseline, make_run("b", per_second=950.0, p99_us=105.0), threshold=0.1)
+    slower = compare(baseline, make_run("c", per_second=1000.0, p99_us=150.0), threshold=0.1)
+
+    # Assert
+    assert steady == []
+    assert slower == ["GET /health 1"]
+
+
+def test_import_report_should_sum_self_time_by_package():
+    # Arrange
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       300 |        300 |     pydantic.fields",
+        "import time:       200 |        500 |   pydantic",
+        "import time:        50 |         50 |     src.services.backend",
+        "import time:      1000 |       1550 | main",
+    ])
+
+    # Act
+    report = import_report(stderr)
+
+    # Assert
+    assert report == {"pydantic": 500, "src.services.backend": 50, "main": 1000}
@@ -1,7 +1,8 @@
 import pytest
 from unittest.mock import patch, MagicMock
-from src.services.car_service import get_all_cars, get_car_by_id, create_car, update_car, delete_car
-from src.models.schemas import Car, CreateCarDto, UpdateCarDto
+from src.services.car_service import get_all_cars, get_car_by_id, create_car, update_car, delete_car, bulk_create_cars, bulk_update_cars, bulk_delete_cars
+from src.models.schemas import Car, CreateCarDto, UpdateCarDto, BulkUpdateCarDto
+from src.services.repository import VersionConflictError
 from src.types.enums import CarColor
 
 @pytest.mark.asyncio
@@ -69,6 +70,26 @@ async def test_update_car_should_return_none_when_id_does_not_exist():
     # Assert
     assert result is None
 
+@pytest.mark.asyncio
+async def test_update_car_should_raise_conflict_when_version_is_stale():
+    # Arrange
+    current = await get_car_by_id("1")
+    await update_car("1", UpdateCarDto(price=90000.0), expected_version=current.version)
+
+    # Act / Assert
+    with pytest.raises(VersionConflictError):
+        await update_car("1", UpdateCarDto(price=91000.0), expected_version=current.version)
+    assert (await get_car_by_id("1")).price == 90000.0
+
+@pytest.mark.asyncio
+async def test_conditional_writes_should_raise_conflict_when_car_does_not_exist():
+    # Act / Assert
+    with pytest.raises(VersionConflictError):
+        await update_car("999", UpdateCarDto(price=91000.0), expected_version=1)
+    with pytest.raises(VersionConflictError):
+        await delete_car("999", expected_version=1)
+    assert await update_car("999", UpdateCarDto(price=91000.0)) is None
+
 @pytest.mark.asyncio
 async def test_delete_car_should_return_true_when_car_deleted():
     # Act
@@ -85,4 +106,42 @@ async def test_delete_car_should_return_false_when_id_does_not_exist():
 
     # Assert
     assert result is False
-    assert len(await get_all_cars()) == 3
\ No newline at end of file
+    assert len(await get_all_cars()) == 3
+
+@pytest.mark.asyncio
+async def test_bulk_create_cars_should_add_all_cars():
+    # Arrange
+    cars_data = [
+        CreateCarDto(brand="Fiat", model="Uno", year=2010, color=CarColor.GREEN, price=20000.0),
+        CreateCarDto(brand="VW", model="Gol", year=2015, color=CarColor.SILVER, price=30000.0),
+    ]
+
+    # Act
+    result = await bulk_create_cars(cars_data)
+
+    # Assert
+    assert result.applied is True
+    assert [item.id for item in result.results] == ["4", "5"]
+    assert len(await get_all_cars()) == 5
+
+@pytest.mark.asyncio
+async def test_bulk_update_cars_should_apply_nothing_when_an_id_does_not_exist():
+    # Arrange
+    cars_data = [BulkUpdateCarDto(id="1", price=1.0), BulkUpdateCarDto(id="999", price=2.0)]
+
+    # Act
+    result = await bulk_update_cars(cars_data)
+
+    # Assert
+    assert result.applied is False
+    assert [item.status for item in result.results] == [424, 404]
+    assert (await get_car_by_id("1")).price == 85000.0
+
+@pytest.mark.asyncio
+async def test_bulk_delete_cars_should_remove_all_ids():
+    # Act
+    result = await bulk_delete_cars(["1", "2"])
+
+    # Assert
+    assert result.applied is True
+    assert [car.id for car in await get_all_cars()] == ["3"]
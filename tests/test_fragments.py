@@ -0,0 +1,58 @@
+import json
+import msgpack
+import pytest
+from src.models.schemas import Product, UpdateProductDto
+from src.routes.fragments import encode_json, encode_msgpack
+from src.services import product_service
+from src.types.types import PaginatedResult
+
+
+@pytest.mark.asyncio
+async def test_encode_json_should_match_pydantic_for_pages():
+    # Arrange
+    page = await product_service.get_products_page(1, 2)
+
+    # Act
+    body = encode_json(page)
+
+    # Assert
+    assert body == PaginatedResult[Product].model_validate(page.model_dump()).model_dump_json().encode()
+
+
+@pytest.mark.asyncio
+async def test_json_bytes_should_be_reused_until_the_record_is_updated():
+    # Arrange
+    product = await product_service.get_product_by_id("1")
+    cached = product.json_bytes()
+
+    # Act
+    updated = await product_service.update_product("1", UpdateProductDto(stock=7))
+
+    # Assert
+    assert (await product_service.get_product_by_id("1")).json_bytes() is not cached
+    assert product.json_bytes() is cached
+    assert updated.json_bytes() == updated.model_dump_json().encode()
+
+
+def test_json_bytes_should_be_discarded_on_assignment():
+    # Arrange
+    product = Product(id="1", name="Mouse", description="USB", price=10.0, stock=1, category="Electronics")
+    product.json_bytes()
+
+    # Act
+    product.stock = 2
+
+    # Assert
+    assert b'"stock":2' in product.json_bytes()
+
+
+@pytest.mark.asyncio
+async def test_encode_msgpack_should_decode_to_the_json_document():
+    # Arrange
+    page = await product_service.get_products_page(1, 2)
+
+    # Act
+    body = encode_msgpack(page)
+
+    # Assert
+    assert msgpack.unpackb(body) == json.loads(encode_json(page))
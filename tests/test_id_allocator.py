@@ -0,0 +1,72 @@
+import threading
+import pytest
+from datetime import datetime, timezone
+from src.services.id_allocator import SequentialIdAllocator, SnowflakeIdAllocator, create_id_allocator, snowflake_timestamp
+
+
+def test_sequential_allocator_should_continue_after_start():
+    # Arrange
+    allocator = SequentialIdAllocator(start=3)
+
+    # Act
+    result = [allocator.next_id() for _ in range(3)]
+
+    # Assert
+    assert result == ["4", "5", "6"]
+
+
+def test_sequential_allocator_should_not_collide_across_threads():
+    # Arrange
+    allocator = SequentialIdAllocator()
+    allocated: list[str] = []
+
+    def worker():
+        for _ in range(1000):
+            allocated.append(allocator.next_id())
+
+    # Act
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert len(set(allocated)) == 8000
+
+
+def test_snowflake_allocator_should_be_time_ordered_and_unique():
+    # Arrange
+    allocator = SnowflakeIdAllocator(worker_id=7)
+    before = datetime.now(timezone.utc)
+
+    # Act
+    ids = [allocator.next_id() for _ in range(10000)]
+
+    # Assert
+    assert len(set(ids)) == len(ids)
+    assert [int(i) for i in ids] == sorted(int(i) for i in ids)
+    assert (snowflake_timestamp(ids[0]) - before).total_seconds() > -0.01
+
+
+def test_create_id_allocator_should_require_a_worker_id_for_snowflake(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ID_STRATEGY", "snowflake")
+    monkeypatch.delenv("WORKER_ID", raising=False)
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        create_id_allocator()
+    assert isinstance(create_id_allocator(allocate_worker_id=lambda: 3), SnowflakeIdAllocator)
+
+
+def test_create_id_allocator_should_prefer_the_configured_worker_id(monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ID_STRATEGY", "snowflake")
+    monkeypatch.setenv("WORKER_ID", "5")
+
+    # Act
+    allocator = create_id_allocator(allocate_worker_id=lambda: 3)
+
+    # Assert
+    assert (int(allocator.next_id()) >> 12) & 1023 == 5
@@ -0,0 +1,40 @@
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI
+from src.routes.lazy import LazyRouter, include_lazy
+
+
+def make_router(prefix: str, loads: list[str]) -> APIRouter:
+    loads.append(prefix)
+    router = APIRouter(prefix=prefix)
+
+    @router.get("/{item_id}")
+    async def get_item(item_id: str):
+        return {"id": item_id}
+
+    return router
+
+
+@pytest.mark.asyncio
+async def test_lazy_routers_should_load_once_on_first_request():
+    # Arrange
+    app = FastAPI()
+    loads: list[str] = []
+    include_lazy(app, {prefix: lambda prefix=prefix: make_router(prefix, loads) for prefix in ("/items", "/others")})
+    transport = httpx.ASGITransport(app=app)
+
+    # Act
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/items/1")
+        second = await client.get("/items/2")
+        unknown = await client.get("/itemsx/1")
+        loaded_before_schema = list(loads)
+        schema = (await client.get("/openapi.json")).json()
+
+    # Assert
+    assert first.json() == {"id": "1"} and second.json() == {"id": "2"}
+    assert unknown.status_code == 404
+    assert loaded_before_schema == ["/items"]
+    assert loads == ["/items", "/others"]
+    assert set(schema["paths"]) == {"/items/{item_id}", "/others/{item_id}"}
+    assert not any(isinstance(route, LazyRouter) for route in app.router.routes)
@@ -0,0 +1,46 @@
+import asyncio
+import httpx
+import pytest
+from fastapi import FastAPI
+from src.routes.metrics import MetricsMiddleware
+from src.services.metrics import InstrumentedService, MetricsRegistry
+
+
+class SlowService:
+    async def get_item(self, item_id: str) -> dict:
+        await asyncio.sleep(0.002)
+        return {"id": item_id}
+
+
+def make_app(registry: MetricsRegistry) -> FastAPI:
+    app = FastAPI()
+    service = InstrumentedService("items", SlowService(), registry)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return await service.get_item(item_id)
+
+    app.add_middleware(MetricsMiddleware, registry=registry)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_metrics_middleware_should_record_route_templates_and_service_time():
+    # Arrange
+    registry = MetricsRegistry()
+    transport = httpx.ASGITransport(app=make_app(registry))
+
+    # Act
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/items/1")
+        await client.get("/items/2")
+        await client.get("/missing")
+    exposition = registry.render()
+
+    # Assert
+    assert 'http_requests_total{route="/items/{item_id}",method="GET",status="200"} 2' in exposition
+    assert 'http_requests_total{route="<unmatched>",method="GET",status="404"} 1' in exposition
+    assert 'http_request_service_seconds_bucket{route="/items/{item_id}",method="GET",status="200",le="0.001"} 0' in exposition
+    assert 'http_request_duration_seconds_bucket{route="/items/{item_id}",method="GET",status="200",le="+Inf"} 2' in exposition
+    assert 'service_call_duration_seconds_count{service="items",operation="get_item"} 2' in exposition
+    assert "http_requests_in_flight 0" in exposition
@@ -0,0 +1,71 @@
+import pytest
+from src.services.ndjson_import import import_ndjson, MAX_LINE_BYTES
+from src.services.user_service import bulk_create_users, get_all_users
+from src.services.order_service import bulk_create_orders, get_all_orders
+from src.services.product_service import get_product_by_id
+from src.models.schemas import CreateOrderDto, CreateUserDto
+
+
+async def chunked(body: bytes, size: int):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+async def collect(events):
+    return [event async for event in events]
+
+@pytest.mark.asyncio
+async def test_import_ndjson_should_insert_valid_lines_in_batches_and_report_errors():
+    # Arrange
+    body = b'{"name": "Ana", "email": "ana@example.com", "age": 20}\n' \
+           b'{"name": "Sem idade"}\n' \
+           b'\n' \
+           b'{"name": "Bia", "email": "bia@example.com", "age": 21}\n' \
+           b'{"name": "Caio", "email": "caio@example.com", "age": 22}'
+
+    # Act
+    events = await collect(import_ndjson(chunked(body, 7), CreateUserDto, bulk_create_users, batch_size=2))
+
+    # Assert
+    assert [event.event for event in events] == ["error", "batch", "batch", "summary"]
+    assert events[0].line == 2
+    assert (events[1].imported, events[2].imported) == (2, 1)
+    summary = events[-1]
+    assert summary.imported == 3
+    assert summary.batches == 2
+    assert summary.failed == 1
+    assert summary.aborted is None
+    assert [user.name for user in (await get_all_users())[3:]] == ["Ana", "Bia", "Caio"]
+
+@pytest.mark.asyncio
+async def test_import_ndjson_should_reject_only_the_lines_that_fail_a_batch():
+    # Arrange
+    body = b'{"userId": "1", "items": [{"productId": "1", "quantity": 1, "price": 1}]}\n' \
+           b'{"userId": "2", "items": [{"productId": "1", "quantity": 999, "price": 1}]}\n' \
+           b'{"userId": "2", "items": [{"productId": "2", "quantity": 1, "price": 1}]}\n' \
+           b'{"userId": "3", "items": [{"productId": "404", "quantity": 1, "price": 1}]}'
+
+    # Act
+    events = await collect(import_ndjson(chunked(body, 16), CreateOrderDto, bulk_create_orders, batch_size=4))
+
+    # Assert
+    assert [event.event for event in events] == ["error", "error", "batch", "summary"]
+    assert [events[0].line, events[1].line] == [2, 4]
+    assert (events[2].applied, events[2].imported, events[2].rejected) == (True, 2, 2)
+    summary = events[-1]
+    assert (summary.imported, summary.rejected) == (2, 2)
+    assert len(await get_all_orders()) == 5
+    assert (await get_product_by_id("1")).stock == 9
+
+@pytest.mark.asyncio
+async def test_import_ndjson_should_stop_at_a_line_over_the_limit_and_keep_the_report():
+    # Arrange
+    body = b'{"name": "Ana", "email": "ana@example.com", "age": 20}\n' + b"x" * (MAX_LINE_BYTES + 1)
+
+    # Act
+    events = await collect(import_ndjson(chunked(body, 65536), CreateUserDto, bulk_create_users))
+
+    # Assert
+    summary = events[-1]
+    assert summary.event == "summary"
+    assert summary.imported == 1
+    assert "exceeds" in summary.aborted
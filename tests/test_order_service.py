@@ -1,7 +1,9 @@
 import pytest
 from unittest.mock import Mock, patch
-from src.services.order_service import get_all_orders, get_order_by_id, create_order, update_order, delete_order
-from src.models.schemas import CreateOrderDto, UpdateOrderDto, OrderItem
+from src.services.order_service import get_all_orders, get_order_by_id, create_order, update_order, delete_order, get_orders_page, get_orders_after, bulk_create_orders, bulk_update_orders
+from src.services.order_placement import InsufficientStockError, OrderStateError
+from src.services.product_service import get_product_by_id
+from src.models.schemas import CreateOrderDto, UpdateOrderDto, BulkUpdateOrderDto, OrderItem
 from src.types.enums import OrderStatus
 
 @pytest.mark.asyncio
@@ -31,7 +33,7 @@ async def test_get_order_by_id_should_return_none_when_id_does_not_exist():
 @pytest.mark.asyncio
 async def test_create_order_should_add_new_order():
     # Arrange
-    order_data = CreateOrderDto(userId="3", items=[OrderItem(productId="4", quantity=1, price=100.0)], total=None, status=None)
+    order_data = CreateOrderDto(userId="3", items=[OrderItem(productId="2", quantity=2, price=1.0)], total=None, status=None)
 
     # Act
     result = await create_order(order_data)
@@ -40,27 +42,81 @@ async def test_create_order_should_add_new_order():
     assert result.id == "4"
     assert result.userId == "3"
     assert len(result.items) == 1
-    assert result.total == 0.0
+    assert result.items[0].price == 150.0
+    assert result.total == 300.0
     assert result.status == OrderStatus.PENDING
+    assert (await get_product_by_id("2")).stock == 48
+
+@pytest.mark.asyncio
+async def test_create_order_should_not_oversell_or_partially_reserve():
+    # Arrange
+    order_data = CreateOrderDto(
+        userId="3",
+        items=[OrderItem(productId="2", quantity=1, price=150.0), OrderItem(productId="1", quantity=11, price=3500.0)],
+    )
+
+    # Act / Assert
+    with pytest.raises(InsufficientStockError):
+        await create_order(order_data)
+    assert (await get_product_by_id("2")).stock == 50
+    assert len(await get_all_orders()) == 3
+
+@pytest.mark.asyncio
+async def test_bulk_create_orders_should_share_stock_across_the_batch():
+    # Arrange
+    orders_data = [CreateOrderDto(userId="3", items=[OrderItem(productId="1", quantity=6, price=0.0)]) for _ in range(2)]
+
+    # Act
+    result = await bulk_create_orders(orders_data)
+
+    # Assert
+    assert result.applied is False
+    assert [item.status for item in result.results] == [424, 409]
+    assert (await get_product_by_id("1")).stock == 10
 
 @pytest.mark.asyncio
 async def test_update_order_should_modify_existing_order():
     # Arrange
-    update_data = UpdateOrderDto(items=[OrderItem(productId="1", quantity=3, price=3500.0)], total=10500.0, status=OrderStatus.COMPLETED)
+    update_data = UpdateOrderDto(userId="2", status=OrderStatus.COMPLETED)
 
     # Act
     result = await update_order("1", update_data)
 
     # Assert
     assert result.id == "1"
-    assert result.total == 10500.0
+    assert result.userId == "2"
+    assert result.total == 7000.0
     assert result.status == OrderStatus.COMPLETED
-    assert result.items[0].quantity == 3
+    assert result.items[0].quantity == 2
+
+@pytest.mark.asyncio
+async def test_update_order_should_reprice_and_re_reserve_new_items():
+    # Arrange
+    order = await create_order(CreateOrderDto(userId="3", items=[OrderItem(productId="2", quantity=5, price=0.0)]))
+
+    # Act
+    result = await update_order(order.id, UpdateOrderDto(items=[OrderItem(productId="2", quantity=2, price=0.01)], total=0.01))
+
+    # Assert
+    assert result.items[0].price == 150.0
+    assert result.total == 300.0
+    assert (await get_product_by_id("2")).stock == 48
+    with pytest.raises(InsufficientStockError):
+        await update_order(order.id, UpdateOrderDto(items=[OrderItem(productId="2", quantity=51, price=0.0)]))
+    assert (await get_product_by_id("2")).stock == 48
+    assert (await get_order_by_id(order.id)).items[0].quantity == 2
+
+@pytest.mark.asyncio
+async def test_update_order_should_not_change_items_of_fulfilled_orders():
+    # Act / Assert
+    with pytest.raises(OrderStateError):
+        await update_order("2", UpdateOrderDto(items=[OrderItem(productId="2", quantity=1, price=0.0)]))
+    assert (await get_product_by_id("2")).stock == 50
 
 @pytest.mark.asyncio
 async def test_update_order_should_return_none_when_order_does_not_exist():
     # Arrange
-    update_data = UpdateOrderDto(items=[OrderItem(productId="1", quantity=3, price=3500.0)], total=10500.0, status=OrderStatus.COMPLETED)
+    update_data = UpdateOrderDto(status=OrderStatus.COMPLETED)
 
     # Act
     result = await update_order("999", update_data)
@@ -77,10 +133,92 @@ async def test_delete_order_should_return_true_when_order_deleted():
     assert result is True
     assert await get_order_by_id("1") is None
 
+@pytest.mark.asyncio
+async def test_delete_order_should_return_reserved_stock():
+    # Arrange
+    order = await create_order(CreateOrderDto(userId="3", items=[OrderItem(productId="2", quantity=5, price=0.0)]))
+
+    # Act
+    await delete_order(order.id)
+
+    # Assert
+    assert (await get_product_by_id("2")).stock == 50
+
+@pytest.mark.asyncio
+async def test_delete_order_should_not_return_stock_of_fulfilled_orders():
+    # Arrange
+    order = await create_order(CreateOrderDto(userId="3", items=[OrderItem(productId="2", quantity=5, price=0.0)]))
+    await update_order(order.id, UpdateOrderDto(status=OrderStatus.SHIPPED))
+
+    # Act
+    await delete_order(order.id)
+    await delete_order("2")
+
+    # Assert
+    assert (await get_product_by_id("2")).stock == 45
+
+@pytest.mark.asyncio
+async def test_cancelling_an_order_should_return_its_stock_once():
+    # Arrange
+    first = await create_order(CreateOrderDto(userId="3", items=[OrderItem(productId="2", quantity=5, price=0.0)]))
+    second = await create_order(CreateOrderDto(userId="3", items=[OrderItem(productId="2", quantity=3, price=0.0)]))
+
+    # Act
+    await update_order(first.id, UpdateOrderDto(status=OrderStatus.CANCELLED))
+    result = await bulk_update_orders([BulkUpdateOrderDto(id=second.id, status=OrderStatus.CANCELLED)])
+    await delete_order(first.id)
+
+    # Assert
+    assert result.applied is True
+    assert (await get_product_by_id("2")).stock == 50
+    with pytest.raises(OrderStateError):
+        await update_order(second.id, UpdateOrderDto(status=OrderStatus.PENDING))
+
+@pytest.mark.asyncio
+async def test_cancelling_a_delivered_order_should_not_return_stock():
+    # Arrange
+    order = await create_order(CreateOrderDto(userId="3", items=[OrderItem(productId="2", quantity=5, price=0.0)]))
+    await update_order(order.id, UpdateOrderDto(status=OrderStatus.DELIVERED))
+
+    # Act
+    await update_order(order.id, UpdateOrderDto(status=OrderStatus.CANCELLED))
+
+    # Assert
+    assert (await get_product_by_id("2")).stock == 45
+
 @pytest.mark.asyncio
 async def test_delete_order_should_return_false_when_order_does_not_exist():
     # Act
     result = await delete_order("999")
 
     # Assert
-    assert result is False
\ No newline at end of file
+    assert result is False
+
+@pytest.mark.asyncio
+async def test_get_orders_page_should_filter_by_user_and_status():
+    # Arrange
+    first = await create_order(CreateOrderDto(userId="42", items=[OrderItem(productId="1", quantity=1, price=10.0)]))
+    second = await create_order(CreateOrderDto(userId="42", items=[OrderItem(productId="2", quantity=1, price=20.0)]))
+    await update_order(second.id, UpdateOrderDto(status=OrderStatus.SHIPPED))
+
+    # Act
+    by_user = await get_orders_page(1, 20, user_id="42")
+    by_user_and_status = await get_orders_page(1, 20, user_id="42", status=OrderStatus.SHIPPED)
+
+    # Assert
+    assert [order.id for order in by_user.items] == [first.id, second.id]
+    assert [order.id for order in by_user_and_status.items] == [second.id]
+
+@pytest.mark.asyncio
+async def test_get_orders_after_should_drop_deleted_orders_from_indexes():
+    # Arrange
+    first = await create_order(CreateOrderDto(userId="43", items=[OrderItem(productId="1", quantity=1, price=10.0)]))
+    second = await create_order(CreateOrderDto(userId="43", items=[OrderItem(productId="2", quantity=1, price=20.0)]))
+    await delete_order(first.id)
+
+    # Act
+    result = await get_orders_after(None, 10, user_id="43")
+
+    # Assert
+    assert [order.id for order in result.items] == [second.id]
+    assert result.next_cursor is None
@@ -0,0 +1,115 @@
+import asyncio
+import pytest
+from src.models.schemas import Order, OrderItem, User
+from src.services import wal
+from src.services.persistence import Persistence
+from src.services.records import ORDER_CODEC, USER_CODEC
+from src.services.repository import Repository
+from src.types.enums import OrderStatus
+
+
+def make_user(user_id: str) -> User:
+    return User(id=user_id, name=f"User {user_id}", email=f"user{user_id}@example.com", age=30)
+
+
+def open_store(directory) -> tuple[Persistence, Repository, Repository]:
+    users = Repository([make_user("1"), make_user("2")], codec=USER_CODEC)
+    orders = Repository(codec=ORDER_CODEC)
+    persistence = Persistence(str(directory), group_commit_delay=0)
+    persistence.register("users", users, USER_CODEC)
+    persistence.register("orders", orders, ORDER_CODEC)
+    return persistence, users, orders
+
+@pytest.mark.asyncio
+async def test_persistence_should_restore_snapshot_and_log_tail(tmp_path):
+    # Arrange
+    persistence, users, orders = open_store(tmp_path)
+    persistence.recover()
+    users.add(make_user("3"))
+    users.update("1", {"age": 41})
+    await persistence.snapshot()
+    users.remove("3")
+    orders.add(Order(
+        id="1",
+        userId="2",
+        items=[OrderItem(productId="9", quantity=2, price=5.0)],
+        total=10.0,
+        status=OrderStatus.PENDING,
+        createdAt="2025-01-01T00:00:00",
+    ))
+    await persistence.sync()
+    await persistence.log.close()
+
+    # Act
+    restarted, restored_users, restored_orders = open_store(tmp_path)
+    high_water = restarted.recover()
+
+    # Assert
+    assert restored_users.all() == users.all()
+    assert restored_users.version_of("1") == 2
+    assert restored_orders.all() == orders.all()
+    assert high_water == {"users": 3, "orders": 1}
+
+@pytest.mark.asyncio
+async def test_persistence_should_snapshot_a_lazily_loaded_repository(tmp_path):
+    # Arrange
+    persistence, users, _ = open_store(tmp_path)
+    persistence.recover()
+    users.add(make_user("3"))
+    await persistence.snapshot()
+    await persistence.log.close()
+    restarted, restored_users, _ = open_store(tmp_path)
+    restarted.recover()
+    restored_users.update("3", {"age": 50})
+    restored_users.remove("1")
+
+    # Act
+    await restarted.snapshot()
+    await restarted.log.close()
+    reopened, reopened_users, _ = open_store(tmp_path)
+    reopened.recover()
+
+    # Assert
+    assert reopened_users.all() == restored_users.all()
+    assert [user.id for user in reopened_users.all()] == ["2", "3"]
+    assert reopened_users.version_of("3") == 2
+
+@pytest.mark.asyncio
+async def test_persistence_should_ignore_a_torn_log_tail(tmp_path):
+    # Arrange
+    persistence, users, _ = open_store(tmp_path)
+    persistence.recover()
+    users.add(make_user("3"))
+    await persistence.sync()
+    await persistence.log.close()
+    (_, segment), = wal.segments(tmp_path)
+    intact_size = segment.stat().st_size
+    with open(segment, "ab") as file:
+        file.write(b"\x40\x00\x00\x00partial")
+
+    # Act
+    restarted, restored_users, _ = open_store(tmp_path)
+    restarted.recover()
+
+    # Assert
+    assert [user.id for user in restored_users.all()] == ["1", "2", "3"]
+    assert segment.stat().st_size == intact_size
+
+@pytest.mark.asyncio
+async def test_write_ahead_log_should_share_fsyncs_between_writers(tmp_path, monkeypatch):
+    # Arrange
+    fsyncs = []
+    monkeypatch.setattr(wal.os, "fsync", lambda descriptor: fsyncs.append(descriptor))
+    log = wal.WriteAheadLog(tmp_path, group_commit_delay=0.01)
+
+    async def write(index: int) -> None:
+        log.append(str(index).encode())
+        await log.sync()
+
+    # Act
+    await asyncio.gather(*(write(index) for index in range(50)))
+    await log.close()
+
+    # Assert
+    assert len(fsyncs) == 1
+    assert [lsn for lsn, _ in wal.read_segment(wal.segment_path(tmp_path, 1), 1)] == list(range(1, 51))
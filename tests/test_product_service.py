@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import patch, Mock
-from src.services.product_service import get_all_products, get_product_by_id, create_product, update_product, delete_product
-from src.models.schemas import Product, CreateProductDto, UpdateProductDto
+from src.services.product_service import get_all_products, get_product_by_id, create_product, update_product, delete_product, get_products_page
+from src.models.schemas import Product, CreateProductDto, UpdateProductDto, ProductFilters
 from src.types.enums import ProductCategory
 
 @pytest.mark.asyncio
@@ -113,4 +113,19 @@ class TestProductService:
         result = await delete_product("999")
 
         # Assert
-        assert result is False
\ No newline at end of file
+        assert result is False
+
+    async def test_get_products_page_should_filter_by_category_and_price_range_sorted_by_price(self):
+        # Arrange
+        cheap = await create_product(CreateProductDto(name="Livro A", description="A", price=40.0, stock=3, category=ProductCategory.BOOKS))
+        pricey = await create_product(CreateProductDto(name="Livro B", description="B", price=90.0, stock=0, category=ProductCategory.BOOKS))
+        middle = await create_product(CreateProductDto(name="Livro C", description="C", price=60.0, stock=5, category=ProductCategory.BOOKS))
+        await update_product(pricey.id, UpdateProductDto(price=55.0))
+
+        # Act
+        result = await get_products_page(1, 20, ProductFilters(category=ProductCategory.BOOKS, minPrice=50.0, sort="price"))
+        in_stock = await get_products_page(1, 20, ProductFilters(category=ProductCategory.BOOKS, inStock=True))
+
+        # Assert
+        assert [product.id for product in result.items] == [pricey.id, middle.id]
+        assert [product.id for product in in_stock.items] == [cheap.id, middle.id]
@@ -0,0 +1,79 @@
+import threading
+import time
+import httpx
+import pytest
+from fastapi import FastAPI
+from src.routes.profiling import ProfilingMiddleware
+from src.services.profiler import SamplingProfiler
+
+
+def busy_work(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def make_app(profiler: SamplingProfiler) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/slow/{item_id}")
+    async def slow(item_id: str):
+        busy_work(0.1)
+        return {"id": item_id}
+
+    @app.get("/fast")
+    async def fast():
+        busy_work(0.1)
+        return {}
+
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_profiler_should_attribute_samples_to_the_selected_route():
+    # Arrange
+    profiler = SamplingProfiler()
+    transport = httpx.ASGITransport(app=make_app(profiler))
+    profiler.start(route="/slow/{item_id}", interval=0.001)
+
+    # Act
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/slow/1")
+        await client.get("/fast")
+    profiler.stop()
+    collapsed = profiler.collapsed()
+    speedscope = profiler.speedscope()
+
+    # Assert
+    assert profiler.samples > 0
+    assert {line.split(";")[0] for line in collapsed.splitlines()} == {"GET /slow/{item_id}"}
+    assert "busy_work (" in collapsed
+    (profile,) = speedscope["profiles"]
+    assert profile["name"] == "GET /slow/{item_id}"
+    assert sum(profile["weights"]) == pytest.approx(profiler.samples * 0.001)
+    assert {"name": "busy_work", "file": "tests/test_profiler.py", "line": 10} in speedscope["shared"]["frames"]
+
+
+def test_profiler_stop_should_not_wait_for_a_sample_in_progress(monkeypatch):
+    # Arrange
+    profiler = SamplingProfiler()
+    sampling, release = threading.Event(), threading.Event()
+
+    def slow_sample(frame, stop):
+        sampling.set()
+        release.wait(5)
+
+    monkeypatch.setattr(profiler, "_sample", slow_sample)
+    profiler.start(interval=0.001)
+    sampling.wait(5)
+
+    # Act
+    started = time.perf_counter()
+    profiler.stop()
+    elapsed = time.perf_counter() - started
+    release.set()
+
+    # Assert
+    assert elapsed < 1
+    assert profiler.enabled is False
@@ -0,0 +1,200 @@
+import pytest
+from pydantic import ValidationError
+from src.services import snapshots
+from src.services.records import ORDER_CODEC, USER_CODEC, UserRow, field_changes
+from src.services.repository import Repository
+from src.models.schemas import Order, OrderItem, User, UpdateUserDto
+from src.types.enums import OrderStatus
+
+
+def make_user(user_id: str) -> User:
+    return User(id=user_id, name=f"User {user_id}", email=f"user{user_id}@example.com", age=30)
+
+
+def test_repository_should_keep_insertion_order_after_replace():
+    # Arrange
+    repository = Repository([make_user("1"), make_user("2"), make_user("3")])
+
+    # Act
+    repository.replace("2", make_user("2").model_copy(update={"name": "Updated"}))
+
+    # Assert
+    assert [user.id for user in repository.all()] == ["1", "2", "3"]
+    assert repository.get("2").name == "Updated"
+
+
+def test_repository_remove_should_return_removed_record():
+    # Arrange
+    repository = Repository([make_user("1"), make_user("2")])
+
+    # Act
+    removed = repository.remove("1")
+
+    # Assert
+    assert removed.id == "1"
+    assert repository.get("1") is None
+    assert repository.remove("1") is None
+    assert len(repository) == 1
+
+
+def test_repository_add_should_reject_duplicate_ids():
+    # Arrange
+    repository = Repository([make_user("1")])
+
+    # Act / Assert
+    with pytest.raises(KeyError):
+        repository.add(make_user("1"))
+
+
+def test_paginate_after_should_walk_all_records_with_cursor():
+    # Arrange
+    repository = Repository([make_user(str(i)) for i in range(1, 8)])
+    repository.remove("3")
+
+    # Act
+    first = repository.paginate_after(None, 3)
+    second = repository.paginate_after(first.next_cursor, 3)
+
+    # Assert
+    assert [user.id for user in first.items] == ["1", "2", "4"]
+    assert [user.id for user in second.items] == ["5", "6", "7"]
+    assert second.next_cursor is None
+    assert first.total == 6
+
+
+def test_paginate_after_should_reject_malformed_cursor():
+    # Arrange
+    repository = Repository([make_user("1")])
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        repository.paginate_after("not-a-cursor", 10)
+
+
+def test_paginate_should_return_offset_page():
+    # Arrange
+    repository = Repository([make_user(str(i)) for i in range(1, 6)])
+    repository.remove("2")
+
+    # Act
+    result = repository.paginate(2, 2)
+
+    # Assert
+    assert [user.id for user in result.items] == ["4", "5"]
+    assert result.page == 2
+    assert result.total_pages == 2
+
+
+def test_paginate_should_skip_tombstones_without_compacting(monkeypatch):
+    # Arrange
+    repository = Repository([make_user(str(i)) for i in range(1, 21)])
+    for user_id in ["1", "2", "3", "8", "9", "15"]:
+        repository.remove(user_id)
+    monkeypatch.setattr(Repository, "_compact", lambda self: pytest.fail("paginate compacted"))
+
+    # Act
+    pages = [repository.paginate(page, 4) for page in range(1, 5)]
+
+    # Assert
+    assert [[user.id for user in page.items] for page in pages] == [
+        ["4", "5", "6", "7"],
+        ["10", "11", "12", "13"],
+        ["14", "16", "17", "18"],
+        ["19", "20"],
+    ]
+    assert pages[0].total_pages == 4
+
+
+def test_iter_batches_should_tolerate_writes_between_batches():
+    # Arrange
+    repository = Repository([make_user(str(i)) for i in range(1, 6)])
+    seen: list[str] = []
+
+    # Act
+    for batch in repository.iter_batches(2):
+        seen.extend(user.id for user in batch)
+        if len(seen) == 2:
+            repository.remove("3")
+            repository.add(make_user("6"))
+
+    # Assert
+    assert seen == ["1", "2", "4", "5", "6"]
+
+
+def test_repository_with_codec_should_store_rows_and_return_models():
+    # Arrange
+    repository = Repository([make_user("1")], codec=USER_CODEC)
+
+    # Act
+    stored = repository.stored("1")
+    first = repository.get("1")
+    second = repository.get("1")
+
+    # Assert
+    assert isinstance(stored, UserRow)
+    assert first == make_user("1")
+    assert first.json_bytes() is second.json_bytes()
+    assert stored.encoded["application/json"] is first.json_bytes()
+
+
+def test_repository_update_should_share_unchanged_fields_and_bump_version():
+    # Arrange
+    order = Order(
+        id="1",
+        userId="1",
+        items=[OrderItem(productId=str(index), quantity=1, price=1.0) for index in range(100)],
+        total=100.0,
+        status=OrderStatus.PENDING,
+        createdAt="2025-11-07T18:18:08.792Z",
+    )
+    repository = Repository([order], codec=ORDER_CODEC)
+    previous = repository.stored("1")
+
+    # Act
+    updated = repository.update("1", {"status": "completed"})
+
+    # Assert
+    stored = repository.stored("1")
+    assert updated.status == OrderStatus.COMPLETED
+    assert stored.status is OrderStatus.COMPLETED
+    assert stored.items is previous.items
+    assert repository.version_of("1") == previous.version + 1
+    assert repository.update("999", {"status": "completed"}) is None
+
+
+def test_field_changes_should_validate_only_the_fields_that_were_set():
+    # Act
+    changes = field_changes(User, UpdateUserDto(age=31))
+
+    # Assert
+    assert changes == {"age": 31}
+    with pytest.raises(ValidationError):
+        field_changes(User, UpdateUserDto(name=None))
+
+
+def test_repository_should_decode_base_rows_only_when_read(tmp_path):
+    # Arrange
+    source = Repository([make_user(str(i)) for i in range(1, 6)], codec=USER_CODEC)
+    path = tmp_path / "snapshot.bin"
+    snapshots.write(path, 1, {"users": snapshots.SnapshotSection(source.snapshot_rows(), USER_CODEC.dump, 5)})
+    decoded = []
+
+    def load(values: list) -> UserRow:
+        decoded.append(values[0])
+        return USER_CODEC.load(values)
+
+    repository = Repository(codec=USER_CODEC)
+    repository.load_base(snapshots.open_snapshot(path).table("users", load))
+
+    # Act
+    repository.remove("2")
+    repository.add(make_user("6"))
+    first = repository.paginate_after(None, 2)
+
+    # Assert
+    assert len(repository) == 5
+    assert decoded == ["2", "1", "3", "4"]
+    assert [user.id for user in first.items] == ["1", "3"]
+    assert [user.id for user in repository.paginate(2, 2).items] == ["4", "5"]
+    assert [user.id for user in repository.paginate_after(first.next_cursor, 5).items] == ["4", "5", "6"]
+
@@ -0,0 +1,109 @@
+import pytest
+from starlette.requests import Request
+from src.models.schemas import User, UpdateUserDto
+from src.routes.response_cache import ResponseCache, etag_matches
+from src.services import user_service
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_request(headers: dict[str, str] | None = None) -> Request:
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": raw_headers})
+
+
+def test_invalidate_should_drop_record_and_list_entries_only():
+    # Arrange
+    cache = ResponseCache()
+    cache.put(("users", "id", "1", "application/json"), b"one", cache.generation("users"))
+    cache.put(("users", "id", "2", "application/json"), b"two", cache.generation("users"))
+    cache.put(("users", "list", "page=1", "application/json"), b"page", cache.generation("users"))
+    cache.put(("cars", "id", "1", "application/json"), b"car", cache.generation("cars"))
+
+    # Act
+    cache.invalidate("users", "1")
+
+    # Assert
+    assert cache.get(("users", "id", "1", "application/json")) is None
+    assert cache.get(("users", "list", "page=1", "application/json")) is None
+    assert cache.get(("users", "id", "2", "application/json")).body == b"two"
+    assert cache.get(("cars", "id", "1", "application/json")).body == b"car"
+
+
+def test_put_should_skip_responses_rendered_before_a_write():
+    # Arrange
+    cache = ResponseCache()
+    generation = cache.generation("users")
+    cache.invalidate("users", "1")
+
+    # Act
+    cache.put(("users", "id", "1", "application/json"), b"stale", generation)
+
+    # Assert
+    assert cache.get(("users", "id", "1", "application/json")) is None
+
+
+def test_cache_should_evict_expired_and_least_recently_used_entries():
+    # Arrange
+    clock = FakeClock()
+    cache = ResponseCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.put(("users", "id", "1", "application/json"), b"one", 0)
+    cache.put(("users", "id", "2", "application/json"), b"two", 0)
+    cache.get(("users", "id", "1", "application/json"))
+
+    # Act
+    cache.put(("users", "id", "3", "application/json"), b"three", 0)
+
+    # Assert
+    assert cache.get(("users", "id", "2", "application/json")) is None
+    assert cache.get(("users", "id", "1", "application/json")) is not None
+    clock.now = 10
+    assert cache.get(("users", "id", "1", "application/json")) is None
+
+
+def test_etag_matches_should_accept_lists_weak_tags_and_wildcard():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+@pytest.mark.asyncio
+async def test_respond_should_return_304_when_etag_matches():
+    # Arrange
+    cache = ResponseCache()
+    first = await cache.respond(make_request(), ("users", "id", "1"), lambda: user_service.get_user_by_id("1"))
+
+    # Act
+    second = await cache.respond(
+        make_request({"If-None-Match": first.headers["etag"]}),
+        ("users", "id", "1"),
+        lambda: pytest.fail("cache miss"),
+    )
+
+    # Assert
+    assert first.status_code == 200
+    assert User.model_validate_json(first.body).id == "1"
+    assert second.status_code == 304
+    assert second.body == b""
+    assert second.headers["etag"] == first.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_service_writes_should_invalidate_subscribed_cache():
+    # Arrange
+    cache = ResponseCache()
+    user_service.subscribe(cache.listener("users"))
+    cache.put(("users", "id", "1", "application/json"), b"old", cache.generation("users"))
+
+    # Act
+    await user_service.update_user("1", UpdateUserDto(name="Renamed"))
+
+    # Assert
+    assert cache.get(("users", "id", "1", "application/json")) is None
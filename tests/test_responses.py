@@ -0,0 +1,45 @@
+from starlette.requests import Request
+from src.routes.responses import negotiate
+from src.routes.streaming import accepts_ndjson
+
+
+def make_request(accept: str | None = None) -> Request:
+    raw_headers = [] if accept is None else [(b"accept", accept.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": raw_headers})
+
+
+def test_negotiate_should_honour_quality_values():
+    # Arrange
+    headers = {
+        None: "application/json",
+        "application/msgpack": "application/msgpack",
+        "application/x-msgpack, application/json;q=0.5": "application/msgpack",
+        "application/msgpack;q=0, */*": "application/json",
+        "application/json;q=0.2, application/msgpack;q=0.8": "application/msgpack",
+        "application/msgpack;q=0.5, */*": "application/json",
+        "text/html": "application/json",
+    }
+
+    # Act
+    negotiated = {accept: negotiate(make_request(accept)) for accept in headers}
+
+    # Assert
+    assert negotiated == headers
+
+
+def test_accepts_ndjson_should_ignore_excluded_or_less_preferred_ndjson():
+    # Arrange
+    headers = {
+        None: False,
+        "application/x-ndjson": True,
+        "application/x-ndjson;q=0": False,
+        "application/x-ndjson;q=0.5, application/json": False,
+        "application/x-ndjson, */*;q=0.1": True,
+        "*/*": False,
+    }
+
+    # Act
+    accepted = {accept: accepts_ndjson(make_request(accept)) for accept in headers}
+
+    # Assert
+    assert accepted == headers
@@ -0,0 +1,246 @@
+import pytest
+from types import SimpleNamespace
+from src.services.sqlite import SqliteDatabase, SqliteUserService, SqliteProductService, SqliteOrderService
+from src.models.schemas import CreateUserDto, UpdateUserDto, BulkUpdateUserDto, CreateOrderDto, UpdateOrderDto, BulkUpdateOrderDto, CreateProductDto, OrderItem
+from src.services.order_placement import InsufficientStockError
+from src.services.sqlite import workers
+from src.services.sqlite.changes import ChangeFeed
+from src.services.repository import VersionConflictError
+from src.types.enums import OrderStatus, ProductCategory
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = SqliteDatabase(str(tmp_path / "api.db"), pool_size=2)
+    yield database
+    database.close()
+
+@pytest.mark.asyncio
+async def test_sqlite_user_service_should_persist_crud_operations(database):
+    # Arrange
+    service = SqliteUserService(database)
+
+    # Act
+    created = await service.create_user(CreateUserDto(name="Ana", email="ana@example.com", age=20))
+    updated = await service.update_user(created.id, UpdateUserDto(age=21))
+    reopened = SqliteUserService(database)
+
+    # Assert
+    assert created.id == "1"
+    assert updated.age == 21
+    assert (await reopened.get_user_by_id("1")).age == 21
+    assert (await reopened.create_user(CreateUserDto(name="Bia", email="bia@example.com", age=22))).id == "2"
+    assert await reopened.delete_user("1") is True
+    assert await reopened.get_user_by_id("1") is None
+
+@pytest.mark.asyncio
+async def test_sqlite_user_service_should_roll_back_failed_bulk_update(database):
+    # Arrange
+    service = SqliteUserService(database)
+    await service.bulk_create_users([CreateUserDto(name=f"U{i}", email="u@example.com", age=i) for i in range(3)])
+
+    # Act
+    result = await service.bulk_update_users([BulkUpdateUserDto(id="1", age=99), BulkUpdateUserDto(id="999", age=1)])
+
+    # Assert
+    assert result.applied is False
+    assert (await service.get_user_by_id("1")).age == 0
+
+@pytest.mark.asyncio
+async def test_sqlite_order_service_should_filter_and_paginate_with_cursor(database):
+    # Arrange
+    service = SqliteOrderService(database)
+    await service.products.create_product(
+        CreateProductDto(name="Cabo", description="Cabo USB", price=1.0, stock=10, category=ProductCategory.ELECTRONICS)
+    )
+    for user_id in ["1", "2", "1", "1"]:
+        await service.create_order(CreateOrderDto(userId=user_id, items=[OrderItem(productId="1", quantity=1, price=1.0)]))
+
+    # Act
+    first = await service.get_orders_after(None, 2, user_id="1", status=OrderStatus.PENDING)
+    second = await service.get_orders_after(first.next_cursor, 2, user_id="1", status=OrderStatus.PENDING)
+
+    # Assert
+    assert [order.id for order in first.items] == ["1", "3"]
+    assert [order.id for order in second.items] == ["4"]
+    assert second.next_cursor is None
+    assert first.total == 3
+
+@pytest.mark.asyncio
+async def test_sqlite_user_service_should_reject_stale_versions(database):
+    # Arrange
+    service = SqliteUserService(database)
+    created = await service.create_user(CreateUserDto(name="Ana", email="ana@example.com", age=20))
+
+    # Act
+    updated = await service.update_user(created.id, UpdateUserDto(age=21), expected_version=created.version)
+
+    # Assert
+    assert (created.version, updated.version) == (1, 2)
+    assert (await service.get_user_by_id(created.id)).version == 2
+    with pytest.raises(VersionConflictError):
+        await service.update_user(created.id, UpdateUserDto(age=22), expected_version=1)
+    with pytest.raises(VersionConflictError):
+        await service.delete_user(created.id, expected_version=1)
+    assert await service.delete_user(created.id, expected_version=2) is True
+    with pytest.raises(VersionConflictError):
+        await service.update_user(created.id, UpdateUserDto(age=22), expected_version=2)
+    with pytest.raises(VersionConflictError):
+        await service.delete_user(created.id, expected_version=2)
+    assert await service.delete_user(created.id) is False
+
+@pytest.mark.asyncio
+async def test_sqlite_order_service_should_reserve_stock_atomically(database):
+    # Arrange
+    products = SqliteProductService(database)
+    service = SqliteOrderService(database, products)
+    product = await products.create_product(
+        CreateProductDto(name="Cabo", description="Cabo USB", price=2.5, stock=5, category=ProductCategory.ELECTRONICS)
+    )
+    changes = []
+    products.subscribe(lambda old, new: changes.append((old.stock, new.stock)))
+
+    # Act
+    order = await service.create_order(CreateOrderDto(userId="1", items=[OrderItem(productId=product.id, quantity=4, price=0.0)]))
+    with pytest.raises(InsufficientStockError):
+        await service.create_order(CreateOrderDto(userId="1", items=[OrderItem(productId=product.id, quantity=2, price=0.0)]))
+
+    # Assert
+    assert order.total == 10.0
+    assert (await products.get_product_by_id(product.id)).stock == 1
+    assert changes == [(5, 1)]
+    assert len(await service.get_all_orders()) == 1
+
+@pytest.mark.asyncio
+async def test_sqlite_order_service_should_return_stock_of_deleted_orders(database):
+    # Arrange
+    products = SqliteProductService(database)
+    service = SqliteOrderService(database, products)
+    product = await products.create_product(
+        CreateProductDto(name="Cabo", description="Cabo USB", price=2.5, stock=5, category=ProductCategory.ELECTRONICS)
+    )
+    first = await service.create_order(CreateOrderDto(userId="1", items=[OrderItem(productId=product.id, quantity=2, price=0.0)]))
+    second = await service.create_order(CreateOrderDto(userId="1", items=[OrderItem(productId=product.id, quantity=1, price=0.0)]))
+
+    # Act
+    deleted = await service.delete_order(first.id)
+    missing = await service.bulk_delete_orders([second.id, "999"])
+    remaining = (await products.get_product_by_id(product.id)).stock
+    await service.bulk_delete_orders([second.id])
+
+    # Assert
+    assert deleted is True
+    assert missing.applied is False
+    assert remaining == 4
+    assert (await products.get_product_by_id(product.id)).stock == 5
+    assert await service.get_all_orders() == []
+
+@pytest.mark.asyncio
+async def test_sqlite_order_service_should_return_stock_only_while_orders_hold_it(database):
+    # Arrange
+    products = SqliteProductService(database)
+    service = SqliteOrderService(database, products)
+    product = await products.create_product(
+        CreateProductDto(name="Cabo", description="Cabo USB", price=2.5, stock=5, category=ProductCategory.ELECTRONICS)
+    )
+    cancelled = await service.create_order(CreateOrderDto(userId="1", items=[OrderItem(productId=product.id, quantity=2, price=0.0)]))
+    shipped = await service.create_order(CreateOrderDto(userId="1", items=[OrderItem(productId=product.id, quantity=1, price=0.0)]))
+
+    # Act
+    await service.update_order(cancelled.id, UpdateOrderDto(status=OrderStatus.CANCELLED))
+    await service.bulk_update_orders([BulkUpdateOrderDto(id=shipped.id, status=OrderStatus.SHIPPED)])
+    await service.bulk_delete_orders([cancelled.id, shipped.id])
+
+    # Assert
+    assert (await products.get_product_by_id(product.id)).stock == 4
+
+@pytest.mark.asyncio
+async def test_sqlite_order_service_should_re_reserve_edited_items(database):
+    # Arrange
+    products = SqliteProductService(database)
+    service = SqliteOrderService(database, products)
+    product = await products.create_product(
+        CreateProductDto(name="Cabo", description="Cabo USB", price=2.5, stock=5, category=ProductCategory.ELECTRONICS)
+    )
+    order = await service.create_order(CreateOrderDto(userId="1", items=[OrderItem(productId=product.id, quantity=2, price=0.0)]))
+
+    # Act
+    updated = await service.update_order(order.id, UpdateOrderDto(items=[OrderItem(productId=product.id, quantity=5, price=0.0)], total=1.0))
+    result = await service.bulk_update_orders([BulkUpdateOrderDto(id=order.id, items=[OrderItem(productId=product.id, quantity=6, price=0.0)])])
+
+    # Assert
+    assert updated.total == 12.5
+    assert (result.applied, result.results[0].status) == (False, 409)
+    assert (await products.get_product_by_id(product.id)).stock == 0
+
+@pytest.mark.asyncio
+async def test_sqlite_services_on_one_file_should_share_ids_and_changes(database, tmp_path):
+    # Arrange
+    other = SqliteDatabase(str(tmp_path / "api.db"), pool_size=1)
+    changes, other_changes = ChangeFeed(database), ChangeFeed(other)
+    service, other_service = SqliteUserService(database, changes), SqliteUserService(other, other_changes)
+    notified = []
+    service.subscribe(lambda old, new: notified.append((old, new)))
+
+    # Act
+    ids = [
+        (await current.create_user(CreateUserDto(name="Ana", email="ana@example.com", age=20))).id
+        for current in (service, other_service, service)
+    ]
+    notified.clear()
+    polled = await changes.poll()
+    await service.update_user(ids[1], UpdateUserDto(age=21))
+    local = await changes.poll()
+    await other_service.update_user(ids[0], UpdateUserDto(age=30))
+    remote = await changes.poll()
+
+    # Assert
+    assert ids == ["1", "2", "3"]
+    assert polled == ["users"]
+    assert local == []
+    assert remote == ["users"]
+    assert [change for change in notified if change == (None, None)] == [(None, None), (None, None)]
+    assert await changes.poll() == []
+    assert await other_changes.poll() == ["users"]
+    assert (await service.get_user_by_id(ids[0])).age == 30
+    other.close()
+
+def test_sqlite_processes_on_one_file_should_get_distinct_snowflake_workers(database, tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ID_STRATEGY", "snowflake")
+    monkeypatch.delenv("WORKER_ID", raising=False)
+    other_process = SqliteDatabase(str(tmp_path / "api.db"), pool_size=1)
+
+    # Act
+    ids = [SqliteUserService(database).ids.next_id(), SqliteProductService(database).ids.next_id()]
+    other_id = SqliteUserService(other_process).ids.next_id()
+    other_process.close()
+
+    # Assert
+    worker_ids = {(int(snowflake_id) >> 12) & 1023 for snowflake_id in ids}
+    assert worker_ids == {0}
+    assert (int(other_id) >> 12) & 1023 == 1
+
+@pytest.mark.asyncio
+async def test_sqlite_worker_leases_should_be_reused_only_after_they_expire(database, monkeypatch):
+    # Arrange
+    now = [1000.0]
+    monkeypatch.setattr(workers, "time", SimpleNamespace(time=lambda: now[0]))
+    monkeypatch.setattr(workers, "MAX_WORKER_ID", 1)
+    first = workers.WorkerLease(database, ttl=10)
+    second = workers.WorkerLease(database, ttl=10)
+
+    # Act / Assert
+    with pytest.raises(workers.WorkerIdsExhaustedError):
+        workers.WorkerLease(database, ttl=10)
+    now[0] += 5
+    await second.renew()
+    now[0] += 6
+    with pytest.raises(workers.LeaseLostError):
+        first.check()
+    replacement = workers.WorkerLease(database, ttl=10)
+    assert (first.worker_id, second.worker_id, replacement.worker_id) == (0, 1, 0)
+    with pytest.raises(workers.LeaseLostError):
+        await first.renew()
+    second.release()
+    assert workers.WorkerLease(database, ttl=10).worker_id == 1
@@ -0,0 +1,97 @@
+import json
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI, HTTPException
+from src.routes.responses import NegotiatedRoute
+from src.routes.tracing import TracingMiddleware
+from src.services import tracing
+from src.services.tracing import Tracer
+
+
+class ItemService:
+    async def get_item(self, item_id: str) -> dict:
+        if item_id == "missing":
+            raise HTTPException(status_code=404, detail="Item not found")
+        return {"id": item_id}
+
+
+def make_app(tracer: Tracer) -> FastAPI:
+    app = FastAPI()
+    router = APIRouter(route_class=NegotiatedRoute)
+    service = tracing.instrument("item_service", ItemService())
+
+    @router.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return await service.get_item(item_id)
+
+    app.include_router(router)
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_tracing_should_export_nested_layer_spans_as_otlp(monkeypatch):
+    # Arrange
+    tracer = Tracer(sample_rate=1.0)
+    monkeypatch.setattr(tracing, "tracer", tracer)
+    transport = httpx.ASGITransport(app=make_app(tracer))
+
+    # Act
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/items/1")
+        await client.get("/items/missing")
+    exported = tracing.export(list(tracer.traces))
+
+    # Assert
+    spans = exported["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    ok = [span for span in spans if span["traceId"] == spans[0]["traceId"]]
+    by_name = {span["name"]: span for span in ok}
+    assert [span["name"] for span in ok] == ["GET /items/{item_id}", "validate", "test_tracing.get_item", "item_service.get_item", "encode"]
+    root = by_name["GET /items/{item_id}"]
+    assert root["kind"] == 2 and root["parentSpanId"] == ""
+    assert {"key": "http.response.status_code", "value": {"intValue": "200"}} in root["attributes"]
+    assert by_name["validate"]["parentSpanId"] == root["spanId"]
+    assert by_name["encode"]["parentSpanId"] == root["spanId"]
+    assert by_name["item_service.get_item"]["parentSpanId"] == by_name["test_tracing.get_item"]["spanId"]
+    assert all(int(span["startTimeUnixNano"]) <= int(span["endTimeUnixNano"]) for span in spans)
+    failed = {span["name"]: span for span in spans if span["traceId"] != spans[0]["traceId"]}
+    assert failed["item_service.get_item"]["status"] == {"code": 2, "message": "HTTPException: 404: Item not found"}
+    assert {"key": "http.response.status_code", "value": {"intValue": "404"}} in failed["GET /items/{item_id}"]["attributes"]
+
+
+def test_tracer_should_cap_spans_per_trace(monkeypatch):
+    # Arrange
+    tracer = Tracer(sample_rate=1.0, buffer_size=1, max_spans_per_trace=2)
+    monkeypatch.setattr(tracing, "tracer", tracer)
+
+    # Act
+    for _ in range(2):
+        root = tracer.start_trace("GET")
+        token = tracing.current_span.set(root)
+        spans = [tracer.start_span(f"child-{index}") for index in range(3)]
+        tracing.current_span.reset(token)
+        tracer.end_trace(root)
+
+    # Assert
+    assert len(tracer.traces) == 1
+    assert [span is not None for span in spans] == [True, False, False]
+    assert root.attributes == {"trace.dropped_spans": 2}
+    assert tracer.start_span("outside") is None
+
+
+def test_tracer_should_export_every_trace_to_the_file_from_its_writer_thread(tmp_path):
+    # Arrange
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(sample_rate=1.0, path=str(path))
+    roots = [tracer.start_trace(f"GET /{index}") for index in range(200)]
+
+    # Act
+    for root in roots:
+        tracer.end_trace(root)
+    tracer.close()
+
+    # Assert
+    documents = [json.loads(line) for line in path.read_text().splitlines()]
+    spans = [span for document in documents for span in document["resourceSpans"][0]["scopeSpans"][0]["spans"]]
+    assert [span["traceId"] for span in spans] == [root.trace.trace_id for root in roots]
+    assert tracer.dropped_exports == 0